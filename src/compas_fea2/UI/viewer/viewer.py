@@ -91,12 +91,12 @@ class FEA2Viewer():
         parts = parts if isinstance(parts, Iterable) else [parts]
         for part in parts:
             if solid:
-                self.draw_solid_elements(filter(lambda x: isinstance(x, _Element3D), part.elements), draw_nodes)
+                self.draw_solid_elements(part.find_elements_by_type(_Element3D), draw_nodes)
             else:
                 if part.discretized_boundary_mesh:
                     self.app.add(part.discretized_boundary_mesh, use_vertex_color=True)
-            self.draw_shell_elements(filter(lambda x: isinstance(x, ShellElement), part.elements), draw_nodes)
-            self.draw_beam_elements(filter(lambda x: isinstance(x, BeamElement), part.elements), draw_nodes)
+            self.draw_shell_elements(part.find_elements_by_type(ShellElement), draw_nodes)
+            self.draw_beam_elements(part.find_elements_by_type(BeamElement), draw_nodes)
             if draw_nodes:
                 self.draw_nodes(part.nodes, node_labels)
 
@@ -42,6 +42,7 @@ __version__ = "0.1.0"
 
 
 HERE = os.path.dirname(__file__)
+ENV = os.path.abspath(os.path.join(HERE, ".env"))
 
 HOME = os.path.abspath(os.path.join(HERE, "../../"))
 DATA = os.path.abspath(os.path.join(HOME, "data"))
@@ -64,21 +65,29 @@ def init_fea2(verbose=False, point_overlap=True, global_tolerance=1, precision='
     precision : str, optional
         Values approximation, by default '3f'
     """
-    with open(os.path.abspath(os.path.join(HERE, ".env")), "x") as f:
+    with open(ENV, "x") as f:
         f.write('\n'.join([
             "VERBOSE={}".format(verbose),
             "POINT_OVERLAP={}".format(point_overlap),
-            "GLOBAL_TOLERANCE={}".format(point_overlap),
+            "GLOBAL_TOLERANCE={}".format(global_tolerance),
             "PRECISION={}".format(precision)
             ]))
-    load_dotenv()
+    load_dotenv(ENV)
 
-if not load_dotenv():
+# NOTE look for the environment file next to the package and not from the
+# current working directory, otherwise it is created twice.
+if not os.path.exists(ENV):
     init_fea2()
+else:
+    load_dotenv(ENV)
 
 VERBOSE = os.getenv('VERBOSE').lower() == 'true'
 POINT_OVERLAP = os.getenv('POINT_OVERLAP').lower() == 'true'
-GLOBAL_TOLERANCE = os.getenv('GLOBAL_TOLERANCE')
+try:
+    GLOBAL_TOLERANCE = float(os.getenv('GLOBAL_TOLERANCE'))
+except (TypeError, ValueError):
+    # NOTE environment files created by older versions stored a wrong value
+    GLOBAL_TOLERANCE = 1.
 PRECISION = os.getenv('PRECISION')
 BACKEND = None
 BACKENDS = defaultdict(dict)
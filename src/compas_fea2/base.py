@@ -7,6 +7,30 @@ import compas_fea2
 import importlib
 
 from abc import abstractmethod
+from functools import lru_cache
+from itertools import count
+
+# NOTE the versions of all the objects are read from the same clock, so that
+# the changes of any object can be compared with a single snapshot
+_clock = count(1)
+
+
+@lru_cache(maxsize=None)
+def _name_prefix(cls):
+    """Prefix of the automatic names of the instances of a class (its capital letters)."""
+    return ''.join([c for c in cls.__name__ if c.isupper()])
+
+
+def snapshot():
+    """Take a snapshot of the current state of all the objects, to find later
+    the ones changed since (see :attr:`FEAData.version`).
+
+    Returns
+    -------
+    int
+    """
+    return next(_clock)
+
 
 class FEAData(Data):
     """Base class for all FEA model objects.
@@ -23,6 +47,8 @@ class FEAData(Data):
     >>>
 
     """
+    # version of the object when it was last changed, see :meth:`_changed`
+    _version = 0
 
     def __init__(self, name=None):
         """Base class for all FEA2 objects.
@@ -42,7 +68,7 @@ class FEAData(Data):
         """
         super().__init__()
         # NOTE the names length in abaqus is limited to 80 characters
-        self._name = name or ''.join([c for c in type(self).__name__ if c.isupper()])+"_"+str(id(self))
+        self._name = name or _name_prefix(type(self))+"_"+str(id(self))
         self._registration = None
 
     def __new__(cls, *args, **kwargs):
@@ -57,6 +83,20 @@ class FEAData(Data):
     def __repr__(self):
         return '{0}({1})'.format(self.__class__.__name__, id(self))
 
+    @property
+    def version(self):
+        """int : Version of the object, updated every time the object (or an
+        object registered to it) changes. Compare it with a :func:`snapshot`
+        to know if the object changed since then."""
+        return self._version
+
+    def _changed(self):
+        """Record a change of the object, and of the object where it is registered."""
+        self._version = next(_clock)
+        registration = getattr(self, '_registration', None)
+        if isinstance(registration, FEAData):
+            registration._changed()
+
     @abstractmethod
     def jobdata(self, *args, **kwargs):
         """Generate the job data for the backend-specific input file."""
@@ -130,3 +170,15 @@ class FEAData(Data):
     #         except Exception:
     #             pass
     #     return """\n{}\n{}\n{}\n""".format(title, separator, '\n'.join(data_extended))
+
+
+class ChangeTracking(object):
+    """Mixin for the objects that record a change every time one of their
+    attributes is set (for example materials and sections, that are set
+    through plain attributes).
+    """
+
+    def __setattr__(self, name, value):
+        super(ChangeTracking, self).__setattr__(name, value)
+        if name != '_version':
+            self._changed()
@@ -2,8 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas_fea2.base import ChangeTracking
 from compas_fea2.base import FEAData
 
+# NOTE the restraints of the nodes are stored by the parts as bitmasks, the
+# i-th bit is set if the i-th degree of freedom is restrained.
+_DOFS = ('x', 'y', 'z', 'xx', 'yy', 'zz')
+
 docs = """
 Note
 ----
@@ -39,12 +44,15 @@ zz : bool
     Restrain rotations around the z axis.
 components : dict
     Dictionary with component-value pairs summarizing the boundary condition.
+mask : int
+    Bitmask of the restrained degrees of freedom, the bits are in the order
+    x, y, z, xx, yy, zz.
 axes : str
     The refernce axes.
 """
 
 
-class _BoundaryCondition(FEAData):
+class _BoundaryCondition(ChangeTracking, FEAData):
     """Base class for all zero-valued boundary conditions.
     """
     __doc__ += docs
@@ -93,7 +101,11 @@ class _BoundaryCondition(FEAData):
 
     @property
     def components(self):
-        return {c: getattr(self, c) for c in ['x', 'y', 'z', 'xx', 'yy', 'zz']}
+        return {c: getattr(self, c) for c in _DOFS}
+
+    @property
+    def mask(self):
+        return sum(1 << i for i, c in enumerate(_DOFS) if getattr(self, c))
 
 
 class GeneralBC(_BoundaryCondition):
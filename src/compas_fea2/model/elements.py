@@ -4,12 +4,24 @@ from __future__ import print_function
 
 from operator import itemgetter
 
+import numpy as np
 from compas.geometry import Frame
 from compas.geometry import Plane
 from compas_fea2.base import FEAData
 
 import compas_fea2
 from compas.utilities import pairwise
+from compas_fea2.utilities._arrays import HEXAHEDRON_CORNERS
+from compas_fea2.utilities._arrays import HEXAHEDRON_EDGES
+from compas_fea2.utilities._arrays import PENTAHEDRON_CORNERS
+from compas_fea2.utilities._arrays import TETRAHEDRON_CORNERS
+from compas_fea2.utilities._arrays import TETRAHEDRON_EDGES
+from compas_fea2.utilities._arrays import centroids
+from compas_fea2.utilities._arrays import hexahedra_volumes
+from compas_fea2.utilities._arrays import pentahedra_volumes
+from compas_fea2.utilities._arrays import polygons_areas
+from compas_fea2.utilities._arrays import segments_lengths
+from compas_fea2.utilities._arrays import tetrahedra_volumes
 
 
 class _Element(FEAData):
@@ -168,6 +180,18 @@ class _Element(FEAData):
     def rigid(self):
         return self._rigid
 
+    @property
+    def centroid(self):
+        if self.part is not None and self.key is not None:
+            return self.part.elements_centroids[self.key].tolist()
+        return self._compute(centroids)[0].tolist()
+
+    def _compute(self, kernel):
+        """Apply one of the (vectorized) geometry kernels to this element only.
+        """
+        xyz = np.array([node.xyz for node in self.nodes], dtype=float)
+        return kernel(xyz, np.arange(len(xyz))[None, :])
+
 # ==============================================================================
 # 0D elements
 # ==============================================================================
@@ -185,6 +209,12 @@ class _Element1D(_Element):
     """Element with 1 dimension.
     """
 
+    @property
+    def length(self):
+        if self.part is not None and self.key is not None:
+            return float(self.part.elements_lengths[self.key])
+        return float(self._compute(segments_lengths)[0])
+
 
 class BeamElement(_Element1D):
     """A 1D element that resists axial, shear, bending and torsion.
@@ -234,12 +264,14 @@ class _Element2D(_Element):
         {'s1': (0,1,2), ...}
     """
 
+    # NOTE the faces are built on first access from the face table
+    _face_indices = None
+
     def __init__(self, *, nodes, frame, section=None, implementation=None, rigid=False, name=None, **kwargs):
         super(_Element2D, self).__init__(nodes=nodes, section=section,
                                          frame=frame, implementation=implementation, name=name, **kwargs)
 
         self._faces = None
-        self._face_indices = None
         self._rigid = rigid
 
     @property
@@ -249,7 +281,7 @@ class _Element2D(_Element):
     @nodes.setter
     def nodes(self, value):
         self._nodes = value
-        self._faces = self._construct_faces(self._face_indices)
+        self._faces = None
 
     @property
     def face_indices(self):
@@ -257,8 +289,16 @@ class _Element2D(_Element):
 
     @property
     def faces(self):
+        if self._faces is None and self.face_indices:
+            self._faces = self._construct_faces(self.face_indices)
         return self._faces
 
+    @property
+    def area(self):
+        if self.part is not None and self.key is not None:
+            return float(self.part.elements_areas[self.key])
+        return float(self._compute(polygons_areas)[0])
+
     def _construct_faces(self, face_indices):
         """Construct the face-nodes dictionary.
 
@@ -288,11 +328,10 @@ class ShellElement(_Element2D):
         super(ShellElement, self).__init__(nodes=nodes, frame=frame, section=section,
                                            implementation=implementation, rigid=rigid, name=name, **kwargs)
 
-        self._face_indices = {
-            'SPOS': tuple(range(len(nodes))),
-            'SNEG': tuple(range(len(nodes)))[::-1]
-        }
-        self._faces = self._construct_faces(self._face_indices)
+    @property
+    def face_indices(self):
+        indices = tuple(range(len(self._nodes)))
+        return {'SPOS': indices, 'SNEG': indices[::-1]}
 
 
 class MembraneElement(_Element2D):
@@ -325,7 +364,7 @@ class Face(FEAData):
         super(Face, self).__init__(name)
         self._nodes = nodes
         self._tag = tag
-        self._plane = Plane.from_three_points(*[node.xyz for node in nodes])  # TODO check when more than 3 nodes
+        self._plane = None
         self._registration = element
         self._results = {}
 
@@ -339,6 +378,8 @@ class Face(FEAData):
 
     @property
     def plane(self):
+        if self._plane is None:
+            self._plane = Plane.from_three_points(*[node.xyz for node in self.nodes[:3]])  # TODO check when more than 3 nodes
         return self._plane
 
     @property
@@ -362,14 +403,20 @@ class _Element3D(_Element):
     problems.
 
     """
+    # NOTE the faces are built on first access from the face table
+    _face_indices = None
+    # vectorized function computing the volumes of many elements of the type
+    _volume_kernel = None
+    # corners table used by the quality metrics
+    _corner_indices = None
+    # edges table, in the order of the midside nodes of the quadratic elements
+    _edge_indices = None
 
     def __init__(self, *, nodes, section, implementation=None, name=None, **kwargs):
         super(_Element3D, self).__init__(nodes=nodes, section=section, frame=None,
                                          implementation=implementation, name=name, **kwargs)
-        self._face_indices = None
         self._faces = None
 
-
     @property
     def nodes(self):
         return self._nodes
@@ -377,7 +424,7 @@ class _Element3D(_Element):
     @nodes.setter
     def nodes(self, value):
         self._nodes = value
-        self._faces = self._construct_faces(self._face_indices)
+        self._faces = None
 
     @property
     def face_indices(self):
@@ -385,8 +432,29 @@ class _Element3D(_Element):
 
     @property
     def faces(self):
+        if self._faces is None and self.face_indices:
+            self._faces = self._construct_faces(self.face_indices)
         return self._faces
 
+    @classmethod
+    def faces_connectivity(cls, connectivity):
+        """Apply the face table of the element type to the connectivity of
+        many elements at once.
+
+        Parameters
+        ----------
+        connectivity : array-like
+            (m, k) array with the node keys of m elements of this type.
+
+        Returns
+        -------
+        numpy.ndarray
+            (m, f, n) array with the node keys of the f faces of each element.
+        """
+        if not cls._face_indices:
+            raise NotImplementedError('No face table defined for {}.'.format(cls.__name__))
+        return np.asarray(connectivity)[:, list(cls._face_indices.values())]
+
     def _construct_faces(self, face_indices):
         """Construct the face-nodes dictionary.
 
@@ -407,6 +475,14 @@ class _Element3D(_Element):
     def area(self):
         return self._area
 
+    @property
+    def volume(self):
+        if not self._volume_kernel:
+            raise NotImplementedError('The volume of {} is not available.'.format(self.__class__.__name__))
+        if self.part is not None and self.key is not None:
+            return float(self.part.elements_volumes[self.key])
+        return float(self._compute(self._volume_kernel)[0])
+
     @classmethod
     def from_polyhedron(cls, polyhedron, section, implementation=None, name=None, **kwargs):
         # m = importlib.import_module('.'.join(cls.__module__.split('.')[:-1]))
@@ -426,19 +502,24 @@ class TetrahedronElement(_Element3D):
         - S3: (1, 2, 3)
         - S4: (0, 2, 3)
 
-    where the number is the index of the the node in the nodes list
+    where the number is the index of the the node in the nodes list.
+    The quadratic element (10 nodes) has the midside nodes after the corner
+    nodes, in the order of the edges (0, 1), (1, 2), (2, 0), (0, 3), (1, 3),
+    (2, 3).
     """
+    _face_indices = {
+        's1': (0, 1, 2),
+        's2': (0, 1, 3),
+        's3': (1, 2, 3),
+        's4': (0, 2, 3)
+    }
+    _volume_kernel = staticmethod(tetrahedra_volumes)
+    _corner_indices = TETRAHEDRON_CORNERS
+    _edge_indices = TETRAHEDRON_EDGES
 
     def __init__(self, *, nodes, section, implementation=None, name=None, **kwargs):
         super(TetrahedronElement, self).__init__(nodes=nodes, section=section,
                                                  implementation=implementation, name=name, **kwargs)
-        self._face_indices = {
-            's1': (0, 1, 2),
-            's2': (0, 1, 3),
-            's3': (1, 2, 3),
-            's4': (0, 2, 3)
-        }
-        self._faces = self._construct_faces(self._face_indices)
 
     @property
     def edges(self):
@@ -450,46 +531,36 @@ class TetrahedronElement(_Element3D):
                     seen.add((v, u))
                     yield u, v
 
-    #TODO use compas funcitons to compute differences and det
-    @property
-    def volume(self):
-        """The volume property."""
-
-        def determinant_3x3(m):
-            return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1]) -
-                    m[1][0] * (m[0][1] * m[2][2] - m[0][2] * m[2][1]) +
-                    m[2][0] * (m[0][1] * m[1][2] - m[0][2] * m[1][1]))
-
-
-        def subtract(a, b):
-            return (a[0] - b[0],
-                    a[1] - b[1],
-                    a[2] - b[2])
-
-        nodes_coord = [node.xyz for node in self.nodes]
-        a, b, c ,d = nodes_coord
-        return abs(determinant_3x3((subtract(a, b),
-                                    subtract(b, c),
-                                    subtract(c, d),
-                                    ))) / 6.0
 
 class PentahedronElement(_Element3D):
     """A Solid element with 5 faces (extruded triangle).
     """
+    _volume_kernel = staticmethod(pentahedra_volumes)
+    _corner_indices = PENTAHEDRON_CORNERS
 
 
 class HexahedronElement(_Element3D):
     """A Solid cuboid element with 6 faces (extruded rectangle).
+
+    Note
+    ----
+    The quadratic element (20 nodes) has the midside nodes after the corner
+    nodes, in the order of the edges of the bottom face, of the top face and
+    then of the vertical edges.
     """
 
+    # NOTE the nodes of the faces are in cyclic order
+    _face_indices = {'s1': (0, 1, 2, 3),
+                     's2': (4, 7, 6, 5),
+                     's3': (0, 4, 5, 1),
+                     's4': (1, 5, 6, 2),
+                     's5': (2, 6, 7, 3),
+                     's6': (3, 7, 4, 0)
+                     }
+    _volume_kernel = staticmethod(hexahedra_volumes)
+    _corner_indices = HEXAHEDRON_CORNERS
+    _edge_indices = HEXAHEDRON_EDGES
+
     def __init__(self, *, nodes, section, implementation=None, name=None, **kwargs):
         super(HexahedronElement, self).__init__(nodes=nodes, section=section,
                                                 implementation=implementation, name=name, **kwargs)
-        self._faces_indices = {'s1': (0, 1, 2, 3),
-                               's2': (4, 5, 6, 7),
-                               's3': (0, 1, 4, 5),
-                               's4': (1, 2, 5, 6),
-                               's5': (2, 3, 6, 7),
-                               's6': (0, 3, 4, 7)
-                               }
-        self._faces = self._construct_faces(self._face_indices)
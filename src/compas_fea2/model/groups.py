@@ -3,9 +3,52 @@ from __future__ import division
 from __future__ import print_function
 from typing import Iterable
 
+import numpy as np
+
 from compas_fea2.base import FEAData
 
-# TODO change lists to sets
+
+def _unique(keys):
+    """Sorted unique values of an integer array (sorting is faster than the
+    hash table of :func:`numpy.unique` for large arrays of keys)."""
+    keys = np.sort(keys)
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if keys.size else keys
+
+
+def _as_keys(keys, count, owner):
+    """Sorted unique keys from an array of keys or a boolean mask.
+
+    Parameters
+    ----------
+    keys : array-like
+        The keys, or a boolean mask over all the keys.
+    count : int
+        The number of keys available.
+    owner : object
+        The object owning the keys, used in the error messages.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    Raises
+    ------
+    TypeError
+        If the keys are not integers or booleans.
+    ValueError
+        If the keys do not exist.
+    """
+    keys = np.asarray(keys)
+    if keys.dtype == bool:
+        if keys.shape != (count, ):
+            raise ValueError('The mask must have {} values, not {}.'.format(count, keys.shape))
+        return np.flatnonzero(keys)
+    if keys.size and not np.issubdtype(keys.dtype, np.integer):
+        raise TypeError('The keys must be integers, not {}.'.format(keys.dtype))
+    keys = _unique(keys.astype(int).ravel())
+    if keys.size and (keys[0] < 0 or keys[-1] >= count):
+        raise ValueError('Some keys do not exist in {!r}.'.format(owner))
+    return keys
 
 
 class _Group(FEAData):
@@ -26,11 +69,15 @@ class _Group(FEAData):
         The parent object where the members of the Group belong.
     name : str
         Uniqe identifier.
+    members : set
+        The members of the group.
     """
 
     def __init__(self, members=None, name=None, **kwargs):
         super(_Group, self).__init__(name=name, **kwargs)
-        self._members = set() if not members else self._check_members(members)
+        self._members = set()
+        if members:
+            self._add_members(members)
 
     def __str__(self):
         return """
@@ -41,38 +88,43 @@ name            : {}
 """.format(self.__class__.__name__,
            len(self.__class__.__name__) * '-',
            self.name,
-           len(self._members))
+           len(self.members))
+
+    @property
+    def members(self):
+        return self._members
+
+    def _member_registration(self, member):
+        return member._registration
 
     def _check_member(self, member):
-        if not isinstance(self, FacesGroup):
-            if member._registration != self._registration:
-                raise ValueError('{} is registered to a different object'.format(member))
+        if self._member_registration(member) != self._registration:
+            raise ValueError('{} is registered to a different object'.format(member))
         return member
 
     def _check_members(self, members):
+        """Check that all the members are registered to the same object (and to
+        the same object of the group, if any) in one pass.
+
+        Returns
+        -------
+        list
+            The members.
+        """
         if not members or not isinstance(members, Iterable):
             raise ValueError('{} must be a not empty iterable'.format(members))
-        # FIXME combine in more pythonic way
-        if isinstance(self, FacesGroup):
-            if len(set([member.element._registration for member in members])) != 1:
+        members = list(members)
+        registrations = set(map(self._member_registration, members))
+        if len(registrations) != 1:
+            raise ValueError(
+                'At least one of the members to add is registered to a different object or not registered')
+        registration = registrations.pop()
+        if self._registration:
+            if registration != self._registration:
                 raise ValueError(
-                    'At least one of the members to add is registered to a different object or not registered')
-            if self._registration:
-                if list(members).pop().element._registration != self._registration:
-                    raise ValueError(
-                        'At least one of the members to add is registered to a different object than the group')
-            else:
-                self._registration = list(members).pop().element._registration
+                    'At least one of the members to add is registered to a different object than the group')
         else:
-            if len(set([member._registration for member in members])) != 1:
-                raise ValueError(
-                    'At least one of the members to add is registered to a different object or not registered')
-            if self._registration:
-                if list(members).pop()._registration != self._registration:
-                    raise ValueError(
-                        'At least one of the members to add is registered to a different object than the group')
-            else:
-                self._registration = list(members).pop()._registration
+            self._registration = registration
         return members
 
     def _add_member(self, member):
@@ -104,13 +156,196 @@ name            : {}
         [var]
             The memebers.
         """
-        self._check_members(members)
-        for member in members:
-            self.members.add(member)
+        members = self._check_members(members)
+        self._members.update(members)
+        return members
+
+
+class _KeysGroup(_Group):
+    """Base class for the groups of nodes and elements.
+
+    The members are stored as a sorted array with their keys in the part, so
+    that large groups cost little memory and the set operations (``|``, ``&``,
+    ``-`` and ``in``) are vectorized. The keys are kept up to date when the
+    nodes or the elements of the part are removed or renumbered. Members not
+    registered to a part yet are kept aside until they are.
+
+    Attributes
+    ----------
+    keys : :class:`numpy.ndarray`, read-only
+        The sorted keys of the members.
+    mask : :class:`numpy.ndarray`, read-only
+        Boolean array, `True` for the keys of the members.
+    """
+    # name of the list of the part with its members by key
+    _by_key = None
+
+    def __init__(self, members=None, name=None, **kwargs):
+        self._keys = np.empty(0, dtype=int)
+        # members not registered to a part
+        self._pending = []
+        super(_KeysGroup, self).__init__(members=members, name=name, **kwargs)
+
+    @classmethod
+    def from_keys(cls, part, keys, name=None, **kwargs):
+        """Create a group from the keys of its members in a part.
+
+        Parameters
+        ----------
+        part : :class:`compas_fea2.model._Part`
+            The part.
+        keys : array-like
+            The keys of the members, or a boolean mask over all the keys.
+        name : str, optional
+            The name of the group.
+
+        Returns
+        -------
+        :class:`compas_fea2.model._Group`
+            The group.
+
+        Raises
+        ------
+        TypeError
+            If the keys are not integers or booleans.
+        ValueError
+            If the keys do not exist in the part.
+        """
+        keys = _as_keys(keys, len(getattr(part, cls._by_key)), part)
+        group = cls.__new__(cls)
+        _KeysGroup.__init__(group, name=name, **kwargs)
+        group._store_keys(part, keys)
+        return group
+
+    @property
+    def members(self):
+        self._resolve()
+        by_key = getattr(self._registration, self._by_key) if self._registration else []
+        return set(by_key[key] for key in self._keys.tolist()).union(self._pending)
+
+    @property
+    def keys(self):
+        self._resolve()
+        keys = self._keys.view()
+        keys.flags.writeable = False
+        return keys
+
+    @property
+    def mask(self):
+        self._resolve()
+        mask = np.zeros(len(getattr(self._registration, self._by_key)) if self._registration else 0, dtype=bool)
+        mask[self._keys] = True
+        return mask
+
+    def _store_keys(self, part, keys):
+        self._registration = part
+        self._keys = _unique(np.concatenate([self._keys, np.asarray(keys, dtype=int)]))
+        part._keys_groups.add(self)
+
+    def _resolve(self):
+        """Store the keys of the pending members that have been registered
+        since they were added. The others are kept pending."""
+        registered = [member for member in self._pending if member._registration is not None]
+        if not registered:
+            return
+        # validate before replacing the pending members, so none is lost
+        self._check_members(registered)
+        self._pending = [member for member in self._pending if member._registration is None]
+        self._store_keys(self._registration, np.fromiter((member._key for member in registered), dtype=int, count=len(registered)))
+
+    def _remap(self, mapping):
+        """Update the keys after the members of the part have been renumbered.
+
+        Parameters
+        ----------
+        mapping : numpy.ndarray
+            The new key of each old key, -1 for the removed members.
+        """
+        keys = mapping[self._keys]
+        self._keys = _unique(keys[keys >= 0])
+
+    def _add_member(self, member):
+        self._add_members([member])
+        return member
+
+    def _add_members(self, members):
+        self._resolve()
+        if not members or not isinstance(members, Iterable):
+            raise ValueError('{} must be a not empty iterable'.format(members))
+        members = list(members)
+        registered = [member for member in members if member._registration is not None]
+        if registered:
+            self._check_members(registered)
+            self._store_keys(self._registration, np.fromiter((member._key for member in registered), dtype=int, count=len(registered)))
+        # the members not registered yet are stored once they are
+        self._pending.extend(member for member in members if member._registration is None)
         return members
 
+    def _combine(self, other, operation):
+        if not isinstance(other, _KeysGroup) or other._by_key != self._by_key:
+            raise TypeError('{!r} and {!r} can not be combined.'.format(self, other))
+        self._resolve()
+        other._resolve()
+        if self._pending or other._pending or self._registration is not other._registration:
+            raise ValueError('The members of {!r} and {!r} must be registered to the same part.'.format(self, other))
+        return self.__class__.from_keys(self._registration, operation(self._keys, other._keys))
+
+    def union(self, other):
+        """Create a group with the members of this group and of another one.
+
+        Parameters
+        ----------
+        other : :class:`compas_fea2.model._Group`
+            A group of the same type and part.
+
+        Returns
+        -------
+        :class:`compas_fea2.model._Group`
+        """
+        return self._combine(other, lambda a, b: _unique(np.concatenate([a, b])))
+
+    def intersection(self, other):
+        """Create a group with the members shared by this group and another one.
+
+        Parameters
+        ----------
+        other : :class:`compas_fea2.model._Group`
+            A group of the same type and part.
+
+        Returns
+        -------
+        :class:`compas_fea2.model._Group`
+        """
+        return self._combine(other, lambda a, b: np.intersect1d(a, b, assume_unique=True))
+
+    def difference(self, other):
+        """Create a group with the members of this group that are not in
+        another one.
 
-class NodesGroup(_Group):
+        Parameters
+        ----------
+        other : :class:`compas_fea2.model._Group`
+            A group of the same type and part.
+
+        Returns
+        -------
+        :class:`compas_fea2.model._Group`
+        """
+        return self._combine(other, lambda a, b: np.setdiff1d(a, b, assume_unique=True))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __contains__(self, member):
+        self._resolve()
+        if member._registration is None or member._registration is not self._registration:
+            return member in self._pending
+        index = np.searchsorted(self._keys, member._key)
+        return bool(index < len(self._keys) and self._keys[index] == member._key)
+
+
+class NodesGroup(_KeysGroup):
     """Base class nodes groups.
 
     Note
@@ -138,6 +373,8 @@ class NodesGroup(_Group):
         The model where the group is registered, by default `None`.
     """
 
+    _by_key = '_nodes_by_key'
+
     def __init__(self, *, nodes, name=None, **kwargs):
         super(NodesGroup, self).__init__(members=nodes, name=name, **kwargs)
 
@@ -151,7 +388,7 @@ class NodesGroup(_Group):
 
     @property
     def nodes(self):
-        return self._members
+        return self.members
 
     def add_node(self, node):
         """Add a node to the group.
@@ -184,7 +421,7 @@ class NodesGroup(_Group):
         return self._add_members(nodes)
 
 
-class ElementsGroup(_Group):
+class ElementsGroup(_KeysGroup):
     """Base class for elements groups.
 
     Note
@@ -213,6 +450,8 @@ class ElementsGroup(_Group):
         The model where the group is registered, by default `None`.
     """
 
+    _by_key = '_elements_by_key'
+
     def __init__(self, *, elements, name=None, **kwargs):
         super(ElementsGroup, self).__init__(members=elements,  name=name, **kwargs)
 
@@ -226,7 +465,7 @@ class ElementsGroup(_Group):
 
     @property
     def elements(self):
-        return self._members
+        return self.members
 
     def add_element(self, element):
         """Add an element to the group.
@@ -293,6 +532,9 @@ class FacesGroup(_Group):
     def __init__(self, *, faces, name=None, **kwargs):
         super(FacesGroup, self).__init__(members=faces, name=name, **kwargs)
 
+    def _member_registration(self, member):
+        return member.element._registration
+
     @property
     def part(self):
         return self._registration
@@ -2,10 +2,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas_fea2.base import ChangeTracking
 from compas_fea2.base import FEAData
 
 
-class _Material(FEAData):
+class _Material(ChangeTracking, FEAData):
     """
     Note
     ----
@@ -265,7 +266,7 @@ strain_stress : {}
 # ==============================================================================
 # User-defined Materials
 # ==============================================================================
-class UserMaterial(FEAData):
+class UserMaterial(ChangeTracking, FEAData):
     """ User Defined Material. Tho implement this type of material, a
     separate subroutine is required
 
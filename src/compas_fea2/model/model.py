@@ -8,21 +8,28 @@ import pathlib
 from typing import Callable, Iterable, Type
 import pint
 from itertools import groupby
+from numbers import Integral
 from pathlib import Path, PurePath
 
 import os
 import pickle
+import numpy as np
 import compas_fea2
 from compas_fea2.utilities._utils import timer
-from compas_fea2.utilities._utils import part_method, get_docstring, problem_method
+from compas_fea2.utilities._utils import get_docstring, problem_method
+from compas_fea2.utilities._utils import record_change
+from compas_fea2.utilities._arrays import distances_points_plane
+from compas_fea2.utilities._query import compile_condition
 
 from compas_fea2.base import FEAData
 from compas_fea2.model.parts import _Part, DeformablePart, RigidPart
+from compas_fea2.model.parts import _points_in_polygon
 from compas_fea2.model.nodes import Node
 from compas_fea2.model.elements import _Element
 from compas_fea2.model.bcs import _BoundaryCondition
 from compas_fea2.model.ics import _InitialCondition, InitialStressField
 from compas_fea2.model.groups import _Group, NodesGroup, PartsGroup, ElementsGroup, FacesGroup
+from compas_fea2.model.groups import _as_keys
 from compas_fea2.model.constraints import _Constraint, TieMPC, BeamMPC
 
 from compas_fea2.units import units
@@ -58,6 +65,15 @@ class Model(FEAData):
     bcs : dict
         Dictionary with the boundary conditions of the model and the nodes where
         these are applied.
+    bcs_keys : dict
+        {bc: {part: keys}} dictionary with the keys of the nodes where each
+        boundary condition is applied.
+    nodes_restraints : :class:`numpy.ndarray`
+        Bitmasks of the restrained degrees of freedom of all the nodes, in the
+        order of the global index (see :attr:`compas_fea2.model._Part.nodes_restraints`).
+    nodes_dof : :class:`numpy.ndarray`
+        (n, 6) boolean array, ``True`` for the free degrees of freedom of all
+        the nodes, in the order of the global index.
     ics : dict
         Dictionary with the initial conditions of the model and the nodes/elements
         where these are applied.
@@ -80,6 +96,11 @@ class Model(FEAData):
         self.description = description
         self.author = author
         self._parts = set()
+        self._parts_by_name = {}
+        self._global_index = None
+        self._nodes_tree = None
+        # NOTE the nodes of each boundary condition are stored by the parts,
+        # here only the parts where it is applied
         self._bcs = {}
         self._ics = {}
         self._constraints = set()
@@ -99,7 +120,18 @@ class Model(FEAData):
 
     @property
     def bcs(self):
-        return self._bcs
+        return {bc: set(part._nodes_by_key[key] for part, keys in parts.items() for key in keys.tolist())
+                for bc, parts in self.bcs_keys.items()}
+
+    @property
+    def bcs_keys(self):
+        bcs_keys = {}
+        for bc, parts in self._bcs.items():
+            for part in sorted(parts, key=lambda part: part.name):
+                keys = np.flatnonzero(part._nodes_bc[:part._nodes_rows] == bc)
+                if keys.size:
+                    bcs_keys.setdefault(bc, {})[part] = keys
+        return bcs_keys
 
     @property
     def ics(self):
@@ -233,10 +265,14 @@ class Model(FEAData):
         :class:`compas_fea2.model.DeformablePart`
 
         """
+        key = name if not casefold else name.casefold()
+        part = self._parts_by_name.get(key)
+        if part and (part.name if not casefold else part.name.casefold()) == key:
+            return part
+        # the part might have been renamed after being added to the model
         for part in self.parts:
-            name_1 = part.name if not casefold else part.name.casefold()
-            name_2 = name if not casefold else name.casefold()
-            if name_1 == name_2:
+            if (part.name if not casefold else part.name.casefold()) == key:
+                self._parts_by_name[key] = part
                 return part
 
     def contains_part(self, part):
@@ -254,6 +290,7 @@ class Model(FEAData):
         """
         return part in self.parts
 
+    @record_change
     def add_part(self, part):
         # type: (DeformablePart) -> DeformablePart
         """Adds a DeformablePart to the Model.
@@ -288,6 +325,8 @@ class Model(FEAData):
             print("{!r} registered to {!r}.".format(part, self))
 
         self._parts.add(part)
+        self._parts_by_name[part.name] = part
+        self._parts_by_name[part.name.casefold()] = part
 
         if not isinstance(part, RigidPart):
             for material in part.materials:
@@ -317,78 +356,624 @@ class Model(FEAData):
     #                           Nodes methods
     # =========================================================================
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_node_by_key(self, key):
-        pass
+    def find_node_by_key(self, key, **kwargs):
+        # type: (int) -> list
+        """Find the node with a given key in each part of the model. Only the
+        parts with at least `key` + 1 nodes are looked up, using the offsets of
+        the global index (see :meth:`_get_global_index`).
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_by_name(self, name):
-        pass
+        Parameters
+        ----------
+        key : int
+            The key of the node in its part.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_by_location(self, point, distance, plane=None):
-        pass
+        Returns
+        -------
+        list | dict
+            The node of each part (with a node with that key), or a
+            {part: [node]} dictionary if `dict_format` is ``True``.
+        """
+        parts, offsets, _, _ = self._get_global_index()
+        if not isinstance(key, Integral) or key < 0:
+            return self._group_by_part([], **kwargs)
+        indices = np.flatnonzero(np.diff(offsets) > key)
+        return self._group_by_part([(parts[i], key) for i in indices.tolist()], **kwargs)
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_closest_nodes_to_point(self, point, distance, number_of_nodes=1, plane=None):
-        pass
+    def find_nodes_by_name(self, name, **kwargs):
+        # type: (str) -> list
+        """Find all the nodes of the model with a given name, using the name
+        index of each part.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_around_node(self, node, distance):
-        pass
+        Parameters
+        ----------
+        name : str
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_closest_nodes_to_node(self, node, distance, number_of_nodes=1, plane=None):
-        pass
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        parts = self._get_global_index()[0]
+        pairs = [(part, node.key) for part in parts for node in part._nodes_by_name.get(name, [])]
+        return self._group_by_part(pairs, **kwargs)
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_by_attribute(self, attr, value, tolerance):
-        pass
+    def find_nodes_by_location(self, point, distance, plane=None, report=False, **kwargs):
+        # type: (Point, float, Plane, bool, bool) -> list
+        """Find all nodes within a distance of a given geometrical location.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_on_plane(self, plane):
-        pass
+        The search runs once on the model-wide spatial index.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_in_polygon(self, polygon, tolerance=1.1):
-        pass
+        Parameters
+        ----------
+        point : :class:`compas.geometry.Point`
+            A geometrical location.
+        distance : float
+            Distance from the location.
+        plane : :class:`compas.geometry.Plane`, optional
+            Limit the search to one plane.
+        report : bool, optional
+            If True, return for each part a dictionary with the node and its
+            distance to the point, otherwise, just the nodes. By default is False.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_nodes_where(self, conditions):
-        pass
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        tree, _, _ = self._get_nodes_tree()
+        if not tree.n:
+            return {} if kwargs.get('dict_format', None) else []
+        xyz = self.nodes_xyz
+        ids = np.asarray(tree.query_ball_point(np.asarray(point, dtype=float), distance, return_sorted=True), dtype=int)
+        distances = np.linalg.norm(xyz[ids] - np.asarray(point, dtype=float), axis=1)
+        mask = distances < distance
+        if plane:
+            mask &= np.abs(distances_points_plane(xyz[ids], plane)) <= 1e-6
+        pairs = self.find_nodes_by_global_ids(ids[mask])
+        if report:
+            groups = {}
+            for (part, key), d in zip(pairs, distances[mask].tolist()):
+                groups.setdefault(part, {})[part._nodes_by_key[key]] = d
+            return groups if kwargs.get('dict_format', None) else list(groups.values())
+        return self._group_by_part(pairs, **kwargs)
+
+    def _closest_nodes(self, point, distance, number_of_nodes, plane=None):
+        """(part, key) pairs of the closest nodes of the model to a point,
+        sorted by distance."""
+        if plane:
+            found = self.find_nodes_by_location(point, distance, plane, report=True, dict_format=True)
+            ranked = sorted(((d, part, node.key) for part, nodes in found.items() for node, d in nodes.items()),
+                            key=lambda item: item[0])
+            return [(part, key) for _, part, key in ranked[:number_of_nodes]]
+        return self.query_closest_nodes([point], number_of_nodes, distance)[1][0]
+
+    def find_closest_nodes_to_point(self, point, distance, number_of_nodes=1, plane=None, **kwargs):
+        # type: (Point, float, int, Plane) -> list
+        """Find the n closest nodes of the model within a distance of a given
+        geometrical location. The search runs once on the model-wide spatial
+        index, so the n nodes are the closest among all the parts.
+
+        Parameters
+        ----------
+        point : :class:`compas.geometry.Point`
+            A geometrical location.
+        distance : float
+            Distance from the location.
+        number_of_nodes : int
+            Number of nodes to return.
+        plane : :class:`compas.geometry.Plane`, optional
+            Limit the search to one plane.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        return self._group_by_part(self._closest_nodes(point, distance, number_of_nodes, plane), **kwargs)
+
+    def find_nodes_around_node(self, node, distance, plane=None, **kwargs):
+        # type: (Node, float, Plane) -> list
+        """Find all nodes of the model around a given node (excluding the node
+        itself), see :meth:`find_nodes_by_location`.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The given node.
+        distance : float
+            Search radius.
+        plane : :class:`compas.geometry.Plane`, optional
+            Limit the search to one plane.
+
+        Returns
+        -------
+        list | dict
+            For each part (with at least one node found), a {node: distance}
+            dictionary, or a {part: {node: distance}} dictionary if
+            `dict_format` is ``True``.
+        """
+        groups = self.find_nodes_by_location(node.xyz, distance, plane, report=True, dict_format=True)
+        groups.get(node.part, {}).pop(node, None)
+        groups = {part: nodes for part, nodes in groups.items() if nodes}
+        return groups if kwargs.get('dict_format', None) else list(groups.values())
+
+    def find_closest_nodes_to_node(self, node, distance, number_of_nodes=1, plane=None, **kwargs):
+        # type: (Node, float, int, Plane) -> list
+        """Find the n closest nodes of the model around a given node (excluding
+        the node itself), see :meth:`find_closest_nodes_to_point`.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The given node.
+        distance : float
+            Distance from the node.
+        number_of_nodes : int
+            Number of nodes to return.
+        plane : :class:`compas.geometry.Plane`, optional
+            Limit the search to one plane.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        pairs = self._closest_nodes(node.xyz, distance, number_of_nodes + 1, plane)
+        pairs = [(part, key) for part, key in pairs if part is not node.part or key != node.key][:number_of_nodes]
+        return self._group_by_part(pairs, **kwargs)
+
+    def find_nodes_by_attribute(self, attr, value, tolerance=0.001, **kwargs):
+        # type: (str, float, float) -> list
+        """Find all the nodes of the model with a given value for the given
+        attribute. The values of all the nodes are compared at once over the
+        global index (see :meth:`_get_global_index`).
+
+        Note
+        ----
+        Only numeric attributes are supported.
+
+        Parameters
+        ----------
+        attr : str
+            Attribute name.
+        value : float
+            Value of the attribute.
+        tolerance : float, optional
+            Maximum difference from the value, by default 0.001.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+
+        Raises
+        ------
+        ValueError
+            If the attribute is not numeric.
+        """
+        parts = self._get_global_index()[0]
+        values = np.concatenate([part._get_nodes_data({attr})[attr] for part in parts] + [np.empty(0)])
+        ids = np.flatnonzero(np.abs(values - value) <= tolerance)
+        return self._group_by_part(self.find_nodes_by_global_ids(ids), **kwargs)
+
+    def find_nodes_on_plane(self, plane, tolerance=1e-6, **kwargs):
+        # type: (Plane, float) -> list
+        """Find all nodes on a given plane (see :meth:`query_nodes_on_plane`).
+
+        Parameters
+        ----------
+        plane : :class:`compas.geometry.Plane`
+            The plane.
+        tolerance : float, optional
+            Maximum distance from the plane, by default 1e-6.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        return self._group_by_part(self.find_nodes_by_global_ids(self.query_nodes_on_plane(plane, tolerance)), **kwargs)
+
+    def query_nodes_on_plane(self, plane, tolerance=1e-6):
+        # type: (Plane, float) -> np.ndarray
+        """Find the global ids of all nodes of the model on a given plane.
+
+        Parameters
+        ----------
+        plane : :class:`compas.geometry.Plane`
+            The plane.
+        tolerance : float, optional
+            Maximum distance from the plane, by default 1e-6.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The global ids of the nodes.
+        """
+        return np.flatnonzero(np.abs(distances_points_plane(self.nodes_xyz, plane)) <= tolerance)
+
+    def find_nodes_in_polygon(self, polygon, tolerance=1e-6, **kwargs):
+        # type: (Polygon, float) -> list
+        """Find the nodes of the model contained within a planar polygon (see
+        :meth:`query_nodes_in_polygon`).
+
+        Parameters
+        ----------
+        polygon : :class:`compas.geometry.Polygon`
+            The polygon for the search.
+        tolerance : float, optional
+            Maximum distance of the nodes from the plane of the polygon, by
+            default 1e-6.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        return self._group_by_part(self.find_nodes_by_global_ids(self.query_nodes_in_polygon(polygon, tolerance)), **kwargs)
+
+    def query_nodes_in_polygon(self, polygon, tolerance=1e-6):
+        # type: (Polygon, float) -> np.ndarray
+        """Find the global ids of the nodes of the model contained within a
+        planar polygon, testing the nodes of all the parts at once.
+
+        Parameters
+        ----------
+        polygon : :class:`compas.geometry.Polygon`
+            The polygon for the search.
+        tolerance : float, optional
+            Maximum distance of the nodes from the plane of the polygon, by
+            default 1e-6.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The global ids of the nodes.
+
+        Raises
+        ------
+        ValueError
+            If the polygon has no area, so its plane is not defined.
+        """
+        return _points_in_polygon(self.nodes_xyz, polygon, tolerance)
+
+    def find_nodes_where(self, conditions, dict_format=False, **variables):
+        # type: (list(str), bool, dict) -> list
+        """Find the nodes where some conditions are met (see :meth:`query_nodes_where`).
+
+        Parameters
+        ----------
+        conditions : str | [str]
+            The condition, or list with the conditions that must be all met.
+        dict_format : bool, optional
+            If ``True`` return a {part: nodes} dictionary, by default ``False``.
+        **variables : dict
+            Values of additional variables used in the conditions.
+
+        Returns
+        -------
+        list | dict
+            The nodes of each part (with at least one node found), or a
+            {part: nodes} dictionary if `dict_format` is ``True``.
+        """
+        pairs = self.find_nodes_by_global_ids(self.query_nodes_where(conditions, **variables))
+        return self._group_by_part(pairs, dict_format=dict_format)
+
+    def query_nodes_where(self, conditions, **variables):
+        # type: (list(str), dict) -> np.ndarray
+        """Find the global ids of the nodes of the model where some conditions
+        are met. The conditions are evaluated once on the nodes of all the
+        parts (see :meth:`compas_fea2.model._Part.query_nodes_where`).
+
+        Parameters
+        ----------
+        conditions : str | [str]
+            The condition, or list with the conditions that must be all met.
+        **variables : dict
+            Values of additional variables used in the conditions.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The global ids of the nodes.
+        """
+        parts, _, _, xyz = self._get_global_index()
+        if isinstance(conditions, str):
+            conditions = [conditions]
+        predicates = [compile_condition(condition) for condition in conditions]
+        columns = {'x': 0, 'y': 1, 'z': 2}
+        data = {}
+        for name in set().union(*(predicate.names for predicate in predicates)):
+            if name in variables:
+                data[name] = variables[name]
+            elif name in columns:
+                data[name] = xyz[:, columns[name]]
+            else:
+                data[name] = np.concatenate([part._get_nodes_data({name})[name] for part in parts] + [np.empty(0)])
+        mask = np.ones(len(xyz), dtype=bool)
+        for predicate in predicates:
+            mask &= predicate(data)
+        return np.flatnonzero(mask)
+
+    def _group_by_part(self, pairs, by_key='_nodes_by_key', dict_format=False, **kwargs):
+        """Group (part, key) pairs of nodes (or elements, with `by_key` set to
+        '_elements_by_key') in the format of the part methods brought to the
+        model level (see :func:`compas_fea2.utilities._utils.part_method`).
+        """
+        groups = {}
+        for part, key in pairs:
+            groups.setdefault(part, []).append(getattr(part, by_key)[key])
+        return groups if dict_format else list(groups.values())
 
-    #@get_docstring(_Part)
-    @part_method
     def contains_node(self, node):
-        pass
+        # type: (Node) -> bool
+        """Verify that the model contains a given node.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+
+        Returns
+        -------
+        bool
+
+        """
+        return node.part in self.parts and node.part.contains_node(node)
+
+    # =========================================================================
+    #                           Global index
+    # =========================================================================
+
+    def _get_global_index(self):
+        """Get the model-wide numbering of nodes and elements.
+
+        The parts are sorted by name and their nodes (elements) are numbered
+        consecutively: the global id of a node is the offset of its part plus
+        its key. The index is rebuilt only if a part was added or its nodes
+        or elements changed.
+
+        Returns
+        -------
+        (list, :class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The parts, the nodes offsets and the elements offsets of each part
+            (with the total as last value) and the (n, 3) coordinates of all
+            the nodes.
+        """
+        parts = sorted(self.parts, key=lambda part: part.name)
+        signature = [(part, part._nodes_version, part._elements_version) for part in parts]
+        if self._global_index is None or self._global_index[0] != signature:
+            nodes_offsets = np.cumsum([0] + [part._nodes_rows for part in parts])
+            elements_offsets = np.cumsum([0] + [len(part._elements_by_key) for part in parts])
+            xyz = np.vstack([part.nodes_xyz for part in parts] + [np.empty((0, 3))])
+            xyz.flags.writeable = False
+            self._global_index = (signature, parts, nodes_offsets, elements_offsets, xyz)
+            self._nodes_tree = None
+        return self._global_index[1:]
+
+    @property
+    def nodes_xyz(self):
+        return self._get_global_index()[3]
+
+    @property
+    def nodes_restraints(self):
+        parts = self._get_global_index()[0]
+        return np.concatenate([part.nodes_restraints for part in parts] + [np.empty(0, dtype=np.uint8)])
+
+    @property
+    def nodes_dof(self):
+        parts = self._get_global_index()[0]
+        return np.vstack([part.nodes_dof for part in parts] + [np.empty((0, 6), dtype=bool)])
+
+    @property
+    def nodes_offsets(self):
+        return self._get_global_index()[1]
+
+    @property
+    def elements_offsets(self):
+        return self._get_global_index()[2]
+
+    @property
+    def elements_nodes(self):
+        from scipy.sparse import block_diag
+        parts = self._get_global_index()[0]
+        if not parts:
+            from scipy.sparse import csr_matrix
+            return csr_matrix((0, 0))
+        return block_diag([part.elements_nodes for part in parts], format='csr')
+
+    def _split_global_ids(self, ids, offsets):
+        """Convert global ids into (part, key) pairs."""
+        parts = self._get_global_index()[0]
+        ids = np.asarray(ids, dtype=int).ravel()
+        indices = np.searchsorted(offsets, ids, side='right') - 1
+        return [(parts[i], key) for i, key in zip(indices.tolist(), (ids - offsets[indices]).tolist())]
+
+    def find_nodes_by_global_ids(self, ids):
+        # type: (list) -> list
+        """Find the nodes from their model-wide ids.
+
+        Parameters
+        ----------
+        ids : list[int] | :class:`numpy.ndarray`
+            The global ids.
+
+        Returns
+        -------
+        list[(:class:`compas_fea2.model._Part`, int)]
+            The (part, key) pairs of the nodes.
+        """
+        return self._split_global_ids(ids, self.nodes_offsets)
+
+    def find_elements_by_global_ids(self, ids):
+        # type: (list) -> list
+        """Find the elements from their model-wide ids.
+
+        Parameters
+        ----------
+        ids : list[int] | :class:`numpy.ndarray`
+            The global ids.
+
+        Returns
+        -------
+        list[(:class:`compas_fea2.model._Part`, int)]
+            The (part, key) pairs of the elements.
+        """
+        return self._split_global_ids(ids, self.elements_offsets)
+
+    def get_global_ids(self, objects):
+        # type: (list) -> np.ndarray
+        """Get the model-wide ids of nodes or elements.
+
+        Parameters
+        ----------
+        objects : list[:class:`compas_fea2.model.Node`] | list[:class:`compas_fea2.model._Element`]
+            The nodes or the elements (not mixed).
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The global ids.
+        """
+        parts, nodes_offsets, elements_offsets, _ = self._get_global_index()
+        positions = {part: i for i, part in enumerate(parts)}
+        offsets = nodes_offsets
+        if objects and isinstance(next(iter(objects)), _Element):
+            offsets = elements_offsets
+        return np.array([offsets[positions[obj.part]] + obj.key for obj in objects], dtype=int)
+
+    def _get_nodes_tree(self):
+        """Get the spatial index of all the nodes of the model, built over the
+        global index of the nodes (see :meth:`_get_global_index`).
+
+        Returns
+        -------
+        (:class:`scipy.spatial.cKDTree`, list, :class:`numpy.ndarray`)
+            The spatial index, the parts in the order used to build it and the
+            offset of the first node of each part.
+        """
+        parts, offsets, _, xyz = self._get_global_index()
+        if self._nodes_tree is None:
+            from scipy.spatial import cKDTree
+            self._nodes_tree = cKDTree(xyz)
+        return self._nodes_tree, parts, offsets
+
+    def query_nodes_by_location(self, points, distance):
+        # type: (list, float) -> list
+        """Find the nodes of all the parts within a distance of multiple
+        locations at once using a model-wide spatial index.
+
+        Parameters
+        ----------
+        points : list[:class:`compas.geometry.Point`] | :class:`numpy.ndarray`
+            The (m, 3) locations.
+        distance : float
+            Search radius.
+
+        Returns
+        -------
+        list[list[(:class:`compas_fea2.model._Part`, int)]]
+            For each location, the (part, key) pairs of the nodes within the distance.
+        """
+        tree, parts, offsets = self._get_nodes_tree()
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not tree.n:
+            return [[] for _ in points]
+        results = []
+        for ids in tree.query_ball_point(points, distance, return_sorted=True):
+            ids = np.asarray(ids, dtype=int)
+            indices = np.searchsorted(offsets, ids, side='right') - 1
+            results.append([(parts[i], key) for i, key in zip(indices.tolist(), (ids - offsets[indices]).tolist())])
+        return results
+
+    def query_closest_nodes(self, points, number_of_nodes=1, distance=np.inf):
+        # type: (list, int, float) -> tuple
+        """Find the closest nodes of all the parts to multiple locations at once
+        using a model-wide spatial index.
+
+        Parameters
+        ----------
+        points : list[:class:`compas.geometry.Point`] | :class:`numpy.ndarray`
+            The (m, 3) locations.
+        number_of_nodes : int, optional
+            Number of nodes to find for each location, by default 1.
+        distance : float, optional
+            Maximum search radius, by default no limit.
+
+        Returns
+        -------
+        (:class:`numpy.ndarray`, list[list[(:class:`compas_fea2.model._Part`, int)]])
+            (m, number_of_nodes) array with the distances and, for each location,
+            the (part, key) pairs of the closest nodes sorted by distance.
+        """
+        tree, parts, offsets = self._get_nodes_tree()
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not tree.n:
+            return np.full((len(points), number_of_nodes), np.inf), [[] for _ in points]
+        distances, ids = tree.query(points, k=number_of_nodes, distance_upper_bound=distance)
+        distances, ids = distances.reshape(len(points), -1), ids.reshape(len(points), -1)
+        results = []
+        for row in ids:
+            row = row[row < tree.n]
+            indices = np.searchsorted(offsets, row, side='right') - 1
+            results.append([(parts[i], key) for i, key in zip(indices.tolist(), (row - offsets[indices]).tolist())])
+        return distances, results
 
     # =========================================================================
     #                           Nodes methods
     # =========================================================================
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_element_by_key(self, key):
-        pass
+    def find_element_by_key(self, key, **kwargs):
+        # type: (int) -> list
+        """Find the element with a given key in each part of the model, see
+        :meth:`find_node_by_key`.
 
-    #@get_docstring(_Part)
-    @part_method
-    def find_elements_by_name(self, name):
-        pass
+        Parameters
+        ----------
+        key : int
+            The key of the element in its part.
+
+        Returns
+        -------
+        list | dict
+            The element of each part (with an element with that key), or a
+            {part: [element]} dictionary if `dict_format` is ``True``.
+        """
+        parts, _, offsets, _ = self._get_global_index()
+        if not isinstance(key, Integral) or key < 0:
+            return self._group_by_part([], **kwargs)
+        indices = np.flatnonzero(np.diff(offsets) > key)
+        return self._group_by_part([(parts[i], key) for i in indices.tolist()], '_elements_by_key', **kwargs)
+
+    def find_elements_by_name(self, name, **kwargs):
+        # type: (str) -> list
+        """Find all the elements of the model with a given name, using the
+        name index of each part.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        list | dict
+            The elements of each part (with at least one element found), or a
+            {part: elements} dictionary if `dict_format` is ``True``.
+        """
+        parts = self._get_global_index()[0]
+        pairs = [(part, element.key) for part in parts for element in part._elements_by_name.get(name, [])]
+        return self._group_by_part(pairs, '_elements_by_key', **kwargs)
 
     # =========================================================================
     #                           Groups methods
     # =========================================================================
+    @record_change
     def add_parts_group(self, group):
         """Add a PartsGroup object to the Model.
 
@@ -445,6 +1030,7 @@ class Model(FEAData):
     #                           BCs methods
     # =========================================================================
 
+    @record_change
     def add_bcs(self, bc, nodes, axes='global'):
         # type: (_BoundaryCondition, Node, str) -> _BoundaryCondition
         """Add a :class:`compas_fea2.model._BoundaryCondition` to the model.
@@ -452,6 +1038,7 @@ class Model(FEAData):
         Note
         ----
         Currently global axes are used in the Boundary Conditions definition.
+        A node has only one boundary condition, the previous one is replaced.
 
         Parameters
         ----------
@@ -465,30 +1052,99 @@ class Model(FEAData):
         :class:`compas_fea2.model._BoundaryCondition`
 
         """
-        if isinstance(nodes, _Group):
-            nodes = nodes._members
+        if not isinstance(bc, _BoundaryCondition):
+            raise TypeError('{!r} is not a Boundary Condition.'.format(bc))
+        return self._assign_bcs(bc, self._nodes_keys(nodes))
 
-        if isinstance(nodes, Node):
-            nodes = [nodes]
+    @record_change
+    def add_bcs_by_keys(self, bc, part, keys, axes='global'):
+        # type: (_BoundaryCondition, _Part, list, str) -> _BoundaryCondition
+        """Add a :class:`compas_fea2.model._BoundaryCondition` to the nodes of
+        a part selected by key, without accessing the nodes.
 
+        Parameters
+        ----------
+        bc : :class:`compas_fea2.model._BoundaryCondition`
+            Boundary condition object to add to the model.
+        part : :class:`compas_fea2.model._Part`
+            The part of the nodes.
+        keys : list[int] | :class:`numpy.ndarray`
+            The keys of the nodes, or a boolean mask over all the nodes of the
+            part (for example from :meth:`compas_fea2.model._Part.find_nodes_where`).
+
+        Returns
+        -------
+        :class:`compas_fea2.model._BoundaryCondition`
+
+        Examples
+        --------
+        >>> from compas_fea2.model import DeformablePart, FixedBC
+        >>> model = Model()
+        >>> part = model.add_part(DeformablePart())
+        >>> bc = model.add_bcs_by_keys(FixedBC(), part, part.nodes_xyz[:, 2] == 0)
+        """
         if not isinstance(bc, _BoundaryCondition):
             raise TypeError('{!r} is not a Boundary Condition.'.format(bc))
+        return self._assign_bcs(bc, {part: self._check_bc_keys(part, keys)})
 
+    def _nodes_keys(self, nodes):
+        """Group nodes (or a group of nodes) by part and validate them.
+
+        Returns
+        -------
+        dict
+            {part: keys} dictionary.
+        """
+        if isinstance(nodes, NodesGroup):
+            keys = nodes.keys
+            if nodes.part is not None and not nodes._pending:
+                return {nodes.part: self._check_bc_keys(nodes.part, keys)}
+        if isinstance(nodes, _Group):
+            nodes = nodes.nodes
+        if isinstance(nodes, Node):
+            nodes = [nodes]
+
+        keys = {}
         for node in nodes:
             if not isinstance(node, Node):
                 raise TypeError('{!r} is not a Node.'.format(node))
-            if not node.part:
+            if node.part is None:
                 raise ValueError('{!r} is not registered to any part.'.format(node))
-            elif not node.part in self.parts:
-                raise ValueError('{!r} belongs to a part not registered to this model.'.format(node))
-            if isinstance(node.part, RigidPart):
-                if len(nodes) != 1 or not node.is_reference:
-                    raise ValueError('For rigid parts bundary conditions can be assigned only to the reference point')
-            node._bc = bc
+            keys.setdefault(node.part, []).append(node.key)
+        return {part: self._check_bc_keys(part, part_keys) for part, part_keys in keys.items()}
+
+    def _check_bc_keys(self, part, keys):
+        """Check that boundary conditions can be assigned to the nodes of a part.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The sorted keys of the nodes.
+        """
+        if part not in self.parts:
+            raise ValueError('{!r} is not registered to this model.'.format(part))
+        keys = _as_keys(keys, part._nodes_rows, part)
+        if isinstance(part, RigidPart):
+            if len(keys) != 1 or not part._nodes_by_key[keys[0]].is_reference:
+                raise ValueError('For rigid parts bundary conditions can be assigned only to the reference point')
+        return keys
 
-        self._bcs[bc]=set(nodes)
-        bc._registration = self
+    def _assign_bcs(self, bc, keys):
+        """Store the restraints of a boundary condition in the parts.
 
+        Parameters
+        ----------
+        bc : :class:`compas_fea2.model._BoundaryCondition` | None
+            The boundary condition, ``None`` to release the nodes.
+        keys : dict
+            {part: keys} dictionary with the nodes to restrain (or release).
+        """
+        for part, part_keys in keys.items():
+            part._set_restraints(part_keys, bc)
+            if bc is not None:
+                self._bcs.setdefault(bc, set()).add(part)
+        if bc is not None:
+            bc._registration = self
         return bc
 
     def _add_bc_type(self, bc_type, nodes, axes='global'):
@@ -700,30 +1356,44 @@ class Model(FEAData):
         """
         return self._add_bc_type('rollerYZ',  nodes, axes)
 
+    @record_change
     def remove_bcs(self, nodes):
         """Release a node previously restrained.
 
         Parameters
         ----------
-        nodes : [:class:`compas_fe2.model.Node]
+        nodes : [:class:`compas_fe2.model.Node] or :class:`compas_fea2.model.NodesGroup`
             List of nodes to release.
 
         Returns
         -------
         None
         """
+        keys = self._nodes_keys(nodes)
+        for part, part_keys in keys.items():
+            free = np.count_nonzero(part._nodes_bc[part_keys] == None)  # noqa: E711
+            if free:
+                print("WARNING: {} nodes of {!r} were not restrained. skipped!".format(free, part))
+        self._assign_bcs(None, keys)
 
-        if isinstance(nodes, Node):
-            nodes = [nodes]
+    @record_change
+    def remove_bcs_by_keys(self, part, keys):
+        """Release the nodes of a part selected by key.
 
-        for node in nodes:
-            if node.dof:
-                self.bcs[node.dof].remove(node)
-                node.dof = None
-            else:
-                print("WARNING: {!r} was not restrained. skipped!".format(node))
+        Parameters
+        ----------
+        part : :class:`compas_fea2.model._Part`
+            The part of the nodes.
+        keys : list[int] | :class:`numpy.ndarray`
+            The keys of the nodes, or a boolean mask over all the nodes of the part.
 
+        Returns
+        -------
+        None
+        """
+        self._assign_bcs(None, {part: self._check_bc_keys(part, keys)})
 
+    @record_change
     def remove_all_bcs(self):
         """Removes all the boundary conditions from the Model.
 
@@ -735,14 +1405,15 @@ class Model(FEAData):
         -------
         None
         """
-        for _, nodes in self.bcs.items():
-            self.remove_bcs(nodes)
-        self.bcs = {}
+        for part in set().union(*self._bcs.values()):
+            part._set_restraints(np.arange(part._nodes_rows))
+        self._bcs = {}
 
     # ==============================================================================
     # Initial Conditions methods
     # ==============================================================================
 
+    @record_change
     def _add_ics(self, ic, group):
         # type: (_InitialCondition, _Group, str) -> list
         """Add a :class:`compas_fea2.model._InitialCondition` to the model.
@@ -845,9 +1516,9 @@ class Model(FEAData):
         constraints_info = '\n'.join([e.__repr__() for e in self.constraints])
 
         bc_info = []
-        for bc, nodes in self.bcs.items():
-            for part, part_nodes in groupby(nodes, lambda n: n.part):
-                bc_info.append('{}: \n{}'.format(part.name, '\n'.join(['  {!r} - # of restrained nodes {}'.format(bc, len(list(part_nodes)))])))
+        for bc, parts in self.bcs_keys.items():
+            for part, keys in parts.items():
+                bc_info.append('{}: \n{}'.format(part.name, '\n'.join(['  {!r} - # of restrained nodes {}'.format(bc, len(keys))])))
         bc_info = '\n'.join(bc_info)
 
         ic_info = []
@@ -891,43 +1562,148 @@ Initial Conditions
         return data
 
     # ==============================================================================
-    # Save model file
+    # Changes
     # ==============================================================================
 
-    def check(self, type='quick'):
-        """Check for possible problems in the model
+    def changed_since(self, snapshot):
+        """Find the objects of the model changed since a snapshot, for example
+        to write again only the changed parts of the input file.
+
+        Parameters
+        ----------
+        snapshot : int
+            The snapshot, see :func:`compas_fea2.base.snapshot`.
 
-            Warning
-            -------
-            WIP! It is better if you check yourself...
+        Returns
+        -------
+        dict
+            {'parts': list, 'materials': list, 'sections': list, 'bcs': list, 'steps': list, 'patterns': list}
+            with the objects of each kind changed (or added) after the snapshot.
+
+        Examples
+        --------
+        >>> from compas_fea2.base import snapshot
+        >>> model = Model()
+        >>> before = snapshot()
+        >>> model.changed_since(before)['parts']
+        []
+        """
+        steps = [step for problem in self.problems for step in problem.steps]
+        candidates = {
+            'parts': self.parts,
+            'materials': self.materials,
+            'sections': self.sections,
+            'bcs': self.bcs,
+            'steps': steps,
+            'patterns': [pattern for step in steps for pattern in getattr(step, '_patterns', ())],
+        }
+        return {kind: [item for item in items if item.version > snapshot] for kind, items in candidates.items()}
 
-            Parameters
-            ----------
-            type : str, optional
-                *quick* or *deep* check, by default 'quick'
+    # ==============================================================================
+    # Save model file
+    # ==============================================================================
 
-            Returns
-            -------
-            str
-                report
-            """
+    def check(self, level='quick', processes=None):
+        """Check for possible problems in the model before running an analysis.
+
+        The *quick* check looks, part by part, for:
+
+        - ``orphan_nodes``: nodes not used by any element.
+        - ``unrestrained_nodes``: nodes of elements without a path through the
+          elements to a restrained node. The connections between parts
+          (constraints, interactions) are not followed.
+        - ``duplicate_elements``: elements with the same nodes as an element
+          with a smaller key.
+        - ``degenerate_elements``: elements with a (numerically) zero volume,
+          area or length.
+        - ``unregistered_sections`` and ``unregistered_materials``: elements
+          whose section (or its material) is not registered to the part.
+        - ``invalid_patterns``: patterns of the steps of the problems applied
+          to nodes or elements outside the model.
+
+        The *deep* check also looks for ``inverted_elements`` (negative
+        jacobian, see :meth:`compas_fea2.model._Part.mesh_quality`) and
+        ``coincident_nodes`` (closer than ``compas_fea2.GLOBAL_TOLERANCE`` to
+        a node with a smaller key). These checks run on the arrays of the
+        parts in a pool of processes.
+
+        Warning
+        -------
+        ``coincident_nodes`` uses ``compas_fea2.GLOBAL_TOLERANCE``, which is 1
+        by default: with that value every node of a mesh with elements of
+        about a metre (in model units) is flagged. Set a tolerance suited to
+        the model before running a deep check.
 
-        def _check_units(self):
-            """Check if the units are consistent.
-            """
-            raise NotImplementedError
+        Parameters
+        ----------
+        level : str, optional
+            *quick* or *deep* check, by default 'quick'
+        processes : int, optional
+            Number of processes used by the deep check, by default the number
+            of CPUs. With 1 the checks run in the current process.
 
-        def _check_bcs(self):
-            """Check if the units are consistent.
-            """
-            raise NotImplementedError
+        Returns
+        -------
+        dict
+            {issue: {part: keys}} with the keys of the nodes or the elements of
+            each part with the issue. ``invalid_patterns`` is a list of patterns.
+
+        Examples
+        --------
+        >>> model = Model()
+        >>> any(model.check().values())
+        False
+        """
+        if level not in ('quick', 'deep'):
+            raise ValueError('The level of check must be quick or deep, not {!r}.'.format(level))
+        parts = self._get_global_index()[0]
+        issues = ['orphan_nodes', 'unrestrained_nodes', 'duplicate_elements', 'degenerate_elements',
+                  'unregistered_sections', 'unregistered_materials']
+        if level == 'deep':
+            issues += ['inverted_elements', 'coincident_nodes']
+        report = {issue: {} for issue in issues}
+        for part in parts:
+            for issue, keys in part._check_mesh().items():
+                if len(keys):
+                    report[issue][part] = keys
+
+        if level == 'deep':
+            from compas_fea2.model.parts import _check_quality
+
+            jobs = [(part._nodes_xyz[:part._nodes_rows], part._get_quality_blocks(), len(part._elements_by_key),
+                     compas_fea2.GLOBAL_TOLERANCE) for part in parts]
+            if processes == 1 or len(jobs) < 2:
+                results = [_check_quality(*job) for job in jobs]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    results = list(pool.map(_check_quality, *zip(*jobs)))
+            for part, result in zip(parts, results):
+                for issue, keys in result.items():
+                    if len(keys):
+                        report[issue][part] = keys
+
+        report['invalid_patterns'] = []
+        for problem in self.problems:
+            for step in problem.steps:
+                for pattern in getattr(step, '_patterns', ()):
+                    locations = pattern.distribution or []
+                    if isinstance(locations, _Group):
+                        locations = locations.members
+                    if any(getattr(location, 'part', None) not in self._parts for location in locations):
+                        report['invalid_patterns'].append(pattern)
 
-        raise NotImplementedError
+        if compas_fea2.VERBOSE:
+            for issue, items in report.items():
+                if items:
+                    print('{}: {}'.format(issue, sum(len(keys) for keys in items.values()) if isinstance(items, dict) else len(items)))
+        return report
 
     # =========================================================================
     #                       Problems methods
     # =========================================================================
 
+    @record_change
     def add_problem(self, problem):
         """Add a :class:`compas_fea2.problem.Problem` object to the model.
 
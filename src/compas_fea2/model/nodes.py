@@ -2,11 +2,16 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from math import isnan
+from math import nan
+
 from compas.utilities.maps import geometric_key
 from compas.geometry import Point
 from compas_fea2.base import FEAData
+from compas_fea2.utilities._arrays import geometric_key as int_geometric_key
 
 from .bcs import _BoundaryCondition
+from .bcs import _DOFS
 import compas_fea2
 
 class Node(FEAData):
@@ -18,6 +23,15 @@ class Node(FEAData):
     belong to only one Part. Every time a node is added to a Part, it gets
     registered to that Part.
 
+    Once registered, the coordinates, the mass and the temperature of the node
+    are stored in the arrays of the Part (see :attr:`compas_fea2.model._Part.nodes_xyz`)
+    and the Node acts as a view on the corresponding row. The Node object itself
+    is still a full :class:`compas_fea2.base.FEAData`, with its own dictionaries
+    of loads, displacements and results and its cached geometric keys, so each
+    node costs close to a kilobyte on top of its rows in the arrays. Use the
+    arrays of the Part (and the ``query_*`` methods, that return keys) to work
+    on large meshes.
+
     Parameters
     ----------
     xyz : list[float, float, float] | :class:`compas.geometry.Point`
@@ -52,8 +66,14 @@ class Node(FEAData):
         The Z coordinate.
     gkey : str, read-only
         The geometric key of the Node.
+    igkey : tuple(int, int, int), read-only
+        The geometric key of the Node as integers (the coordinates scaled by
+        the precision and rounded). Cheaper to hash and compare than `gkey`.
     dof : dict
         Dictionary with the active degrees of freedom.
+    bc : :class:`compas_fea2.model._BoundaryCondition` | None, read-only
+        The boundary condition assigned to the node (see
+        :meth:`compas_fea2.model.Model.add_bcs`).
     on_boundary : bool | None, read-only
         `True` if the node is on the boundary mesh of the part, `False`
         otherwise, by default `None`.
@@ -79,13 +99,12 @@ class Node(FEAData):
         super(Node, self).__init__(name=name, **kwargs)
         self._key = None
 
+        # NOTE these values are moved into the arrays of the part as soon as
+        # the node is registered (see `_Part.add_node`).
+        self._xyz = None
+        self._gkey = None
+        self._igkey = None
         self.xyz = xyz
-        self._x = xyz[0]
-        self._y = xyz[1]
-        self._z = xyz[2]
-
-        self._bc = None
-        self._dof = {'x': True, 'y': True, 'z': True, 'xx': True, 'yy': True, 'zz': True}
 
         self._mass = mass if isinstance(mass, tuple) else tuple([mass]*3)
         self._temperature = temperature
@@ -111,70 +130,108 @@ class Node(FEAData):
 
     @property
     def xyz(self):
-        return [self._x, self._y, self._z]
+        if self._registration is None:
+            return list(self._xyz)
+        return self._registration._nodes_xyz[self._key].tolist()
 
     @xyz.setter
     def xyz(self, value):
         if len(value)!=3:
             raise ValueError('Provide a 3 element touple or list')
-        self._x = value[0]
-        self._y = value[1]
-        self._z = value[2]
+        if self._registration is None:
+            self._xyz = [value[0], value[1], value[2]]
+            self._gkey = self._igkey = None
+        else:
+            self._registration._move_node(self, [value[0], value[1], value[2]])
+
+    def _get_coordinate(self, index):
+        if self._registration is None:
+            return self._xyz[index]
+        return float(self._registration._nodes_xyz[self._key, index])
+
+    def _set_coordinate(self, index, value):
+        if self._registration is None:
+            self._xyz[index] = float(value)
+            self._gkey = self._igkey = None
+        else:
+            self._registration._move_node(self, value, index)
 
     @property
     def x(self):
-        return self._x
+        return self._get_coordinate(0)
 
     @x.setter
     def x(self, value):
-        self._x = float(value)
+        self._set_coordinate(0, value)
 
     @property
     def y(self):
-        return self._y
+        return self._get_coordinate(1)
 
     @y.setter
     def y(self, value):
-        self._y = float(value)
+        self._set_coordinate(1, value)
 
     @property
     def z(self):
-        return self._z
+        return self._get_coordinate(2)
 
     @z.setter
     def z(self, value):
-        self._z = float(value)
+        self._set_coordinate(2, value)
 
     @property
     def mass(self):
-        return self._mass
+        if self._registration is None:
+            return self._mass
+        return tuple(None if isnan(m) else m for m in self._registration._nodes_mass[self._key].tolist())
 
     @mass.setter
     def mass(self, value):
-        self._mass = value if isinstance(value, tuple) else tuple([value]*3)
+        value = value if isinstance(value, tuple) else tuple([value]*3)
+        if self._registration is None:
+            self._mass = value
+        else:
+            self._registration._nodes_mass[self._key] = [nan if m is None else m for m in value]
+            self._registration._changed()
 
     @property
     def temperature(self):
-        return self._temperature
+        if self._registration is None:
+            return self._temperature
+        temperature = float(self._registration._nodes_temperature[self._key])
+        return None if isnan(temperature) else temperature
 
     @temperature.setter
     def temperature(self, value):
-        self._temperature = value
+        if self._registration is None:
+            self._temperature = value
+        else:
+            self._registration._nodes_temperature[self._key] = nan if value is None else value
+            self._registration._changed()
 
     @property
     def gkey(self):
-        return geometric_key(self.xyz, precision=compas_fea2.PRECISION)
+        if self._gkey is None:
+            self._gkey = geometric_key(self.xyz, precision=compas_fea2.PRECISION)
+        return self._gkey
+
+    @property
+    def igkey(self):
+        if self._igkey is None:
+            self._igkey = int_geometric_key(self.xyz, compas_fea2.PRECISION)
+        return self._igkey
 
     @property
     def dof(self):
-        if self.bc:
-            return {attr: not bool(getattr(self.bc, attr)) for attr in ['x', 'y', 'z', 'xx', 'yy', 'zz']}
-        else:
-            return self._dof
+        mask = int(self._registration._nodes_restraints[self._key]) if self._registration is not None else 0
+        return {attr: not mask >> i & 1 for i, attr in enumerate(_DOFS)}
 
     @property
     def bc(self):
-        return self._bc
+        if self._registration is None:
+            return None
+        return self._registration._nodes_bc[self._key]
 
     @property
     def loads(self):
@@ -2,14 +2,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from itertools import chain
 from math import sqrt
+from numbers import Integral
+from weakref import WeakSet
+import numpy as np
 from compas.geometry import Point, Plane, Frame, Polygon
-from compas.geometry import Transformation, Scale
+from compas.geometry import Transformation
 from compas.geometry import normalize_vector
 from compas.geometry import distance_point_point_sqrd
-from compas.geometry import is_point_in_polygon_xy
-from compas.geometry import is_point_on_plane
-from compas.utilities import geometric_key
 from compas.geometry import Vector
 from compas.geometry import sum_vectors
 
@@ -25,6 +26,134 @@ from .groups import NodesGroup, ElementsGroup, FacesGroup
 from .ics import InitialStressField
 
 from compas_fea2.utilities._utils import timer
+from compas_fea2.utilities._utils import record_change
+from compas_fea2.utilities._arrays import geometric_keys
+from compas_fea2.utilities._arrays import centroids
+from compas_fea2.utilities._arrays import distances_points_plane
+from compas_fea2.utilities._arrays import _fill_padding
+from compas_fea2.utilities._arrays import polygons_areas
+from compas_fea2.utilities._arrays import polygons_quality
+from compas_fea2.utilities._arrays import segments_lengths
+from compas_fea2.utilities._arrays import points_in_polygon_xy
+from compas_fea2.utilities._arrays import solids_quality
+from compas_fea2.utilities._arrays import split_edges
+from compas_fea2.utilities._arrays import transform_points
+from compas_fea2.utilities._query import compile_condition
+
+# fea2 element for each (dimension, number of nodes) of the gmsh elements
+_GMSH_ELEMENTS = {
+    (2, 3): ShellElement,
+    (2, 4): ShellElement,
+    (3, 4): TetrahedronElement,
+    (3, 8): HexahedronElement,
+}
+
+
+def _padded_array(rows):
+    """Convert a list of lists of integers with different lengths (for
+    example the faces of a mesh) into an array padded with -1.
+
+    Parameters
+    ----------
+    rows : list[list[int]]
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    lengths = np.fromiter(map(len, rows), dtype=int, count=len(rows))
+    array = np.full((len(rows), lengths.max(initial=0)), -1, dtype=int)
+    array[np.arange(array.shape[1]) < lengths[:, None]] = np.fromiter(chain.from_iterable(rows), dtype=int, count=lengths.sum())
+    return array
+
+
+def _points_in_polygon(xyz, polygon, tolerance=1e-6):
+    """Find the points contained within a planar polygon.
+
+    The plane of the polygon passes through its centroid, normal to its
+    average normal. The points on that plane and the polygon itself are
+    brought to the XY plane with a single transformation, then all the points
+    are tested at once.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the points.
+    polygon : :class:`compas.geometry.Polygon`
+        The polygon.
+    tolerance : float, optional
+        Maximum distance of the points from the plane of the polygon, by
+        default 1e-6.
+
+    Returns
+    -------
+    numpy.ndarray
+        The sorted indices of the points contained in the polygon.
+
+    Raises
+    ------
+    ValueError
+        If the polygon has no area, so its plane is not defined.
+    """
+    try:
+        plane = Plane(polygon.centroid, polygon.normal)
+    except ZeroDivisionError:
+        raise ValueError('The plane of {!r} is not defined.'.format(polygon))
+    frame = Frame.from_plane(plane)
+    T = Transformation.from_frame_to_frame(frame, Frame.worldXY())
+    indices = np.flatnonzero(np.abs(distances_points_plane(xyz, plane)) <= tolerance)
+    points_xy = transform_points(xyz[indices], T)
+    polygon_xy = transform_points(polygon.points, T)
+    return indices[points_in_polygon_xy(points_xy, polygon_xy)]
+
+
+def _elements_quality(xyz, blocks, count):
+    """Quality metrics of the elements of a part (see :meth:`_Part.mesh_quality`).
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    blocks : list
+        (keys, connectivity, corners, faces) tuples for each element type,
+        with ``corners`` set to ``None`` for the 2D elements.
+    count : int
+        Number of elements of the part.
+
+    Returns
+    -------
+    dict
+        {metric: array} with the values for each element, indexed by key.
+    """
+    metrics = ('aspect_ratio', 'min_angle', 'jacobian', 'skewness')
+    quality = {metric: np.full(count, np.nan) for metric in metrics}
+    for keys, connectivity, corners, faces in blocks:
+        if corners:
+            values = solids_quality(xyz, connectivity, corners, faces)
+        else:
+            values = polygons_quality(xyz, connectivity)
+        for metric in metrics:
+            quality[metric][keys] = values[metric]
+    return quality
+
+
+def _check_quality(xyz, blocks, count, tolerance):
+    """Deep checks of a part, see :meth:`compas_fea2.model.Model.check`.
+
+    This only takes arrays, so that it can run in a worker process.
+
+    Returns
+    -------
+    dict
+        {'inverted_elements': keys, 'coincident_nodes': keys}, the coincident
+        nodes are the ones closer than the tolerance to a node with a smaller key.
+    """
+    from scipy.spatial import cKDTree
+
+    quality = _elements_quality(xyz, blocks, count)
+    pairs = cKDTree(xyz).query_pairs(np.nextafter(tolerance, 0), output_type='ndarray')
+    return {'inverted_elements': np.flatnonzero(quality['jacobian'] < 0),
+            'coincident_nodes': np.unique(pairs.max(axis=1)) if len(pairs) else np.empty(0, dtype=int)}
 
 
 class _Part(FEAData):
@@ -33,6 +162,12 @@ class _Part(FEAData):
     ----
     Parts are registered to a :class:`compas_fea2.model.Model`.
 
+    The data of the nodes (coordinates, masses, temperatures and restraints)
+    are stored in contiguous arrays, one row per node key. One
+    :class:`compas_fea2.model.Node` object is still kept for each row, so the
+    memory used by a part still grows with the size of these objects and not
+    only with the arrays.
+
     Parameters
     ----------
     name : str, optional
@@ -50,8 +185,39 @@ class _Part(FEAData):
         The nodes belonging to the part.
     nodes_count : int
         Number of nodes in the part.
-    gkey_node : {gkey : :class:`compas_fea2.model.Node`}
-        Dictionary that associates each node and its geometric key}
+    nodes_xyz : :class:`numpy.ndarray`, read-only
+        (n, 3) array with the coordinates of the nodes. The row of each node
+        corresponds to its key.
+    nodes_mass : :class:`numpy.ndarray`, read-only
+        (n, 3) array with the lumped masses of the nodes (``nan`` if not defined).
+    nodes_temperature : :class:`numpy.ndarray`, read-only
+        (n, ) array with the temperatures of the nodes (``nan`` if not defined).
+    nodes_restraints : :class:`numpy.ndarray`, read-only
+        (n, ) array with the bitmasks of the restrained degrees of freedom of
+        the nodes (see :attr:`compas_fea2.model._BoundaryCondition.mask`).
+    nodes_dof : :class:`numpy.ndarray`
+        (n, 6) boolean array, ``True`` for the free degrees of freedom of the
+        nodes (x, y, z, xx, yy, zz).
+    bandwidth : int, read-only
+        Maximum difference between the keys of two nodes sharing an element
+        (see :meth:`renumber`).
+    nodes_tree : :class:`scipy.spatial.cKDTree`, read-only
+        Spatial index of the nodes, built on first access.
+    elements_volumes : :class:`numpy.ndarray`, read-only
+        Volumes of the solid elements, indexed by key (nan for the others).
+    elements_areas : :class:`numpy.ndarray`, read-only
+        Areas of the shell and membrane elements, indexed by key (nan for the others).
+    elements_lengths : :class:`numpy.ndarray`, read-only
+        Lengths of the 1D elements, indexed by key (nan for the others).
+    elements_centroids : :class:`numpy.ndarray`, read-only
+        Centroids (average of the nodes) of the elements, indexed by key.
+    elements_nodes : :class:`scipy.sparse.csr_matrix`, read-only
+        Element to node adjacency (elements x nodes), built on first access.
+    nodes_elements : :class:`scipy.sparse.csr_matrix`, read-only
+        Node to element adjacency (nodes x elements), built on first access.
+    gkey_node : {igkey : :class:`compas_fea2.model.Node`}
+        Dictionary that associates each node and its integer geometric key
+        (see :attr:`compas_fea2.model.Node.igkey`).
     materials : Set[:class:`compas_fea2.model._Material`]
         The materials belonging to the part.
     sections : Set[:class:`compas_fea2.model._Section`]
@@ -59,7 +225,9 @@ class _Part(FEAData):
     elements : Set[:class:`compas_fea2.model._Element`]
         The elements belonging to the part.
     element_types : {:class:`compas_fea2.model._Element` : [:class:`compas_fea2.model._Element`]]
-        Dictionary with the elements of the part for each element type.
+        Dictionary with the elements of the part for each element type, sorted
+        by key. It is kept up to date when elements are added or removed and
+        must not be modified.
     element_count : int
         Number of elements in the part
     nodesgroups : Set[:class:`compas_fea2.model.NodesGroup`]
@@ -74,10 +242,41 @@ class _Part(FEAData):
         The discretized outer boundary mesh enveloping the Part.
     """
 
+    # NOTE the arrays storing the data of the nodes and the value of the rows
+    # not used
+    _nodes_arrays = (('_nodes_xyz', np.nan), ('_nodes_mass', np.nan), ('_nodes_temperature', np.nan),
+                     ('_nodes_restraints', 0), ('_nodes_bc', None))
+
     def __init__(self, name=None, **kwargs):
         super(_Part, self).__init__(name=name, **kwargs)
         self._nodes = set()
         self._gkey_node = {}
+        # NOTE nodes data are stored column-wise, the key of each node is its row.
+        self._nodes_xyz = np.empty((0, 3), dtype=float)
+        self._nodes_mass = np.empty((0, 3), dtype=float)
+        self._nodes_temperature = np.empty((0, ), dtype=float)
+        # NOTE the boundary conditions are assigned by the model
+        self._nodes_restraints = np.empty((0, ), dtype=np.uint8)
+        self._nodes_bc = np.empty((0, ), dtype=object)
+        self._nodes_rows = 0
+        # NOTE indexes for constant time look-ups
+        self._nodes_by_key = []
+        self._nodes_by_name = {}
+        self._elements_by_key = []
+        self._elements_by_name = {}
+        self._elements_by_type = {}
+        # NOTE {type: (keys, connectivity, rows)}, kept next to the buckets
+        self._elements_connectivity = {}
+        self._elements_geometry = None
+        # NOTE the version changes every time the connectivity changes
+        # (elements added or removed, nodes re-keyed)
+        self._elements_version = 0
+        self._adjacency = None
+        # NOTE the spatial index is built lazily and dropped every time the
+        # nodes change
+        self._nodes_version = 0
+        self._nodes_tree = None
+        self._nodes_grid = None
         self._sections = set()
         self._materials = set()
         self._elements = set()
@@ -85,9 +284,12 @@ class _Part(FEAData):
         self._nodesgroups = set()
         self._elementsgroups = set()
         self._facesgroups = set()
+        # the node and element groups (also not added to the part) storing keys
+        self._keys_groups = WeakSet()
 
         self._boundary_mesh = None
         self._discretized_boundary_mesh = None
+        self._boundary = None
 
         self._results = {}
 
@@ -95,6 +297,42 @@ class _Part(FEAData):
     def nodes(self):
         return self._nodes
 
+    @property
+    def nodes_xyz(self):
+        return self._read_only(self._nodes_xyz[:self._nodes_rows])
+
+    @property
+    def nodes_mass(self):
+        return self._read_only(self._nodes_mass[:self._nodes_rows])
+
+    @property
+    def nodes_temperature(self):
+        return self._read_only(self._nodes_temperature[:self._nodes_rows])
+
+    @property
+    def nodes_restraints(self):
+        return self._read_only(self._nodes_restraints[:self._nodes_rows])
+
+    @property
+    def nodes_dof(self):
+        restraints = self._nodes_restraints[:self._nodes_rows, None]
+        return np.unpackbits(restraints, axis=1, count=6, bitorder='little') == 0
+
+    @property
+    def nodes_tree(self):
+        if self._nodes_tree is None:
+            from scipy.spatial import cKDTree
+            self._nodes_tree = cKDTree(self._nodes_xyz[:self._nodes_rows], copy_data=True)
+        return self._nodes_tree
+
+    @property
+    def elements_nodes(self):
+        return self._get_adjacency()[0]
+
+    @property
+    def nodes_elements(self):
+        return self._get_adjacency()[1]
+
     @property
     def elements(self):
         return self._elements
@@ -137,11 +375,23 @@ class _Part(FEAData):
 
     @property
     def volume(self):
-        self._volume = 0.
-        for element in self.elements:
-            if element.volume:
-                self._volume += element.volume
-        return self._volume
+        return float(np.nansum(self.elements_volumes))
+
+    @property
+    def elements_volumes(self):
+        return self._get_elements_geometry()['volume']
+
+    @property
+    def elements_areas(self):
+        return self._get_elements_geometry()['area']
+
+    @property
+    def elements_lengths(self):
+        return self._get_elements_geometry()['length']
+
+    @property
+    def elements_centroids(self):
+        return self._get_elements_geometry()['centroid']
 
     @property
     def model(self):
@@ -161,10 +411,7 @@ class _Part(FEAData):
 
     @property
     def element_types(self):
-        element_types = {}
-        for element in self.elements:
-            element_types.setdefault(type(element),[]).append(element)
-        return element_types
+        return self._elements_by_type
 
 
     def __str__(self):
@@ -213,6 +460,76 @@ number of nodes    : {}
         prt.add_element(element)
         return prt
 
+    @classmethod
+    def from_arrays(cls, coords, connectivity, element_type=None, section=None, name=None, **kwargs):
+        """Create a Part from an array of nodes coordinates and one or more
+        arrays of elements connectivity.
+
+        The arrays are validated once and the nodes and the elements are
+        registered in bulk, which is much faster than adding them one by one.
+
+        Note
+        ----
+        If ``compas_fea2.POINT_OVERLAP`` is ``False``, the coincident nodes are
+        merged (see :meth:`merge_coincident_nodes`).
+
+        Parameters
+        ----------
+        coords : array-like
+            (n, 3) array with the coordinates of the nodes. The key of each node
+            is its row index.
+        connectivity : array-like | dict
+            (m, k) integer array with the keys of the nodes of each element,
+            padded with -1 for elements with less nodes. For parts with
+            different element types, provide a dictionary
+            {element_type: connectivity}.
+        element_type : str | type, optional
+            The element class (or its name, for example 'TetrahedronElement'),
+            by default None. It is ignored if `connectivity` is a dictionary.
+        section : :class:`compas_fea2.model._Section`, optional
+            The section assigned to all the elements, by default None.
+        name : str, optional
+            The name of the part, by default None (one is automatically generated).
+        **kwargs : dict
+            Additional arguments passed to the constructor of the elements.
+
+        Returns
+        -------
+        :class:`compas_fea2.model._Part`
+            The part.
+
+        Raises
+        ------
+        ValueError
+            If the arrays have the wrong shape or the connectivity refers to
+            nodes that do not exist.
+        TypeError
+            If the element type is not an element or the connectivity is not
+            an integer array.
+
+        Examples
+        --------
+        >>> from compas_fea2.model import ElasticIsotropic, SolidSection
+        >>> section = SolidSection(material=ElasticIsotropic(E=210000, v=0.3, density=7.8e-9))
+        >>> coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+        >>> part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3]], 'TetrahedronElement', section)
+        >>> len(part.nodes), len(part.elements)
+        (4, 1)
+
+        """
+        if not isinstance(connectivity, dict):
+            connectivity = {element_type: connectivity}
+
+        part = cls(name=name)
+        part._add_nodes_from_array(coords)
+        for element_type, element_nodes in connectivity.items():
+            part._add_elements_from_array(element_type, element_nodes, section=section, **kwargs)
+
+        if not compas_fea2.POINT_OVERLAP:
+            part.merge_coincident_nodes()
+
+        return part
+
     @classmethod
     @timer(message='compas Mesh successfully imported in ')
     def shell_from_compas_mesh(cls, mesh, section, name=None, **kwargs):
@@ -232,13 +549,11 @@ number of nodes    : {}
 
         """
         part = cls(name, **kwargs)
-
-        vertex_node = {vertex: part.add_node(Node(mesh.vertex_coordinates(vertex))) for vertex in mesh.vertices()}
-
-        for face in mesh.faces():
-            nodes = [vertex_node[vertex] for vertex in mesh.face_vertices(face)]
-            element = ShellElement(nodes=nodes, section=section)
-            part.add_element(element)
+        vertices, faces = mesh.to_vertices_and_faces()
+        part._add_nodes_from_array(vertices)
+        part._add_elements_from_array(ShellElement, _padded_array(faces), section=section)
+        if not compas_fea2.POINT_OVERLAP:
+            part.merge_coincident_nodes()
 
         part._boundary_mesh = mesh
         part._discretized_boundary_mesh = mesh
@@ -258,10 +573,6 @@ number of nodes    : {}
         The gmshModel must have the right dimension corresponding to the section
         provided.
 
-        Warning
-        -------
-        the `split` option is currently not implemented
-
         Parameters
         ----------
         name : str
@@ -274,6 +585,7 @@ number of nodes    : {}
         split : bool, optional
             If ``True`` create an additional node in the middle of the edges of the
             elements to implement more refined element types. Check for example [2]_.
+            Only available for solid elements (tetrahedra and hexahedra).
         verbose : bool, optional
             If ``True`` print a log, by default False
         check : bool, optional
@@ -299,49 +611,49 @@ number of nodes    : {}
         >>> part = DeformablePart.from_gmsh('part_gmsh', gmshModel, sec)
 
         """
-        import numpy as np
-
-        part = cls(name=name)
-        # add nodes
-        gmsh_nodes = gmshModel.mesh.get_nodes()
-        node_coords = gmsh_nodes[1].reshape((-1, 3), order='C')
-        fea2_nodes = [part.add_node(Node(coords.tolist())) for coords in node_coords]
-        # add elements
-        gmsh_elements = gmshModel.mesh.get_elements()
-
         section = kwargs.get('section', None)
         split = kwargs.get('split', False)
         verbose = kwargs.get('verbose', False)
         rigid = kwargs.get('rigid', False)
 
-        dimension = 2 if isinstance(section, SolidSection) else 1
-
-        ntags_per_element = np.split(gmsh_elements[2][dimension]-1,
-                                     len(gmsh_elements[1][dimension]))  # gmsh keys start from 1
-
-        for ntags in ntags_per_element:
-            if split:
-                raise NotImplementedError('this feature is under development')
-            element_nodes = [fea2_nodes[ntag] for ntag in ntags]
-            if ntags.size == 3:
-                k = part.add_element(ShellElement(nodes=element_nodes,
-                                                  section=section,
-                                                  rigid=rigid))
-            elif ntags.size == 4:
-                if isinstance(section, ShellSection):
-                    k = part.add_element(ShellElement(nodes=element_nodes,
-                                                      section=section,
-                                                      rigid=rigid))
-                else:
-                    k = part.add_element(TetrahedronElement(nodes=element_nodes,
-                                                            section=section))
-            elif ntags.size == 8:
-                k = part.add_element(HexahedronElement(nodes=element_nodes,
-                                                       section=section))
-            else:
-                raise NotImplementedError('Element with {} nodes not supported'.format(ntags.size))
+        part = cls(name=name)
+        node_tags, node_coords, _ = gmshModel.mesh.get_nodes()
+        node_tags = np.asarray(node_tags, dtype=int)
+        coords = np.asarray(node_coords, dtype=float).reshape((-1, 3), order='C')
+        # gmsh tags are not necessarily contiguous
+        tag_key = np.full(node_tags.max() + 1, -1, dtype=int)
+        tag_key[node_tags] = np.arange(node_tags.size)
+
+        # only the blocks with the same dimension of the section
+        dimension = 3 if isinstance(section, SolidSection) else 2
+        element_kwargs = {'rigid': rigid} if dimension == 2 else {}
+        blocks = []
+        element_types, _, element_ntags = gmshModel.mesh.get_elements()
+        for gmsh_type, ntags in zip(element_types, element_ntags):
+            _, dim, _, nodes_per_element, _, _ = gmshModel.mesh.get_element_properties(gmsh_type)
+            if dim != dimension:
+                continue
+            element_type = _GMSH_ELEMENTS.get((dim, nodes_per_element))
+            if not element_type:
+                raise NotImplementedError('Element with {} nodes not supported'.format(nodes_per_element))
+            blocks.append((element_type, tag_key[np.asarray(ntags, dtype=int).reshape((-1, nodes_per_element))]))
+
+        if split:
+            for element_type, _ in blocks:
+                if not getattr(element_type, '_edge_indices', None):
+                    raise NotImplementedError('Quadratic {} are not supported.'.format(element_type.__name__))
+            midsides, connectivities = split_edges(coords, [(connectivity, element_type._edge_indices)
+                                                            for element_type, connectivity in blocks])
+            coords = np.vstack([coords, midsides])
+            blocks = [(element_type, connectivity) for (element_type, _), connectivity in zip(blocks, connectivities)]
+            if verbose:
+                print('{} midside nodes added'.format(len(midsides)))
+
+        part._add_nodes_from_array(coords)
+        for element_type, connectivity in blocks:
+            elements = part._add_elements_from_array(element_type, connectivity, section=section, **element_kwargs)
             if verbose:
-                print('element {} added'.format(k))
+                print('{} {} added'.format(len(elements), element_type.__name__))
 
         return part
 
@@ -395,8 +707,8 @@ number of nodes    : {}
         part = cls.from_gmsh(gmshModel=gmshModel.model, name=name, **kwargs)
         part._boundary_mesh = boundary_mesh
 
-        gmshModel.generate_mesh(2)
-        part._discretized_boundary_mesh = gmshModel.mesh_to_compas()
+        # NOTE the boundary is found from the elements, no need to re-mesh
+        part._discretized_boundary_mesh = part.extract_boundary_mesh()
 
         del(gmshModel)
 
@@ -404,13 +716,668 @@ number of nodes    : {}
             point = boundary_mesh.centroid()
             part.reference_point = Node(xyz=[point.x, point.y, point.z])
 
-        centroid_face = {}
-        for face in part._discretized_boundary_mesh.faces():
-            centroid_face[geometric_key(part._discretized_boundary_mesh.face_centroid(face))] = face
-        part._discretized_boundary_mesh.centroid_face = centroid_face
-
         return part
 
+    # =========================================================================
+    #                           Nodes storage
+    # =========================================================================
+
+    @staticmethod
+    def _read_only(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _unindex(index, obj):
+        """Remove an object from a {name: [objects]} index."""
+        objects = index.get(obj.name, [])
+        if obj in objects:
+            objects.remove(obj)
+        if not objects:
+            index.pop(obj.name, None)
+
+    def _reserve_nodes(self, rows):
+        """Grow the nodes arrays so that they can store at least `rows` nodes.
+
+        The capacity is doubled to keep the cost of appending nodes one at a
+        time amortized constant.
+
+        Parameters
+        ----------
+        rows : int
+            Number of rows required.
+        """
+        capacity = self._nodes_xyz.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, 16)
+        for attr, fill in self._nodes_arrays:
+            old = getattr(self, attr)
+            new = np.full((capacity, ) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self._nodes_rows] = old[:self._nodes_rows]
+            setattr(self, attr, new)
+
+    def _nodes_changed(self):
+        """Invalidate the data derived from the nodes (for example the spatial
+        index). This is called every time a node is added, removed or moved.
+        """
+        self._nodes_version += 1
+        self._nodes_tree = None
+        self._nodes_grid = None
+        self._changed()
+
+    def _elements_changed(self):
+        """Invalidate the data derived from the connectivity. This is called
+        every time an element is added or removed, or the nodes are renumbered.
+        """
+        self._elements_version += 1
+        self._changed()
+
+    def _store_nodes(self, nodes):
+        """Move the data of the nodes into the part arrays and register them.
+
+        Parameters
+        ----------
+        nodes : list[:class:`compas_fea2.model.Node`]
+            The nodes to store.
+        """
+        start = self._nodes_rows
+        stop = start + len(nodes)
+        self._reserve_nodes(stop)
+        self._nodes_xyz[start:stop] = [node._xyz for node in nodes]
+        self._nodes_mass[start:stop] = [[np.nan if m is None else m for m in node._mass] for node in nodes]
+        self._nodes_temperature[start:stop] = [np.nan if node._temperature is None else node._temperature for node in nodes]
+        self._nodes_rows = stop
+        self._nodes_by_key.extend(nodes)
+        for key, node in enumerate(nodes, start):
+            self._nodes_by_name.setdefault(node.name, []).append(node)
+            node._key = key
+            node._registration = self
+            node._xyz = node._mass = node._temperature = None
+        # the grid can be updated incrementally
+        grid = self._nodes_grid
+        self._nodes_changed()
+        if grid is not None:
+            cells = np.floor(self._nodes_xyz[start:stop] / grid[0]).astype(int)
+            for key, cell in enumerate(map(tuple, cells.tolist()), start):
+                grid[1].setdefault(cell, []).append(key)
+            self._nodes_grid = grid
+
+    def _move_node(self, node, xyz, index=slice(None)):
+        """Change the coordinates of a node of the part and update its
+        geometric key.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The node to move.
+        xyz : [float, float, float] | float
+            The new coordinates (or coordinate, if `index` is given).
+        index : int, optional
+            The index of the coordinate to change, by default all of them.
+        """
+        if self._gkey_node.get(node.igkey) is node:
+            del self._gkey_node[node.igkey]
+        self._nodes_xyz[node._key, index] = xyz
+        node._gkey = node._igkey = None
+        self._gkey_node[node.igkey] = node
+        self._nodes_changed()
+
+    def _get_nodes_grid(self, tolerance):
+        """Get the hashed grid of the nodes for the given tolerance.
+
+        The nodes are bucketed in cubic cells with side equal to the tolerance,
+        so the nodes closer than the tolerance to a point are always in the 27
+        cells around it.
+
+        Parameters
+        ----------
+        tolerance : float
+            The size of the cells.
+
+        Returns
+        -------
+        dict
+            {(i, j, k): [key]} dictionary.
+        """
+        if self._nodes_grid is None or self._nodes_grid[0] != tolerance:
+            cells = np.floor(self._nodes_xyz[:self._nodes_rows] / tolerance).astype(int)
+            grid = {}
+            for key, cell in enumerate(map(tuple, cells.tolist())):
+                grid.setdefault(cell, []).append(key)
+            self._nodes_grid = (tolerance, grid)
+        return self._nodes_grid[1]
+
+    def _find_coincident_node(self, xyz, tolerance):
+        """Find a node of the part closer than the tolerance to a location.
+
+        Parameters
+        ----------
+        xyz : [float, float, float]
+            The location.
+        tolerance : float
+            The tolerance.
+
+        Returns
+        -------
+        :class:`compas_fea2.model.Node` | None
+        """
+        grid = self._get_nodes_grid(tolerance)
+        i, j, k = np.floor(np.asarray(xyz, dtype=float) / tolerance).astype(int).tolist()
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for dk in (-1, 0, 1):
+                    for key in grid.get((i+di, j+dj, k+dk), ()):
+                        if distance_point_point_sqrd(self._nodes_xyz[key].tolist(), xyz) < tolerance ** 2:
+                            return self._nodes_by_key[key]
+
+    def _reorder_nodes(self, order):
+        """Rearrange the rows of the nodes arrays in the given order. The nodes
+        not in `order` are released from the part.
+
+        Parameters
+        ----------
+        order : list[int]
+            The current keys of the nodes in their new order.
+        """
+        order = np.asarray(order, dtype=int)
+        keep = np.zeros(self._nodes_rows, dtype=bool)
+        keep[order] = True
+        for key in np.flatnonzero(~keep).tolist():
+            node = self._nodes_by_key[key]
+            node._xyz, node._mass, node._temperature = node.xyz, node.mass, node.temperature
+            node._registration = None
+            node._key = None
+            self._nodes.discard(node)
+            self._unindex(self._nodes_by_name, node)
+        for attr, fill in self._nodes_arrays:
+            array = getattr(self, attr)
+            array[:len(order)] = array[order]
+            array[len(order):self._nodes_rows] = fill
+        mapping = np.full(self._nodes_rows, -1, dtype=int)
+        mapping[order] = np.arange(len(order))
+        self._remap_groups('_nodes_by_key', mapping)
+        self._remap_connectivity(mapping)
+        self._nodes_by_key = [self._nodes_by_key[key] for key in order.tolist()]
+        for key, node in enumerate(self._nodes_by_key):
+            node._key = key
+        # NOTE rebuilt from the kept nodes, a released node can share the
+        # geometric key of a kept one (see merge_coincident_nodes)
+        self._gkey_node = {node.igkey: node for node in self._nodes_by_key}
+        self._nodes_rows = len(order)
+        self._elements_changed()
+        self._nodes_changed()
+
+    def _release_node(self, node):
+        """Copy the data of a node back into the node and remove its row from
+        the part arrays. The keys of the following nodes are shifted accordingly.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The node to release.
+        """
+        row = node._key
+        node._xyz, node._mass, node._temperature = node.xyz, node.mass, node.temperature
+        node._registration = None
+        node._key = None
+        last = self._nodes_rows
+        for attr, fill in self._nodes_arrays:
+            array = getattr(self, attr)
+            array[row:last-1] = array[row+1:last]
+            array[last-1] = fill
+        self._nodes_rows -= 1
+        self._unindex(self._nodes_by_name, node)
+        mapping = self._removal_mapping(len(self._nodes_by_key), row)
+        self._remap_groups('_nodes_by_key', mapping)
+        self._remap_connectivity(mapping)
+        del self._nodes_by_key[row]
+        for other in self._nodes_by_key[row:]:
+            other._key -= 1
+        self._elements_changed()
+        self._nodes_changed()
+
+    @staticmethod
+    def _removal_mapping(count, key):
+        """New keys after the removal of the member with the given key."""
+        mapping = np.arange(count) - (np.arange(count) > key)
+        mapping[key] = -1
+        return mapping
+
+    def _remap_groups(self, by_key, mapping):
+        """Update the keys stored by the groups of nodes or elements.
+
+        Parameters
+        ----------
+        by_key : str
+            '_nodes_by_key' or '_elements_by_key'.
+        mapping : numpy.ndarray
+            The new key of each old key, -1 for the removed members.
+        """
+        for group in list(self._keys_groups):
+            if group._by_key == by_key:
+                group._remap(mapping)
+
+    def _set_restraints(self, keys, bc=None):
+        """Assign a boundary condition to the nodes, replacing the previous one.
+        This is called by :meth:`compas_fea2.model.Model.add_bcs`.
+
+        Parameters
+        ----------
+        keys : numpy.ndarray
+            The keys of the nodes.
+        bc : :class:`compas_fea2.model._BoundaryCondition`, optional
+            The boundary condition, by default ``None`` (the nodes are released).
+        """
+        self._nodes_restraints[keys] = bc.mask if bc is not None else 0
+        self._nodes_bc[keys] = bc
+        self._changed()
+
+    def _store_elements(self, elements, connectivity=None):
+        """Register the elements to the part and index them.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_fea2.model._Element`]
+            The elements to store.
+        connectivity : numpy.ndarray, optional
+            The (m, k) connectivity of the elements, if they all have the same
+            type. By default it is read from the nodes of the elements.
+        """
+        start = len(self._elements_by_key)
+        self._elements_changed()
+        self._elements.update(elements)
+        self._elements_by_key.extend(elements)
+        for key, element in enumerate(elements, start):
+            self._elements_by_name.setdefault(element.name, []).append(element)
+            self._elements_by_type.setdefault(type(element), []).append(element)
+            element._key = key
+            element._registration = self
+        if connectivity is not None:
+            if elements:
+                self._append_connectivity(type(elements[0]), np.arange(start, start + len(elements)), connectivity)
+            return
+        keys = {}
+        for key, element in enumerate(elements, start):
+            keys.setdefault(type(element), []).append(key)
+        for element_type, keys in keys.items():
+            rows = [[node.key for node in self._elements_by_key[key].nodes] for key in keys]
+            self._append_connectivity(element_type, keys, _padded_array(rows))
+
+    def _append_connectivity(self, element_type, keys, connectivity):
+        """Append rows to the connectivity array of a type of elements.
+
+        As for the nodes arrays, the capacity is doubled to keep the cost of
+        adding elements one at a time amortized constant. The columns are
+        padded with -1 if the new elements have more nodes.
+
+        Parameters
+        ----------
+        element_type : type
+            The element class.
+        keys : list[int] | numpy.ndarray
+            The keys of the new elements.
+        connectivity : numpy.ndarray
+            (m, k) array with the keys of the nodes of the new elements.
+        """
+        empty = (np.empty(0, dtype=int), np.empty((0, 0), dtype=int), 0)
+        all_keys, array, count = self._elements_connectivity.get(element_type, empty)
+        rows, width = count + len(keys), max(array.shape[1], connectivity.shape[1])
+        if rows > array.shape[0] or width > array.shape[1]:
+            capacity = array.shape[0] if rows <= array.shape[0] else max(rows, 2 * array.shape[0], 16)
+            new_keys, new = np.empty(capacity, dtype=int), np.full((capacity, width), -1, dtype=int)
+            new_keys[:count], new[:count, :array.shape[1]] = all_keys[:count], array[:count]
+            all_keys, array = new_keys, new
+        all_keys[count:rows] = keys
+        array[count:rows] = -1
+        array[count:rows, :connectivity.shape[1]] = connectivity
+        self._elements_connectivity[element_type] = (all_keys, array, rows)
+
+    def _remap_connectivity(self, mapping):
+        """Update the connectivity arrays after the nodes are renumbered.
+
+        Parameters
+        ----------
+        mapping : numpy.ndarray
+            The new key of each node.
+        """
+        for _, connectivity, count in self._elements_connectivity.values():
+            block = connectivity[:count]
+            valid = block >= 0
+            block[valid] = mapping[block[valid]]
+
+    def _reorder_elements(self, order):
+        """Assign the keys of the elements following the given order. The
+        elements not in `order` are removed from the part.
+
+        Parameters
+        ----------
+        order : list[int]
+            The current keys of the elements to keep in their new order.
+        """
+        order = np.asarray(order, dtype=int)
+        keep = np.zeros(len(self._elements_by_key), dtype=bool)
+        keep[order] = True
+        removed = [self._elements_by_key[key] for key in np.flatnonzero(~keep).tolist()]
+        for element in removed:
+            self._elements.discard(element)
+            self._unindex(self._elements_by_name, element)
+            element._registration = None
+            element._key = None
+        mapping = np.full(len(self._elements_by_key), -1, dtype=int)
+        mapping[order] = np.arange(len(order))
+        self._remap_groups('_elements_by_key', mapping)
+        self._elements_by_key = [self._elements_by_key[key] for key in order.tolist()]
+        for key, element in enumerate(self._elements_by_key):
+            element._key = key
+        # the buckets of the removed elements are rebuilt once
+        for element_type in set(map(type, removed)):
+            bucket = [element for element in self._elements_by_type[element_type] if element._key is not None]
+            if bucket:
+                self._elements_by_type[element_type] = bucket
+            else:
+                del self._elements_by_type[element_type]
+        for bucket in self._elements_by_type.values():
+            bucket.sort(key=lambda element: element._key)
+        for element_type, (keys, connectivity, count) in list(self._elements_connectivity.items()):
+            keys = mapping[keys[:count]]
+            rows = np.flatnonzero(keys >= 0)
+            rows = rows[np.argsort(keys[rows])]
+            if not len(rows):
+                del self._elements_connectivity[element_type]
+                continue
+            connectivity = connectivity[rows]
+            width = (connectivity >= 0).sum(axis=1).max()
+            self._elements_connectivity[element_type] = (keys[rows], connectivity[:, :width], len(rows))
+        self._elements_changed()
+
+    def _add_nodes_from_array(self, coords):
+        """Create and add the nodes at the given coordinates.
+
+        Parameters
+        ----------
+        coords : array-like
+            (n, 3) array with the coordinates of the nodes.
+
+        Returns
+        -------
+        list[:class:`compas_fea2.model.Node`]
+            The nodes, in the same order of `coords`.
+        """
+        coords = np.asarray(coords, dtype=float)
+        if coords.ndim != 2 or coords.shape[1] != 3:
+            raise ValueError('The coordinates must be a (n, 3) array, not {}.'.format(coords.shape))
+        if not np.isfinite(coords).all():
+            raise ValueError('The coordinates contain nan or infinite values.')
+        nodes = [Node(xyz) for xyz in coords.tolist()]
+        for node, igkey in zip(nodes, map(tuple, geometric_keys(coords, compas_fea2.PRECISION).tolist())):
+            node._igkey = igkey
+        self._store_nodes(nodes)
+        self._nodes.update(nodes)
+        self._gkey_node.update((node.igkey, node) for node in nodes)
+        return nodes
+
+    def _add_elements_from_array(self, element_type, connectivity, section=None, **kwargs):
+        """Create and add the elements of a given type from their connectivity.
+
+        Note
+        ----
+        The connectivity is validated at once for the whole block. One element
+        object is still created per row, because the groups, the loads and the
+        backends work on the elements, but only the first one goes through
+        :meth:`add_element` (which registers the section and the material and
+        runs the checks of the part, for example the ones of
+        :class:`RigidPart`). The others are stored directly: they have the same
+        type, section and keyword arguments, so those checks would give the
+        same result, and their nodes are already in the part.
+
+        Parameters
+        ----------
+        element_type : str | type
+            The element class or its name.
+        connectivity : array-like
+            (m, k) integer array with the keys of the nodes of each element.
+            The rows of elements with less than k nodes are padded with -1.
+        section : :class:`compas_fea2.model._Section`, optional
+            The section of the elements.
+
+        Returns
+        -------
+        list[:class:`compas_fea2.model._Element`]
+            The elements, in the same order of `connectivity`.
+        """
+        import compas_fea2.model
+
+        if isinstance(element_type, str):
+            element_type = getattr(compas_fea2.model, element_type)
+        if not isinstance(element_type, type) or not issubclass(element_type, _Element):
+            raise TypeError('{!r} is not an element type.'.format(element_type))
+        connectivity = np.asarray(connectivity)
+        if not connectivity.size:
+            return []
+        if not np.issubdtype(connectivity.dtype, np.integer):
+            raise TypeError('The connectivity must be an integer array, not {}.'.format(connectivity.dtype))
+        if connectivity.ndim != 2:
+            raise ValueError('The connectivity must be a (m, k) array, not {}.'.format(connectivity.shape))
+        if connectivity.min() < -1 or connectivity.max() >= self._nodes_rows or (connectivity[:, 0] < 0).any():
+            raise ValueError('The connectivity of {} refers to nodes that do not exist.'.format(element_type.__name__))
+        ordered = np.sort(connectivity, axis=1)
+        if ((np.diff(ordered, axis=1) == 0) & (ordered[:, 1:] >= 0)).any():
+            raise ValueError('The connectivity of {} has elements with repeated nodes.'.format(element_type.__name__))
+
+        nodes = self._nodes_by_key
+        if connectivity[:, -1].min() >= 0:
+            elements = [element_type(nodes=[nodes[key] for key in keys], section=section, **kwargs)
+                        for keys in connectivity.tolist()]
+        else:
+            elements = [element_type(nodes=[nodes[key] for key in keys if key >= 0], section=section, **kwargs)
+                        for keys in connectivity.tolist()]
+        self.add_element(elements[0])
+        self._store_elements(elements[1:], connectivity[1:])
+        return elements
+
+    def _get_adjacency(self):
+        """Get the element to node and the node to element adjacency matrices.
+        They are built from the connectivity on first access and cached until
+        the connectivity changes.
+
+        Returns
+        -------
+        :class:`scipy.sparse.csr_matrix`
+            (elements x nodes) matrix.
+        :class:`scipy.sparse.csr_matrix`
+            (nodes x elements) matrix.
+        """
+        version = (self._elements_version, self._nodes_rows)
+        if self._adjacency is None or self._adjacency[0] != version:
+            from scipy.sparse import csr_matrix
+
+            rows, columns = [np.empty(0, dtype=int)], [np.empty(0, dtype=int)]
+            for element_type in self._elements_by_type:
+                keys, connectivity = self.get_elements_connectivity(element_type)
+                valid = connectivity >= 0
+                rows.append(np.broadcast_to(keys[:, None], connectivity.shape)[valid])
+                columns.append(connectivity[valid])
+            rows, columns = np.concatenate(rows), np.concatenate(columns)
+            elements_nodes = csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(self._elements_by_key), self._nodes_rows))
+            self._adjacency = (version, elements_nodes, elements_nodes.transpose().tocsr())
+        return self._adjacency[1], self._adjacency[2]
+
+    def get_elements_connectivity(self, element_type):
+        """Get the keys and the connectivity of the elements of a given type.
+
+        The arrays are kept up to date when elements are added or removed and
+        when the nodes are renumbered.
+
+        Parameters
+        ----------
+        element_type : type
+            The element class (subclasses are not included).
+
+        Returns
+        -------
+        numpy.ndarray
+            (m, ) array with the keys of the elements.
+        numpy.ndarray
+            (m, k) array with the keys of the nodes of each element. If the
+            elements have a different number of nodes, the rows are padded
+            with -1.
+        """
+        if element_type not in self._elements_connectivity:
+            return self._read_only(np.empty(0, dtype=int)), self._read_only(np.empty((0, 0), dtype=int))
+        keys, connectivity, count = self._elements_connectivity[element_type]
+        return self._read_only(keys[:count]), self._read_only(connectivity[:count])
+
+    def _get_elements_geometry(self):
+        """Compute the volumes, areas, lengths and centroids of all the
+        elements at once, type by type, from the connectivity arrays. The
+        results are cached until nodes or elements change.
+
+        Returns
+        -------
+        dict
+            {'volume': array, 'area': array, 'length': array, 'centroid': array}
+        """
+        version = (self._elements_version, self._nodes_version)
+        if self._elements_geometry is None or self._elements_geometry[0] != version:
+            n = len(self._elements_by_key)
+            xyz = self._nodes_xyz[:self._nodes_rows]
+            geometry = {'volume': np.full(n, np.nan), 'area': np.full(n, np.nan), 'length': np.full(n, np.nan),
+                        'centroid': np.full((n, 3), np.nan)}
+            for element_type in self._elements_by_type:
+                keys, connectivity = self.get_elements_connectivity(element_type)
+                geometry['centroid'][keys] = centroids(xyz, connectivity)
+                if issubclass(element_type, _Element3D):
+                    if element_type._volume_kernel:
+                        geometry['volume'][keys] = element_type._volume_kernel(xyz, connectivity)
+                elif issubclass(element_type, _Element2D):
+                    geometry['area'][keys] = polygons_areas(xyz, connectivity)
+                elif issubclass(element_type, _Element1D) and connectivity.shape[1] > 1:
+                    geometry['length'][keys] = segments_lengths(xyz, connectivity)
+            self._elements_geometry = (version, {name: self._read_only(array) for name, array in geometry.items()})
+        return self._elements_geometry[1]
+
+    def mesh_quality(self, bins=10):
+        """Compute the quality metrics of all the elements of the part at once.
+
+        The metrics are computed type by type from the connectivity arrays:
+
+        - ``aspect_ratio``: ratio between the longest and the shortest edge.
+        - ``min_angle``: minimum dihedral angle for solid elements, minimum
+          corner angle for shell elements (degrees).
+        - ``jacobian``: minimum scaled jacobian at the corners, in [-1, 1].
+          Elements with a negative value are inverted (or not convex).
+        - ``skewness``: (maximum) equiangular skewness of the faces, 0 for
+          regular elements and 1 for degenerate ones.
+
+        Parameters
+        ----------
+        bins : int, optional
+            Number of bins of the histograms in the summary, by default 10.
+
+        Returns
+        -------
+        dict
+            {metric: array} with the values for each element, indexed by key.
+            The values are `nan` where a metric is not defined (1D elements,
+            degenerate elements or types without a corners/face table).
+        dict
+            {metric: {'min': float, 'max': float, 'mean': float, 'histogram': (counts, bin_edges)}}
+            summary of the defined values of each metric.
+        """
+        quality = _elements_quality(self._nodes_xyz[:self._nodes_rows], self._get_quality_blocks(), len(self._elements_by_key))
+
+        summary = {}
+        for metric, values in quality.items():
+            values = values[np.isfinite(values)]
+            if not len(values):
+                continue
+            summary[metric] = {'min': float(values.min()), 'max': float(values.max()), 'mean': float(values.mean()),
+                               'histogram': np.histogram(values, bins=bins)}
+            if compas_fea2.VERBOSE:
+                print('{}: min {:.3g}, max {:.3g}, mean {:.3g}'.format(metric, values.min(), values.max(), values.mean()))
+        return quality, summary
+
+    def _get_quality_blocks(self):
+        """Get the arguments of :func:`_elements_quality` for each element type
+        with quality metrics."""
+        blocks = []
+        for element_type in self._elements_by_type:
+            keys, connectivity = self.get_elements_connectivity(element_type)
+            if issubclass(element_type, _Element3D) and element_type._corner_indices:
+                faces = list(element_type._face_indices.values()) if element_type._face_indices else None
+                blocks.append((keys, connectivity, element_type._corner_indices, faces))
+            elif issubclass(element_type, _Element2D):
+                blocks.append((keys, connectivity, None, None))
+        return blocks
+
+    def _check_mesh(self, rtol=1e-9):
+        """Quick checks of the part, see :meth:`compas_fea2.model.Model.check`.
+
+        Parameters
+        ----------
+        rtol : float, optional
+            Elements with a volume (area, length) smaller than ``rtol`` times
+            the volume (area, length) of their bounding box are degenerate.
+
+        Returns
+        -------
+        dict
+            {issue: keys} with the keys of the nodes or of the elements with
+            each issue.
+        """
+        from scipy.sparse import bmat
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n, m = self._nodes_rows, len(self._elements_by_key)
+        xyz = self._nodes_xyz[:n]
+        elements_nodes, nodes_elements = self._get_adjacency()
+        orphans = np.diff(nodes_elements.indptr) == 0
+
+        # nodes and elements are the vertices of the graph
+        graph = bmat([[None, nodes_elements], [elements_nodes, None]], format='csr') if m else csr_matrix((n, n))
+        _, labels = connected_components(graph, directed=False)
+        restrained = np.zeros(labels.max(initial=-1) + 1, dtype=bool)
+        restrained[labels[:n][self._nodes_restraints[:n] != 0]] = True
+        unrestrained = ~restrained[labels[:n]] & ~orphans
+
+        # the elements with the same nodes have the same sorted rows
+        rows = np.full((m, max([self.get_elements_connectivity(t)[1].shape[1] for t in self._elements_by_type] or [0])), -1)
+        sizes = np.zeros(m)
+        for element_type in self._elements_by_type:
+            keys, connectivity = self.get_elements_connectivity(element_type)
+            rows[keys, :connectivity.shape[1]] = connectivity
+            if connectivity.size:
+                sizes[keys] = np.linalg.norm(np.ptp(xyz[_fill_padding(connectivity)], axis=1), axis=1)
+        rows.sort(axis=1)
+        duplicates = np.zeros(0, dtype=int)
+        if m:
+            order = np.lexsort(rows.T[::-1])
+            duplicates = np.sort(order[1:][(rows[order[1:]] == rows[order[:-1]]).all(axis=1)])
+
+        geometry = self._get_elements_geometry()
+        degenerate = np.zeros(m, dtype=bool)
+        for dimension, name in enumerate(('length', 'area', 'volume'), 1):
+            with np.errstate(invalid='ignore'):
+                degenerate |= np.abs(geometry[name]) <= rtol * sizes ** dimension
+
+        sections = [element._section for element in self._elements_by_key]
+        valid = {}
+        for section in sections:
+            if section not in valid:
+                material = getattr(section, 'material', None)
+                valid[section] = (section in self._sections, material is None or material in self._materials)
+        valid = np.array([valid[section] for section in sections], dtype=bool).reshape(m, 2)
+
+        return {'orphan_nodes': np.flatnonzero(orphans),
+                'unrestrained_nodes': np.flatnonzero(unrestrained),
+                'duplicate_elements': duplicates,
+                'degenerate_elements': np.flatnonzero(degenerate),
+                'unregistered_sections': np.flatnonzero(~valid[:, 0]),
+                'unregistered_materials': np.flatnonzero(~valid[:, 1])}
+
     # =========================================================================
     #                           Nodes methods
     # =========================================================================
@@ -428,9 +1395,8 @@ number of nodes    : {}
         :class:`compas_fea2.model.Node`
             The corresponding node.
         """
-        for node in self.nodes:
-            if node.key == key:
-                return node
+        if isinstance(key, Integral) and 0 <= key < len(self._nodes_by_key):
+            return self._nodes_by_key[key]
 
     def find_nodes_by_name(self, name):
         # type: (str) -> list(Node)
@@ -445,7 +1411,7 @@ number of nodes    : {}
         list[:class:`compas_fea2.model.Node`]
 
         """
-        return [node for node in self.nodes if node.name == name]
+        return list(self._nodes_by_name.get(name, []))
 
     def find_nodes_by_location(self, point, distance, plane=None, report=False, **kwargs):
         # type: (Point, float, Plane, bool, bool) -> list(Node)
@@ -468,12 +1434,14 @@ number of nodes    : {}
         list[:class:`compas_fea2.model.Node`]
 
         """
-        d2 = distance ** 2
-        nodes = self.find_nodes_on_plane(plane) if plane else self.nodes
-        if report:
-            return {node: sqrt(distance) for node in nodes if (distance := distance_point_point_sqrd(node.xyz, point)) < d2}
-        else:
-            return [node for node in nodes if (distance := distance_point_point_sqrd(node.xyz, point)) < d2]
+        keys = self.query_nodes_by_location([point], distance)[0]
+        distances = np.linalg.norm(self._nodes_xyz[keys] - np.asarray(point, dtype=float), axis=1)
+        mask = distances < distance
+        nodes = {self._nodes_by_key[key]: d for key, d in zip(keys[mask].tolist(), distances[mask].tolist())}
+        if plane:
+            on_plane = set(self.find_nodes_on_plane(plane))
+            nodes = {node: d for node, d in nodes.items() if node in on_plane}
+        return nodes if report else list(nodes)
 
     def find_closest_nodes_to_point(self, point, distance, number_of_nodes=1, plane=None):
         # type: (Point, float, int, Plane) -> list(Node)
@@ -495,10 +1463,11 @@ number of nodes    : {}
         list[:class:`compas_fea2.model.Node`]
 
         """
-        nodes = self.find_nodes_by_location(point, distance, plane, report=True)
-        if number_of_nodes > len(nodes):
-            number_of_nodes = len(nodes)
-        return [k for k, v in sorted(nodes.items(), key=lambda item: item[1])][:number_of_nodes]
+        if plane:
+            nodes = self.find_nodes_by_location(point, distance, plane, report=True)
+            return [k for k, v in sorted(nodes.items(), key=lambda item: item[1])][:number_of_nodes]
+        _, keys = self.query_closest_nodes([point], number_of_nodes, distance)
+        return [self._nodes_by_key[key] for key in keys[0].tolist() if key >= 0]
 
     def find_nodes_around_node(self, node, distance, plane=None):
         # type: (Node, float, Plane) -> list(Node)
@@ -543,10 +1512,59 @@ number of nodes    : {}
         list[:class:`compas_fea2.model.Node`]
 
         """
-        nodes = self.find_nodes_by_location(node.xyz, distance, plane, report=True)
-        if number_of_nodes > len(nodes):
-            number_of_nodes = len(nodes)
-        return [k for k, v in sorted(nodes.items(), key=lambda item: item[1])][:number_of_nodes]
+        nodes = self.find_closest_nodes_to_point(node.xyz, distance, number_of_nodes + 1, plane)
+        return [other for other in nodes if other is not node][:number_of_nodes]
+
+    def query_nodes_by_location(self, points, distance):
+        # type: (list, float) -> list
+        """Find the keys of the nodes within a distance of multiple locations
+        at once using the spatial index of the part.
+
+        Parameters
+        ----------
+        points : list[:class:`compas.geometry.Point`] | :class:`numpy.ndarray`
+            The (m, 3) locations.
+        distance : float
+            Search radius.
+
+        Returns
+        -------
+        list[:class:`numpy.ndarray`]
+            For each location, the sorted keys of the nodes within the distance.
+        """
+        if not self._nodes_rows:
+            return [np.empty(0, dtype=int) for _ in points]
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        return [np.asarray(keys, dtype=int) for keys in self.nodes_tree.query_ball_point(points, distance, return_sorted=True)]
+
+    def query_closest_nodes(self, points, number_of_nodes=1, distance=np.inf):
+        # type: (list, int, float) -> tuple
+        """Find the keys of the closest nodes to multiple locations at once
+        using the spatial index of the part.
+
+        Parameters
+        ----------
+        points : list[:class:`compas.geometry.Point`] | :class:`numpy.ndarray`
+            The (m, 3) locations.
+        number_of_nodes : int, optional
+            Number of nodes to find for each location, by default 1.
+        distance : float, optional
+            Maximum search radius, by default no limit.
+
+        Returns
+        -------
+        (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            (m, number_of_nodes) arrays with the distances and the keys of the
+            closest nodes, sorted by distance. Missing neighbours have an
+            infinite distance and a key equal to -1.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not self._nodes_rows:
+            return np.full((len(points), number_of_nodes), np.inf), np.full((len(points), number_of_nodes), -1)
+        distances, keys = self.nodes_tree.query(points, k=number_of_nodes, distance_upper_bound=distance)
+        distances, keys = distances.reshape(len(points), -1), keys.reshape(len(points), -1)
+        keys[keys >= self._nodes_rows] = -1
+        return distances, keys
 
     def find_nodes_by_attribute(self, attr, value, tolerance=0.001):
         # type: (str, float, float) -> list(Node)
@@ -570,23 +1588,45 @@ number of nodes    : {}
         """
         return list(filter(lambda x: abs(getattr(x, attr) - value) <= tolerance, self.nodes))
 
-    def find_nodes_on_plane(self, plane):
-        # type: (Plane) -> list(Node)
+    def find_nodes_on_plane(self, plane, tolerance=1e-6):
+        # type: (Plane, float) -> list(Node)
         """Find all nodes on a given plane.
 
         Parameters
         ----------
         plane : :class:`compas.geometry.Plane`
             The plane.
+        tolerance : float, optional
+            Maximum distance from the plane, by default 1e-6.
 
         Returns
         -------
         list[:class:`compas_fea2.model.Node`]
 
         """
-        return list(filter(lambda x: is_point_on_plane(Point(*x.xyz), plane), self.nodes))
+        return [self._nodes_by_key[key] for key in self.query_nodes_on_plane(plane, tolerance).tolist()]
+
+    def query_nodes_on_plane(self, plane, tolerance=1e-6):
+        # type: (Plane, float) -> np.ndarray
+        """Find the keys of all nodes on a given plane.
+
+        Parameters
+        ----------
+        plane : :class:`compas.geometry.Plane`
+            The plane.
+        tolerance : float, optional
+            Maximum distance from the plane, by default 1e-6.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted keys of the nodes.
+
+        """
+        distances = distances_points_plane(self._nodes_xyz[:self._nodes_rows], plane)
+        return np.flatnonzero(np.abs(distances) <= tolerance)
 
-    def find_nodes_in_polygon(self, polygon, tolerance=1.1):
+    def find_nodes_in_polygon(self, polygon, tolerance=1e-6):
         # type: (Polygon, float) -> list(Node)
         """Find the nodes of the part that are contained within a planar polygon
 
@@ -594,53 +1634,144 @@ number of nodes    : {}
         ----------
         polygon : :class:`compas.geometry.Polygon`
             The polygon for the search.
+        tolerance : float, optional
+            Maximum distance of the nodes from the plane of the polygon, by
+            default 1e-6.
 
         Returns
         -------
         [:class:`compas_fea2.model.Node]
             List with the nodes contained in the polygon.
         """
-        # TODO quick fix...change!
-        if not hasattr(polygon, 'plane'):
-            try:
-                polygon.plane = Frame.from_points(*polygon.points[:3])
-            except:
-                polygon.plane = Frame.from_points(*polygon.points[-3:])
+        return [self._nodes_by_key[key] for key in self.query_nodes_in_polygon(polygon, tolerance).tolist()]
 
-        S = Scale.from_factors([tolerance]*3, polygon.plane)
-        T = Transformation.from_frame_to_frame(polygon.plane, Frame.worldXY())
-        nodes_on_plane = self.find_nodes_on_plane(Plane.from_frame(polygon.plane))
-        polygon_xy = polygon.transformed(S)
-        polygon_xy = polygon.transformed(T)
-        return list(filter(lambda x: is_point_in_polygon_xy(Point(*x.xyz).transformed(T), polygon_xy), nodes_on_plane))
+    def query_nodes_in_polygon(self, polygon, tolerance=1e-6):
+        # type: (Polygon, float) -> np.ndarray
+        """Find the keys of the nodes of the part that are contained within a
+        planar polygon.
+
+        The nodes on the plane of the polygon and the polygon itself are
+        brought to the XY plane with a single transformation, then all the
+        nodes are tested at once.
+
+        Parameters
+        ----------
+        polygon : :class:`compas.geometry.Polygon`
+            The polygon for the search.
+        tolerance : float, optional
+            Maximum distance of the nodes from the plane of the polygon, by
+            default 1e-6.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted keys of the nodes contained in the polygon.
 
+        Raises
+        ------
+        ValueError
+            If the polygon has no area, so its plane is not defined.
+        """
+        return _points_in_polygon(self._nodes_xyz[:self._nodes_rows], polygon, tolerance)
 
-    # TODO quite slow...check how to make it faster
-    def find_nodes_where(self, conditions):
-        # type: (list(str)) -> list(Node)
+    def find_nodes_where(self, conditions, **variables):
+        # type: (list(str), dict) -> list(Node)
         """Find the nodes where some conditions are met.
 
         Parameters
         ----------
-        conditions : [str]
-            List with the strings of the required conditions.
+        conditions : str | [str]
+            The condition, or list with the conditions that must be all met.
+            See :meth:`query_nodes_where`.
+        **variables : dict
+            Values of additional variables used in the conditions.
 
         Returns
         -------
         [Node]
-            List with the nodes matching the criteria.
-        """
-        import re
-        nodes = []
-        for condition in conditions:
-            # limit the serch to the already found nodes
-            part_nodes = self.nodes if not nodes else list(set.intersection(*nodes))
-            try:
-                eval(condition)
-            except NameError as ne:
-                var_name = re.findall(r"'([^']*)'", str(ne))[0]
-                nodes.append(set(filter(lambda n: eval(condition.replace(var_name, str(getattr(n, var_name)))), part_nodes)))
-        return list(set.intersection(*nodes))
+            List with the nodes matching the criteria, sorted by key.
+
+        Examples
+        --------
+        >>> part = DeformablePart()
+        >>> nodes = part.add_nodes([Node([i, 0., i]) for i in range(5)])
+        >>> [node.key for node in part.find_nodes_where(['x <= 3 & z > 1'])]
+        [2, 3]
+        """
+        return [self._nodes_by_key[key] for key in self.query_nodes_where(conditions, **variables).tolist()]
+
+    def query_nodes_where(self, conditions, **variables):
+        # type: (list(str), dict) -> np.ndarray
+        """Find the keys of the nodes where some conditions are met.
+
+        The conditions are compiled once and evaluated as boolean masks on
+        the nodes arrays of the part. The following variables are available:
+        `x`, `y`, `z`, `key`, `temperature` (nan if not defined) and any
+        other numeric attribute of the nodes (slower, as it is collected node
+        by node). Additional variables can be passed as keyword arguments.
+
+        Parameters
+        ----------
+        conditions : str | [str]
+            The condition, or list with the conditions that must be all met.
+            For example ``'x <= 3 & z > 1'``, ``'0 <= x <= 3'`` or
+            ``'abs(y - y0) < tol'``.
+        **variables : dict
+            Values of additional variables used in the conditions.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted keys of the nodes matching the criteria.
+
+        Raises
+        ------
+        ValueError
+            If a condition is not valid.
+        """
+        if isinstance(conditions, str):
+            conditions = [conditions]
+        predicates = [compile_condition(condition) for condition in conditions]
+        data = self._get_nodes_data(set().union(*(predicate.names for predicate in predicates)), variables)
+        mask = np.ones(self._nodes_rows, dtype=bool)
+        for predicate in predicates:
+            mask &= predicate(data)
+        return np.flatnonzero(mask)
+
+    def _get_nodes_data(self, names, variables=None):
+        """Collect the arrays of the nodes data used in a query.
+
+        Parameters
+        ----------
+        names : set
+            The names of the variables.
+        variables : dict, optional
+            Values of additional variables, they take precedence on the nodes
+            data.
+
+        Returns
+        -------
+        dict
+            {name: array}
+        """
+        variables = variables or {}
+        columns = {'x': 0, 'y': 1, 'z': 2}
+        data = {}
+        for name in names:
+            if name in variables:
+                data[name] = variables[name]
+            elif name in columns:
+                data[name] = self._nodes_xyz[:self._nodes_rows, columns[name]]
+            elif name == 'key':
+                data[name] = np.arange(self._nodes_rows)
+            elif name == 'temperature':
+                data[name] = self._nodes_temperature[:self._nodes_rows]
+            else:
+                try:
+                    data[name] = np.array([getattr(node, name) for node in self._nodes_by_key], dtype=float)
+                except (AttributeError, TypeError, ValueError):
+                    raise ValueError('{!r} is not a numeric attribute of the nodes.'.format(name))
+        return data
 
     def contains_node(self, node):
         # type: (Node) -> Node
@@ -695,16 +1826,19 @@ number of nodes    : {}
                 print('NODE SKIPPED: Node {!r} already in part.'.format(node))
             return
 
+        if node.part:
+            # a node can be the view of only one part
+            node.part.remove_node(node)
+
         if not compas_fea2.POINT_OVERLAP:
-            if self.find_nodes_by_location(node.xyz, distance=compas_fea2.GLOBAL_TOLERANCE):
+            if self._find_coincident_node(node.xyz, compas_fea2.GLOBAL_TOLERANCE):
                 if compas_fea2.VERBOSE:
                     print('NODE SKIPPED: Part {!r} has already a node at {}.'.format(self, node.xyz))
                 return
 
-        node._key = len(self._nodes)
+        self._store_nodes([node])
         self._nodes.add(node)
-        self._gkey_node[node.gkey] = node
-        node._registration = self
+        self._gkey_node[node.igkey] = node
         if compas_fea2.VERBOSE:
             print('Node {!r} registered to {!r}.'.format(node, self))
         return node
@@ -739,7 +1873,8 @@ number of nodes    : {}
 
         Warning
         -------
-        Removing nodes can cause inconsistencies.
+        Removing nodes can cause inconsistencies. The keys of the nodes added
+        after the removed one are shifted by one.
 
         Parameters
         ----------
@@ -748,9 +1883,10 @@ number of nodes    : {}
         """
         # type: (Node) -> None
         if self.contains_node(node):
-            self.nodes.pop(node)
-            self._gkey_node.pop(node.gkey)
-            node._registration = None
+            self._nodes.discard(node)
+            if self._gkey_node.get(node.igkey) is node:
+                del self._gkey_node[node.igkey]
+            self._release_node(node)
             if compas_fea2.VERBOSE:
                 print('Node {!r} removed from {!r}.'.format(node, self))
 
@@ -766,35 +1902,94 @@ number of nodes    : {}
         nodes : []:class:`compas_fea2.model.Node`]
             List with the nodes to remove
         """
-        for node in nodes:
-            self.remove_node(node)
+        keys = [node.key for node in nodes if self.contains_node(node)]
+        if keys:
+            keep = np.ones(self._nodes_rows, dtype=bool)
+            keep[keys] = False
+            self._reorder_nodes(np.flatnonzero(keep))
+
+    def merge_coincident_nodes(self, tolerance=None):
+        """Merge the nodes of the part closer than a given tolerance.
+
+        For each cluster of coincident nodes, the node with the smallest key
+        is kept and replaces the others in the elements and in the groups of
+        the part. The other nodes are removed from the part, their boundary
+        condition is moved to the kept node.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The merging distance, by default ``compas_fea2.GLOBAL_TOLERANCE``.
+
+        Returns
+        -------
+        dict
+            {removed :class:`compas_fea2.model.Node`: kept :class:`compas_fea2.model.Node`}
+
+        Raises
+        ------
+        ValueError
+            If the nodes of a cluster have different boundary conditions.
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        tolerance = tolerance or compas_fea2.GLOBAL_TOLERANCE
+        n = self._nodes_rows
+        # strictly closer than the tolerance, as in `add_node`
+        pairs = self.nodes_tree.query_pairs(np.nextafter(tolerance, 0), output_type='ndarray')
+        if not len(pairs):
+            return {}
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        representative = np.full(labels.max() + 1, n)
+        np.minimum.at(representative, labels, np.arange(n))
+        target = representative[labels]
+        merged = {self._nodes_by_key[key]: self._nodes_by_key[target[key]] for key in np.flatnonzero(target != np.arange(n)).tolist()}
+
+        # the boundary conditions of the removed nodes are moved to the kept ones
+        restrained = np.flatnonzero(np.not_equal(self._nodes_bc[:n], None))
+        bcs = {}
+        for key, kept in zip(restrained.tolist(), target[restrained].tolist()):
+            bc = bcs.setdefault(kept, self._nodes_bc[key])
+            if bc is not self._nodes_bc[key]:
+                raise ValueError('The coincident nodes {!r} and {!r} have different boundary conditions.'.format(
+                    self._nodes_by_key[kept], self._nodes_by_key[key]))
+        for kept, bc in bcs.items():
+            self._nodes_bc[kept] = bc
+        np.bitwise_or.at(self._nodes_restraints, target[restrained], self._nodes_restraints[restrained])
+
+        self._elements_changed()
+        for element in self._elements:
+            if any(node in merged for node in element.nodes):
+                element._nodes = [merged.get(node, node) for node in element.nodes]
+                if hasattr(element, '_faces'):
+                    element._faces = None
+        # the merged nodes are replaced by their targets, then removed
+        self._remap_groups('_nodes_by_key', target)
+        self._remap_connectivity(target)
+
+        self._reorder_nodes(np.flatnonzero(target == np.arange(n)))
+        return merged
 
     def is_node_on_boundary(self, node, precision=None):
         # type: (Node, str) -> bool
-        """Check if a node is on the boundary mesh of the DeformablePart.
+        """Check if a node is on the boundary of the part.
 
         Parameters
         ----------
         node : :class:`compas_fea2.model.Node`
             The node to evaluate.
-        precision : ??
-            ???
-
-        Note
-        ----
-        The `discretized_boundary_mesh` of the part must have been previously
-        defined.
+        precision : str, optional
+            Not used, the boundary is found from the topology of the elements
+            (see :meth:`compute_boundary`).
 
         Returns
         -------
         bool
             `True` if the node is on the boundary, `False` otherwise.
         """
-        if not self.discretized_boundary_mesh:
-            raise AttributeError("The discretized_boundary_mesh has not been defined")
-        if not node.on_boundary:
-            node._on_boundary = True if geometric_key(
-                node.xyz, precision) in self.discretized_boundary_mesh.gkey_vertex() else False
+        self.compute_boundary()
         return node.on_boundary
 
     # =========================================================================
@@ -814,9 +2009,8 @@ number of nodes    : {}
         :class:`compas_fea2.model._Element`
             The corresponding element.
         """
-        for element in self.elements:
-            if element.key == key:
-                return element
+        if isinstance(key, Integral) and 0 <= key < len(self._elements_by_key):
+            return self._elements_by_key[key]
 
     def find_elements_by_name(self, name):
         # type: (str) -> list(_Element)
@@ -831,7 +2025,43 @@ number of nodes    : {}
         list[:class:`compas_fea2.model._Element`]
 
         """
-        return [element for element in self.elements if element.name == name]
+        return list(self._elements_by_name.get(name, []))
+
+    def find_elements_by_type(self, element_type):
+        # type: (type) -> list(_Element)
+        """Find all the elements of a given type, including its subclasses.
+
+        Parameters
+        ----------
+        element_type : type
+            The element class, for example :class:`compas_fea2.model._Element3D`.
+
+        Returns
+        -------
+        list[:class:`compas_fea2.model._Element`]
+
+        """
+        return [element for bucket_type, bucket in self._elements_by_type.items() if issubclass(bucket_type, element_type) for element in bucket]
+
+    def find_elements_by_node(self, node):
+        # type: (Node) -> list(_Element)
+        """Find the elements connected to a node.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The node.
+
+        Returns
+        -------
+        list[:class:`compas_fea2.model._Element`]
+            The elements, sorted by key.
+        """
+        if node.part is not self:
+            return []
+        nodes_elements = self.nodes_elements
+        keys = nodes_elements.indices[nodes_elements.indptr[node.key]:nodes_elements.indptr[node.key + 1]]
+        return [self._elements_by_key[key] for key in np.sort(keys).tolist()]
 
     def contains_element(self, element):
         # type: (_Element) -> _Element
@@ -884,9 +2114,7 @@ number of nodes    : {}
             if element.section.material:
                 self.add_material(element.section.material)
 
-        element._key = len(self.elements)
-        self.elements.add(element)
-        element._registration = self
+        self._store_elements([element])
         if compas_fea2.VERBOSE:
             print('Element {!r} registered to {!r}.'.format(element, self))
         return element
@@ -911,7 +2139,8 @@ number of nodes    : {}
 
         Warning
         -------
-        Removing elements can cause inconsistencies.
+        Removing elements can cause inconsistencies. The keys of the elements
+        added after the removed one are shifted by one.
 
         Parameters
         ----------
@@ -919,15 +2148,14 @@ number of nodes    : {}
             The element to remove
         """
         # type: (_Element) -> None
-        if self.contains_node(element):
-            self.elements.pop(element)
-            element._registration = None
-            if compas_fea2.VERBOSE:
-                print('Element {!r} removed from {!r}.'.format(element, self))
+        self.remove_elements([element])
 
     def remove_elements(self, elements):
         """Remove multiple :class:`compas_fea2.model._Element` from the part.
 
+        The elements are removed at once: the keys of the other elements are
+        compacted (keeping their order) and the groups are updated only once.
+
         Warning
         -------
         Removing elements can cause inconsistencies.
@@ -937,11 +2165,17 @@ number of nodes    : {}
         elements : []:class:`compas_fea2.model._Element`]
             List with the elements to remove
         """
-        for element in elements:
-            self.remove_element(element)
+        elements = [element for element in elements if self.contains_element(element)]
+        if elements:
+            keep = np.ones(len(self._elements_by_key), dtype=bool)
+            keep[[element._key for element in elements]] = False
+            self._reorder_elements(np.flatnonzero(keep))
+            if compas_fea2.VERBOSE:
+                for element in elements:
+                    print('Element {!r} removed from {!r}.'.format(element, self))
 
     def is_element_on_boundary(self, element):
-        """Check if the element belongs to the boundary mesh of the part.
+        """Check if the element belongs to the boundary of the part.
 
         Parameters
         ----------
@@ -954,25 +2188,299 @@ number of nodes    : {}
             ``True`` if the element is on the boundary.
         """
         # type: (_Element) -> bool
-        from compas.geometry import centroid_points
-
-        if element.on_boundary is None:
-            if not self._discretized_boundary_mesh.centroid_face:
-                centroid_face = {}
-                for face in self._discretized_boundary_mesh.faces():
-                    centroid_face[geometric_key(self._discretized_boundary_mesh.face_centroid(face))] = face
-            if isinstance(element, _Element3D):
-                if any(geometric_key(centroid_points([node.xyz for node in face.nodes])) in self._discretized_boundary_mesh.centroid_face for face in element.faces):
-                    element.on_boundary = True
-                else:
-                    element.on_boundary = False
-            elif isinstance(element, _Element2D):
-                if geometric_key(centroid_points([node.xyz for node in element.nodes])) in self._discretized_boundary_mesh.centroid_face:
-                    element.on_boundary = True
-                else:
-                    element.on_boundary = False
+        self.compute_boundary()
         return element.on_boundary
 
+    # =========================================================================
+    #                           Renumbering methods
+    # =========================================================================
+
+    def _get_nodes_graph(self):
+        """Node to node adjacency matrix (nodes sharing an element)."""
+        elements_nodes, nodes_elements = self._get_adjacency()
+        return (nodes_elements @ elements_nodes).tocsr()
+
+    @property
+    def bandwidth(self):
+        graph = self._get_nodes_graph().tocoo()
+        return int(np.abs(graph.row - graph.col).max()) if graph.nnz else 0
+
+    def renumber(self, strategy='rcm', elements=True):
+        """Renumber the nodes of the part to reduce the bandwidth of the
+        stiffness matrix, and optionally the elements to follow the new order
+        of their nodes.
+
+        The keys of nodes and elements change, while the objects stay the same
+        (so groups, boundary conditions and loads are not affected). Renumber
+        the part before generating the input file.
+
+        Parameters
+        ----------
+        strategy : str, optional
+            The renumbering algorithm, by default 'rcm' (Reverse Cuthill-McKee
+            on the node adjacency graph).
+        elements : bool, optional
+            Renumber also the elements, sorting them by the keys of their nodes,
+            by default `True`.
+
+        Returns
+        -------
+        int
+            The bandwidth after the renumbering.
+
+        Raises
+        ------
+        ValueError
+            If the strategy is not supported.
+        """
+        if strategy != 'rcm':
+            raise ValueError('Unknown renumbering strategy {!r}.'.format(strategy))
+        from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+        if compas_fea2.VERBOSE:
+            print('Bandwidth of {!r} before renumbering: {}'.format(self, self.bandwidth))
+        self._reorder_nodes(reverse_cuthill_mckee(self._get_nodes_graph(), symmetric_mode=True))
+        if elements and self._elements_by_key:
+            # NOTE every element has at least one node
+            elements_nodes = self._get_adjacency()[0]
+            first = np.minimum.reduceat(elements_nodes.indices, elements_nodes.indptr[:-1])
+            self._reorder_elements(np.argsort(first, kind='stable').tolist())
+        bandwidth = self.bandwidth
+        if compas_fea2.VERBOSE:
+            print('Bandwidth of {!r} after renumbering: {}'.format(self, bandwidth))
+        return bandwidth
+
+    # =========================================================================
+    #                           Partitioning methods
+    # =========================================================================
+
+    def partition(self, n, method='coordinate'):
+        """Split the elements of the part in balanced subdomains by recursive
+        bisection, for example to write the input file in parallel or for
+        domain decomposition.
+
+        Parameters
+        ----------
+        n : int
+            The number of subdomains.
+        method : str, optional
+            The bisection method, by default 'coordinate':
+
+            - 'coordinate': split the element centroids at the median along the
+              direction of largest extent.
+            - 'graph': split the element adjacency graph (elements sharing a
+              node) at the median of its Reverse Cuthill-McKee ordering, which
+              keeps the subdomains connected for elongated or curved parts.
+
+        Returns
+        -------
+        list[(numpy.ndarray, numpy.ndarray)]
+            The keys of the elements and of the nodes of each subdomain.
+        numpy.ndarray
+            The keys of the interface nodes (shared by more than one subdomain).
+
+        Raises
+        ------
+        ValueError
+            If the number of subdomains or the method are not valid.
+        """
+        from scipy.sparse import csr_matrix
+
+        m = len(self._elements_by_key)
+        if not isinstance(n, Integral) or not 1 <= n <= max(m, 1):
+            raise ValueError('The number of subdomains must be an integer between 1 and {}, not {!r}.'.format(m, n))
+        elements_nodes, nodes_elements = self._get_adjacency()
+        if method == 'coordinate':
+            points = self.elements_centroids
+
+            def order(subset):
+                axis = np.argmax(np.ptp(points[subset], axis=0))
+                return subset[np.argsort(points[subset, axis], kind='stable')]
+        elif method == 'graph':
+            from scipy.sparse.csgraph import reverse_cuthill_mckee
+            dual = (elements_nodes @ nodes_elements).tocsr()
+
+            def order(subset):
+                return subset[reverse_cuthill_mckee(dual[subset][:, subset].tocsr(), symmetric_mode=True)]
+        else:
+            raise ValueError('Unknown partitioning method {!r}.'.format(method))
+
+        labels = np.zeros(m, dtype=int)
+        # (subset, number of subdomains, first label)
+        stack = [(np.arange(m), n, 0)]
+        while stack:
+            subset, count, first = stack.pop()
+            if count == 1:
+                labels[subset] = first
+                continue
+            left = count // 2
+            ordered = order(subset)
+            split = len(subset) * left // count
+            stack.append((ordered[:split], left, first))
+            stack.append((ordered[split:], count - left, first + left))
+
+        subdomains = csr_matrix((np.ones(m), (labels, np.arange(m))), shape=(n, m))
+        membership = (subdomains @ elements_nodes).tocsr()
+        membership.sum_duplicates()
+        partitions = [(np.flatnonzero(labels == label), np.sort(membership[label].indices)) for label in range(n)]
+        interface = np.flatnonzero(membership.getnnz(axis=0) > 1)
+        if compas_fea2.VERBOSE:
+            print('{!r} split in {} subdomains, {} interface nodes.'.format(self, n, len(interface)))
+        return partitions, interface
+
+    # =========================================================================
+    #                           Boundary methods
+    # =========================================================================
+
+    @staticmethod
+    def _faces_midsides(element_type):
+        """Columns of the midside nodes of the edges of each face of a
+        quadratic element type (see :func:`compas_fea2.utilities._arrays.split_edges`).
+
+        Returns
+        -------
+        list[list[int]]
+            The columns for each face, empty if the type has no edges table.
+        """
+        if not element_type._edge_indices:
+            return []
+        corners = len(element_type._corner_indices)
+        return [[corners + i for i, edge in enumerate(element_type._edge_indices) if set(edge) <= set(face)]
+                for face in element_type._face_indices.values()]
+
+    def compute_boundary(self):
+        """Find the elements and the nodes on the boundary of the part from
+        the topology of the elements.
+
+        The faces of the solid elements are collected from the face tables of
+        their types and hashed as sorted tuples of node keys: the faces
+        owned by exactly one element are on the boundary. The midside nodes
+        of the edges of the boundary faces of the quadratic elements are on
+        the boundary as well. Shell elements are always on the boundary, while
+        1D elements are not.
+
+        The result is cached until nodes or elements are added or removed,
+        and the `on_boundary` attribute of all the nodes and the elements is
+        updated.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean flags of the elements, indexed by key.
+        numpy.ndarray
+            Boolean flags of the nodes, indexed by key.
+        """
+        version = (self._elements_version, self._nodes_rows)
+        if self._boundary is not None and self._boundary[0] == version:
+            return self._boundary[1], self._boundary[2]
+
+        elements_flags = np.zeros(len(self._elements_by_key), dtype=bool)
+        nodes_flags = np.zeros(self._nodes_rows, dtype=bool)
+        solids = []
+        for element_type in self._elements_by_type:
+            if issubclass(element_type, _Element3D) and element_type._face_indices:
+                solids.append(element_type)
+            elif issubclass(element_type, _Element2D):
+                keys, connectivity = self.get_elements_connectivity(element_type)
+                elements_flags[keys] = True
+                nodes_flags[connectivity[connectivity >= 0]] = True
+
+        faces = np.empty((0, 0), dtype=int)
+        if solids:
+            width = max(len(indices) for element_type in solids for indices in element_type._face_indices.values())
+            tables = {element_type: self._faces_midsides(element_type) for element_type in solids}
+            midsides_width = max(len(table[0]) if table else 0 for table in tables.values())
+            blocks, owners, midsides = [], [], []
+            for element_type in solids:
+                keys, connectivity = self.get_elements_connectivity(element_type)
+                element_faces = element_type.faces_connectivity(connectivity)
+                _, faces_per_element, nodes_per_face = element_faces.shape
+                block = np.full((len(keys) * faces_per_element, width), -1, dtype=int)
+                block[:, :nodes_per_face] = element_faces.reshape((-1, nodes_per_face))
+                blocks.append(block)
+                owners.append(np.repeat(keys, faces_per_element))
+                # the midside nodes of the quadratic elements, in the columns after the corners
+                block = np.full((len(keys) * faces_per_element, midsides_width), -1, dtype=int)
+                table = tables[element_type]
+                if table and connectivity.shape[1] > max(max(columns) for columns in table):
+                    block[:, :len(table[0])] = connectivity[:, table].reshape((-1, len(table[0])))
+                midsides.append(block)
+            faces, owners, midsides = np.concatenate(blocks), np.concatenate(owners), np.concatenate(midsides)
+            # group the identical faces (same nodes in any order)
+            hashed = np.sort(faces, axis=1)
+            order = np.lexsort(hashed.T[::-1])
+            hashed = hashed[order]
+            first = np.ones(len(hashed), dtype=bool)
+            first[1:] = np.any(hashed[1:] != hashed[:-1], axis=1)
+            group = np.cumsum(first) - 1
+            owned_once = order[np.bincount(group)[group] == 1]
+            elements_flags[owners[owned_once]] = True
+            faces, midsides = faces[owned_once], midsides[owned_once]
+            nodes_flags[faces[faces >= 0]] = True
+            nodes_flags[midsides[midsides >= 0]] = True
+
+        for element, flag in zip(self._elements_by_key, elements_flags.tolist()):
+            element._on_boundary = flag
+        for node, flag in zip(self._nodes_by_key, nodes_flags.tolist()):
+            node._on_boundary = flag
+
+        elements_flags, nodes_flags = self._read_only(elements_flags), self._read_only(nodes_flags)
+        self._boundary = (version, elements_flags, nodes_flags, faces)
+        return elements_flags, nodes_flags
+
+    def extract_boundary_mesh(self):
+        """Create a mesh with the boundary faces of the solid elements of the
+        part (see :meth:`compute_boundary`).
+
+        Returns
+        -------
+        :class:`compas.datastructures.Mesh`
+            The boundary mesh, its vertices are the boundary nodes.
+        """
+        self.compute_boundary()
+        return self._faces_to_mesh(self._boundary[3], self._nodes_xyz)
+
+    def _get_mesh_faces(self):
+        """Get the faces to draw the part: the boundary faces of the solid
+        elements and the shell elements.
+
+        Returns
+        -------
+        numpy.ndarray
+            (f, k) array with the node keys of the faces, padded with -1.
+        """
+        self.compute_boundary()
+        blocks = [self._boundary[3]]
+        for element_type in self._elements_by_type:
+            if issubclass(element_type, _Element2D):
+                blocks.append(self.get_elements_connectivity(element_type)[1])
+        width = max(block.shape[1] for block in blocks)
+        return np.vstack([np.pad(block, ((0, 0), (0, width - block.shape[1])), constant_values=-1) for block in blocks])
+
+    def _faces_to_mesh(self, faces, xyz):
+        """Create a mesh from faces of the part.
+
+        Parameters
+        ----------
+        faces : numpy.ndarray
+            (f, k) array with the node keys of the faces, padded with -1.
+        xyz : numpy.ndarray
+            The coordinates of the nodes, indexed by key.
+
+        Returns
+        -------
+        :class:`compas.datastructures.Mesh`
+            The mesh, its vertices are the nodes of the faces.
+        """
+        from compas.datastructures import Mesh
+
+        keys = np.unique(faces[faces >= 0])
+        vertices = np.full(self._nodes_rows, -1, dtype=int)
+        vertices[keys] = np.arange(len(keys))
+        vertices = vertices.tolist()
+        return Mesh.from_vertices_and_faces(np.asarray(xyz)[keys].tolist(),
+                                            [[vertices[key] for key in face if key >= 0] for face in faces.tolist()])
+
     # =========================================================================
     #                           Faces methods
     # =========================================================================
@@ -995,10 +2503,14 @@ number of nodes    : {}
         [:class:`compas_fea2.model.Face`]
             list with the faces belonging to the given plane.
         """
+        on_plane = np.zeros(self._nodes_rows, dtype=bool)
+        on_plane[self.query_nodes_on_plane(plane)] = True
         faces = []
         for element in filter(lambda x: isinstance(x, (_Element2D, _Element3D)) and self.is_element_on_boundary(x), self._elements):
+            if on_plane[[node.key for node in element.nodes]].sum() < 3:
+                continue
             for face in element.faces:
-                if all([is_point_on_plane(node.xyz, plane) for node in face.nodes]):
+                if on_plane[[node.key for node in face.nodes]].all():
                     faces.append(face)
         return faces
 
@@ -1041,6 +2553,7 @@ number of nodes    : {}
         else:
             raise TypeError('{!r} is not a valid Group'.format(group))
 
+    @record_change
     def add_group(self, group):
         """Add a node or element group to the part.
 
@@ -1244,13 +2757,26 @@ class DeformablePart(_Part):
 
         """
         part = cls(name=name, **kwargs)
-        vertex_node = {vertex: part.add_node(Node(mesh.vertex_coordinates(vertex))) for vertex in mesh.vertices()}
-
-        for edge in mesh.edges():
-            nodes = [vertex_node[vertex] for vertex in edge]
-            v = mesh.edge_direction(*edge)
-            v.append(v.pop(0))
-            part.add_element(BeamElement(nodes=[*nodes], section=section, frame=v))
+        vertices, _ = mesh.to_vertices_and_faces()
+        key_index = mesh.key_index()
+        edges = np.asarray([(key_index[u], key_index[v]) for u, v in mesh.edges()], dtype=int).reshape((-1, 2))
+        nodes = part._add_nodes_from_array(vertices)
+        if not compas_fea2.POINT_OVERLAP:
+            # merge before creating the elements, so that the edges refer to the kept nodes
+            merged = part.merge_coincident_nodes()
+            keys = np.fromiter((merged.get(node, node).key for node in nodes), dtype=int, count=len(nodes))
+            edges = keys[edges]
+        directions = part._nodes_xyz[edges[:, 1]] - part._nodes_xyz[edges[:, 0]]
+        lengths = np.linalg.norm(directions, axis=1)
+        if (lengths == 0).any():
+            u, v = edges[np.argmin(lengths)].tolist()
+            raise ValueError('The mesh has {} edges of zero length, for example between the vertices at {} and {}.'.format(
+                np.count_nonzero(lengths == 0), part._nodes_xyz[u].tolist(), part._nodes_xyz[v].tolist()))
+        elements = part._add_elements_from_array(BeamElement, edges, section=section)
+        # the frame of each beam is its direction with the components shifted (y, z, x)
+        directions /= lengths[:, None]
+        for element, frame in zip(elements, np.roll(directions, -1, axis=1).tolist()):
+            element.frame = frame
 
         part._boundary_mesh = mesh
         part._discretized_boundary_mesh = mesh
@@ -1304,6 +2830,7 @@ class DeformablePart(_Part):
         """
         return material in self.materials
 
+    @record_change
     def add_material(self, material):
         # type: (_Material) -> _Material
         """Add a material to the part so that it can be referenced in section and element definitions.
@@ -1384,6 +2911,7 @@ class DeformablePart(_Part):
         """
         return section in self.sections
 
+    @record_change
     def add_section(self, section):
         # type: (_Section) -> _Section
         """Add a section to the part so that it can be referenced in element definitions.
@@ -1435,6 +2963,7 @@ class DeformablePart(_Part):
     #                           Releases methods
     # =========================================================================
 
+    @record_change
     def add_beam_release(self, element, location, release):
         """Add a :class:`compas_fea2.model._BeamEndRelease` to an element in the
         part.
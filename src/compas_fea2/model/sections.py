@@ -6,11 +6,12 @@ from abc import abstractmethod
 from math import pi
 
 from compas_fea2 import units
+from compas_fea2.base import ChangeTracking
 from compas_fea2.base import FEAData
 from .materials import _Material
 
 
-class _Section(FEAData):
+class _Section(ChangeTracking, FEAData):
     """Base class for sections.
 
     Note
@@ -77,7 +78,7 @@ material : {!r}
 # 0D
 # ==============================================================================
 
-class MassSection(FEAData):
+class MassSection(ChangeTracking, FEAData):
     """Section for point mass elements.
 
     Parameters
@@ -116,7 +117,7 @@ mass     : {}
 """.format(self.name, '-'*len(self.name), self.model, self.mass)
 
 
-class SpringSection(FEAData):
+class SpringSection(ChangeTracking, FEAData):
     """Section for use with spring elements.
 
     Parameters
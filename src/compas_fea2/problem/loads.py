@@ -2,12 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas_fea2.base import ChangeTracking
 from compas_fea2.base import FEAData
 
 # TODO: make units independent using the utilities function
 
 
-class _Load(FEAData):
+class _Load(ChangeTracking, FEAData):
     """Initialises base Load object.
 
     Note
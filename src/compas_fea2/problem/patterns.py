@@ -2,12 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas_fea2.base import ChangeTracking
 from compas_fea2.base import FEAData
 
 # TODO implement __*__ magic method for combination
 
 
-class Pattern(FEAData):
+class Pattern(ChangeTracking, FEAData):
 
     def __init__(self, value, distribution, name=None, **kwargs):
         """A pattern is the spatial distribution of a specific set of forces,
@@ -54,3 +55,8 @@ class Pattern(FEAData):
     @property
     def distribution(self):
         return self._distribution
+
+    @property
+    def version(self):
+        # NOTE the load is not registered to the pattern
+        return max(self._version, getattr(self._load, 'version', 0))
@@ -13,9 +13,11 @@ from compas_fea2.base import FEAData
 from compas_fea2.problem.steps.step import _Step
 from compas_fea2.job.input_file import InputFile
 from compas_fea2.results.results import StepResults
+from compas_fea2.results.deformed import DeformedView
 
 from compas_fea2.utilities._utils import timer
 from compas_fea2.utilities._utils import step_method
+from compas_fea2.utilities._utils import record_change
 
 from compas_fea2.results.sql_wrapper import (create_connection,
                                              get_database_table,
@@ -176,6 +178,7 @@ class Problem(FEAData):
             return False
         return True
 
+    @record_change
     def add_step(self, step):
         # # type: (Step) -> Step
         """Adds a :class:`compas_fea2.problem._Step` to the problem. The name of
@@ -238,6 +241,7 @@ class Problem(FEAData):
     #             raise TypeError('{} is not a step'.format(step))
     #     self._steps_order = order
 
+    @record_change
     def add_linear_perturbation_step(self, lp_step, base_step):
         """Add a linear perturbation step to a previously defined step.
 
@@ -534,12 +538,13 @@ GROUP BY {};""".format(', '.join(labels), field,
         if not values:
             raise ValueError('No results found')
         results=[]
+        parts = {}
         for row in values:
             result={}
-            part = self.model.find_part_by_name(row[0])
-            if not part:
+            if row[0] not in parts:
                 # try case insensitive match
-                part = self.model.find_part_by_name(row[0], casefold=True)
+                parts[row[0]] = self.model.find_part_by_name(row[0]) or self.model.find_part_by_name(row[0], casefold=True)
+            part = parts[row[0]]
             if not part:
                 print('Part {} not found in model'.format(row[0]))
                 continue
@@ -840,11 +845,8 @@ GROUP BY {};""".format(', '.join(labels),
         v = FEA2Viewer(width, height)
 
 
-        # TODO create a copy of the model first
         displacements, _ = self.get_displacements_sql(step)
-        for displacement in displacements:
-            vector = displacement['vector']
-            vector.scale(scale_factor)
-            displacement['node'].xyz = sum_vectors([Vector(*displacement['node'].xyz), vector])
-        v.draw_parts(self.model.parts, solid=True)
+        deformed = DeformedView.from_vectors(self.model, displacements, scale=scale_factor)
+        for part in self.model.parts:
+            v.app.add(deformed.to_mesh(part))
         v.show()
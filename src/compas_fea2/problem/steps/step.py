@@ -30,6 +30,7 @@ from compas_fea2.problem.outputs import HistoryOutput
 from compas.geometry import Vector
 from compas.geometry import sum_vectors
 from compas_fea2.utilities._utils import timer
+from compas_fea2.utilities._utils import record_change
 
 import copy
 
@@ -104,6 +105,7 @@ class _Step(FEAData):
     def key(self):
         return self._key
 
+    @record_change
     def add_output(self, output):
         """Request a field or history output.
 
@@ -333,6 +335,7 @@ class _GeneralStep(_Step):
     #                           Loads methods
     # =========================================================================
 
+    @record_change
     def _add_pattern(self, load_pattern):
         # type: (_Load, Node | _Element) -> _Load
         """Add a general load pattern to the Step object.
@@ -10,6 +10,7 @@ results
 
     Results
     StepResults
+    DeformedView
 
 """
 from __future__ import absolute_import
@@ -17,11 +18,13 @@ from __future__ import division
 from __future__ import print_function
 
 from .results import Results, StepResults
+from .deformed import DeformedView
 from.sql_wrapper import (create_connection,
                          get_database_table,
                          )
 
 __all__ = [
     'Results',
-    'StepResults'
+    'StepResults',
+    'DeformedView',
 ]
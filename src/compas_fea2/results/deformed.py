@@ -0,0 +1,189 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from compas_fea2.base import FEAData
+
+
+class DeformedView(FEAData):
+    """Deformed geometry of a model, computed without modifying (or copying)
+    the model.
+
+    The view stores, for each part, the displacements of the nodes as an array
+    indexed by node key; the deformed coordinates are computed on first access
+    as the coordinates of the nodes plus the scaled displacements. Views with a
+    different scale share the same displacements, so many deformed states
+    (steps, modes, scales) can be inspected at the same time.
+
+    Parameters
+    ----------
+    model : :class:`compas_fea2.model.Model`
+        The undeformed model.
+    displacements : dict
+        {part: array} dictionary with the (n, 3) displacements of the nodes of
+        each part, indexed by node key. The arrays are copied. The parts not in
+        the dictionary are not deformed.
+    scale : float, optional
+        The scale factor of the displacements, by default 1.
+    name : str, optional
+        Uniqe identifier. If not provided it is automatically generated.
+
+    Attributes
+    ----------
+    model : :class:`compas_fea2.model.Model`, read-only
+        The undeformed model.
+    scale : float, read-only
+        The scale factor of the displacements.
+    displacements : dict, read-only
+        {part: array} dictionary with the displacements of the nodes, indexed
+        by the keys the nodes had when the view was created.
+    """
+
+    def __init__(self, model, displacements, scale=1., name=None, **kwargs):
+        super(DeformedView, self).__init__(name=name, **kwargs)
+        self._model = model
+        self._scale = float(scale)
+        self._displacements = {}
+        # the nodes in the order of the keys, to follow renumbering
+        self._nodes = {}
+        for part, values in displacements.items():
+            values = np.array(values, dtype=float)
+            if values.shape != (part._nodes_rows, 3):
+                raise ValueError('The displacements of {!r} must be a ({}, 3) array, not {}.'.format(part, part._nodes_rows, values.shape))
+            values.flags.writeable = False
+            self._displacements[part] = values
+            self._nodes[part] = list(part._nodes_by_key)
+        # {part: (nodes version, xyz)}
+        self._xyz = {}
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @property
+    def displacements(self):
+        return self._displacements
+
+    @classmethod
+    def from_vectors(cls, model, vectors, scale=1., name=None, **kwargs):
+        """Create a view from the displacement vectors of the nodes, for example
+        the ones returned by :meth:`compas_fea2.problem.Problem.get_displacements_sql`.
+
+        Parameters
+        ----------
+        model : :class:`compas_fea2.model.Model`
+            The undeformed model.
+        vectors : list[dict]
+            List of {'part': part, 'node': node, 'vector': vector} dictionaries.
+        scale : float, optional
+            The scale factor of the displacements, by default 1.
+
+        Returns
+        -------
+        :class:`compas_fea2.results.DeformedView`
+        """
+        rows = {}
+        for vector in vectors:
+            if vector['node'] is None:
+                continue
+            part_rows = rows.setdefault(vector['part'], ([], []))
+            part_rows[0].append(vector['node'].key)
+            part_rows[1].append(list(vector['vector']))
+        displacements = {}
+        for part, (keys, values) in rows.items():
+            displacements[part] = np.zeros((part._nodes_rows, 3))
+            displacements[part][keys] = values
+        return cls(model, displacements, scale=scale, name=name, **kwargs)
+
+    def scaled(self, scale):
+        """Create a view of the same deformed state with a different scale.
+        The displacements are shared, not copied.
+
+        Parameters
+        ----------
+        scale : float
+            The scale factor of the displacements.
+
+        Returns
+        -------
+        :class:`compas_fea2.results.DeformedView`
+        """
+        view = self.__class__(self._model, {}, scale=scale)
+        view._displacements, view._nodes = self._displacements, self._nodes
+        return view
+
+    def _get_displacements(self, part):
+        """Get the displacements of the nodes of a part in the order of their
+        current keys.
+
+        Raises
+        ------
+        ValueError
+            If nodes were added to or removed from the part after the view
+            was created.
+        """
+        displacements, nodes = self._displacements[part], self._nodes[part]
+        if part._nodes_by_key == nodes:
+            return displacements
+        # the nodes were renumbered
+        keys = {node: key for key, node in enumerate(nodes)}
+        if len(nodes) != part._nodes_rows or any(node not in keys for node in part._nodes_by_key):
+            raise ValueError('The nodes of {!r} were added or removed after the deformed view was created.'.format(part))
+        return displacements[[keys[node] for node in part._nodes_by_key]]
+
+    def nodes_xyz(self, part):
+        """Get the deformed coordinates of the nodes of a part.
+
+        Parameters
+        ----------
+        part : :class:`compas_fea2.model.DeformablePart`
+            The part.
+
+        Returns
+        -------
+        numpy.ndarray
+            Read-only (n, 3) array indexed by node key.
+        """
+        cached = self._xyz.get(part)
+        if cached is None or cached[0] != part._nodes_version:
+            xyz = part.nodes_xyz.copy()
+            if part in self._displacements:
+                xyz += self._scale * self._get_displacements(part)
+            xyz.flags.writeable = False
+            cached = self._xyz[part] = (part._nodes_version, xyz)
+        return cached[1]
+
+    def node_xyz(self, node):
+        """Get the deformed coordinates of a node.
+
+        Parameters
+        ----------
+        node : :class:`compas_fea2.model.Node`
+            The node.
+
+        Returns
+        -------
+        [float, float, float]
+        """
+        return self.nodes_xyz(node.part)[node.key].tolist()
+
+    def to_mesh(self, part):
+        """Create a mesh of the deformed part, with the boundary faces of the
+        solid elements and the shell elements.
+
+        Parameters
+        ----------
+        part : :class:`compas_fea2.model.DeformablePart`
+            The part.
+
+        Returns
+        -------
+        :class:`compas.datastructures.Mesh`
+        """
+        return part._faces_to_mesh(part._get_mesh_faces(), self.nodes_xyz(part))
@@ -2,7 +2,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
+
 from compas_fea2.base import FEAData
+from compas_fea2.results.deformed import DeformedView
 
 from compas.geometry import Vector
 from compas.geometry import sum_vectors
@@ -103,11 +106,11 @@ class StepResults(FEAData):
 
     @property
     def problem(self):
-        return self.step_registration
+        return self.step.problem
 
     @property
     def model(self):
-        return self.problem._registration
+        return self.step.model
 
     def _copy_results_in_model(self, results, fields=None):
         """Copy the results for the step in the model object at the nodal and
@@ -132,11 +135,12 @@ class StepResults(FEAData):
             for result_type, node_elements_results in part_results.items():
                 if result_type not in ['nodes', 'elements']:
                     continue
-                node_elements = getattr(self.model.find_part_by_name(part_name, casefold=True), result_type)
+                func = getattr(self.model.find_part_by_name(part_name, casefold=True),
+                               'find_{}_by_key'.format(result_type[:-1]))
                 # Get field results
                 for key, res_field in node_elements_results.items():
                     if not fields or res_field in fields:
-                        node_element = list(filter(lambda n_e: n_e.key == int(key), node_elements))[0]
+                        node_element = func(int(key))
                         node_element._results.setdefault(self.problem, {})[self.step] = res_field
 
     # TODO add moments
@@ -159,14 +163,27 @@ class StepResults(FEAData):
         raise NotImplementedError()
 
     def get_deformed_model(self, scale, **kwargs):
-        from compas.geometry import distance_point_point_sqrd
-        # TODO copy model first
-        for part in self.step.problem.model.parts:
-            for node in part.nodes:
-                original_node = node.xyz
-                x, y, z = node.results[self.step.name]['U']
-                node.x += x*scale
-                node.y += y*scale
-                node.z += z*scale
+        """Get the deformed geometry of the model for the step. The model is
+        not modified.
+
+        Parameters
+        ----------
+        scale : float
+            The scale factor of the displacements.
 
-        return self.model
+        Returns
+        -------
+        :class:`compas_fea2.results.DeformedView`
+        """
+        displacements = {}
+        for part in self.model.parts:
+            nodes, vectors = [], []
+            for node in part.nodes:
+                results = node.results.get(self.problem, {}).get(self.step)
+                if results and 'U' in results:
+                    nodes.append(node.key)
+                    vectors.append(results['U'])
+            if nodes:
+                displacements[part] = np.zeros((part._nodes_rows, 3))
+                displacements[part][nodes] = vectors
+        return DeformedView(self.model, displacements, scale=scale)
@@ -0,0 +1,465 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+def precision_scale(precision):
+    """Scale factor to quantize coordinates at a given precision.
+
+    Parameters
+    ----------
+    precision : str
+        The precision in the format used by :func:`compas.utilities.geometric_key`,
+        for example '3f' (3 decimals) or 'd' (integers).
+
+    Returns
+    -------
+    float
+    """
+    if precision.endswith('d'):
+        return 1.
+    return 10. ** int(precision[:-1] or 0)
+
+
+def geometric_keys(xyz, precision):
+    """Integer geometric keys of a set of points.
+
+    The coordinates are rounded at the given precision and stored as integers,
+    so that points with the same string geometric key have the same integer
+    key, but hashing and comparing them is much cheaper.
+
+    Parameters
+    ----------
+    xyz : array-like
+        (n, 3) array with the coordinates of the points.
+    precision : str
+        The precision, for example '3f'.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n, 3) integer array.
+    """
+    xyz = np.asarray(xyz, dtype=float)
+    return np.rint(xyz * precision_scale(precision)).astype(np.int64)
+
+
+def geometric_key(xyz, precision):
+    """Integer geometric key of a single point (see :func:`geometric_keys`).
+
+    Parameters
+    ----------
+    xyz : [float, float, float]
+        The coordinates of the point.
+    precision : str
+        The precision, for example '3f'.
+
+    Returns
+    -------
+    tuple(int, int, int)
+    """
+    scale = precision_scale(precision)
+    # NOTE `round` rounds half to even as `numpy.rint`
+    return tuple(int(round(c * scale)) for c in xyz)
+
+
+def distances_points_plane(xyz, plane):
+    """Signed distances of a set of points from a plane.
+
+    Parameters
+    ----------
+    xyz : array-like
+        (n, 3) array with the coordinates of the points.
+    plane : [point, vector] | :class:`compas.geometry.Plane`
+        The plane.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n, ) array with the distances, positive on the side of the normal.
+    """
+    base, normal = plane
+    normal = np.asarray(normal, dtype=float)
+    normal = normal / np.linalg.norm(normal)
+    return (np.asarray(xyz, dtype=float) - np.asarray(base, dtype=float)) @ normal
+
+
+def transform_points(xyz, transformation):
+    """Apply a transformation to a set of points at once.
+
+    Parameters
+    ----------
+    xyz : array-like
+        (n, 3) array with the coordinates of the points.
+    transformation : :class:`compas.geometry.Transformation`
+        The transformation.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n, 3) array with the transformed coordinates.
+
+    Note
+    ----
+    Only affine transformations are supported.
+    """
+    matrix = np.asarray(transformation.matrix, dtype=float)
+    return np.asarray(xyz, dtype=float) @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def points_in_polygon_xy(xy, polygon):
+    """Test which points are inside a polygon in the XY plane (even-odd rule).
+
+    Parameters
+    ----------
+    xy : array-like
+        (n, 2+) array with the coordinates of the points. Only the first two
+        columns are used.
+    polygon : array-like
+        (m, 2+) array with the coordinates of the vertices of the polygon.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n, ) boolean mask.
+    """
+    xy = np.asarray(xy, dtype=float)
+    polygon = np.asarray(polygon, dtype=float)
+    x, y = xy[:, 0], xy[:, 1]
+    inside = np.zeros(len(xy), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(polygon[:, :2].tolist(), np.roll(polygon[:, :2], -1, axis=0).tolist()):
+        if y1 == y2:
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        inside ^= crosses & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+    return inside
+
+
+# ==============================================================================
+# Elements geometry
+# ==============================================================================
+
+# decomposition of the solid elements in tetrahedra (local node indices)
+HEXAHEDRON_TETRAHEDRA = [(0, 1, 2, 6), (0, 2, 3, 6), (0, 3, 7, 6), (0, 7, 4, 6), (0, 4, 5, 6), (0, 5, 1, 6)]
+PENTAHEDRON_TETRAHEDRA = [(0, 1, 2, 3), (1, 2, 3, 4), (2, 3, 4, 5)]
+
+
+def tetrahedra_signed_volumes(xyz, connectivity):
+    """Signed volumes of a set of tetrahedra.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, 4) array with the nodes of each tetrahedron.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, ) array, positive if the fourth node is on the side of the
+        normal of the first three (counter-clockwise) nodes.
+    """
+    a, b, c, d = (xyz[connectivity[:, i]] for i in range(4))
+    return np.einsum('ij,ij->i', np.cross(b - a, c - a), d - a) / 6.
+
+
+def tetrahedra_volumes(xyz, connectivity):
+    """Volumes of a set of tetrahedra (see :func:`tetrahedra_signed_volumes`)."""
+    return np.abs(tetrahedra_signed_volumes(xyz, connectivity))
+
+
+def hexahedra_volumes(xyz, connectivity):
+    """Volumes of a set of hexahedra, computed splitting each one in 6
+    tetrahedra around its main diagonal (exact for hexahedra with planar faces).
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, 8) array with the nodes of each hexahedron.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, ) array.
+    """
+    return sum(tetrahedra_volumes(xyz, connectivity[:, tet]) for tet in HEXAHEDRON_TETRAHEDRA)
+
+
+def pentahedra_volumes(xyz, connectivity):
+    """Volumes of a set of pentahedra (wedges), computed splitting each one in
+    3 tetrahedra.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, 6) array with the nodes of each pentahedron.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, ) array.
+    """
+    return sum(tetrahedra_volumes(xyz, connectivity[:, tet]) for tet in PENTAHEDRON_TETRAHEDRA)
+
+
+# edges of the solid elements, in the order of the midside nodes of the
+# quadratic elements (C3D10 and C3D20)
+TETRAHEDRON_EDGES = [(0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)]
+HEXAHEDRON_EDGES = [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)]
+
+
+def split_edges(xyz, blocks):
+    """Add a node in the middle of the edges of the elements.
+
+    The edges of all the elements are hashed at once (as sorted pairs of
+    nodes), so that each midside node is created only once and shared by all
+    the elements around the edge.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    blocks : list[(numpy.ndarray, list)]
+        For each block of elements of the same type, the (m, k) connectivity
+        and the edges of the element type (see for example :data:`TETRAHEDRON_EDGES`).
+
+    Returns
+    -------
+    numpy.ndarray
+        (e, 3) array with the coordinates of the midside nodes, that are
+        numbered after the existing nodes.
+    list[numpy.ndarray]
+        The (m, k + len(edges)) connectivity of each block, with the midside
+        nodes appended in the order of the edges.
+    """
+    n = len(xyz)
+    pairs = [np.sort(np.asarray(connectivity)[:, edges], axis=2).reshape((-1, 2)) for connectivity, edges in blocks]
+    hashes = np.concatenate([pair[:, 0] * n + pair[:, 1] for pair in pairs]) if pairs else np.empty(0, dtype=int)
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    start, end = np.divmod(unique, n)
+    midsides = np.split(n + inverse.ravel(), np.cumsum([len(pair) for pair in pairs])[:-1])
+    connectivities = [np.hstack([connectivity, keys.reshape((len(connectivity), len(edges)))])
+                      for (connectivity, edges), keys in zip(blocks, midsides)]
+    return (xyz[start] + xyz[end]) / 2., connectivities
+
+
+def _fill_padding(connectivity):
+    """Replace the -1 padding of a connectivity array with the last valid
+    node of each row."""
+    connectivity = np.array(connectivity)
+    for column in range(1, connectivity.shape[1]):
+        padded = connectivity[:, column] < 0
+        connectivity[padded, column] = connectivity[padded, column - 1]
+    return connectivity
+
+
+def polygons_areas(xyz, connectivity):
+    """Areas of a set of polygons (for example the shell elements).
+
+    The area is the norm of the vector area, which is exact for planar
+    polygons.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, k) array with the nodes of each polygon, padded with -1.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, ) array.
+    """
+    connectivity = _fill_padding(connectivity)
+    points = xyz[connectivity]
+    vector_area = np.cross(points, np.roll(points, -1, axis=1)).sum(axis=1)
+    return np.linalg.norm(vector_area, axis=1) / 2.
+
+
+def segments_lengths(xyz, connectivity):
+    """Lengths of a set of segments (for example the 1D elements).
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, 2+) array, the first two columns are the end nodes.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, ) array.
+    """
+    return np.linalg.norm(xyz[connectivity[:, 1]] - xyz[connectivity[:, 0]], axis=1)
+
+
+def centroids(xyz, connectivity):
+    """Centroids (average of the nodes) of a set of elements.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, k) array with the nodes of each element, padded with -1.
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, 3) array.
+    """
+    connectivity = np.asarray(connectivity)
+    valid = connectivity >= 0
+    points = xyz[np.where(valid, connectivity, 0)] * valid[..., None]
+    return points.sum(axis=1) / valid.sum(axis=1)[:, None]
+
+
+# ==============================================================================
+# Elements quality
+# ==============================================================================
+
+# corners of the solid elements: each node with the three neighbours spanning
+# a right-handed frame when the element is not inverted
+TETRAHEDRON_CORNERS = [(0, 1, 2, 3), (1, 2, 0, 3), (2, 0, 1, 3), (3, 0, 2, 1)]
+PENTAHEDRON_CORNERS = [(0, 1, 2, 3), (1, 2, 0, 4), (2, 0, 1, 5), (3, 5, 4, 0), (4, 3, 5, 1), (5, 4, 3, 2)]
+HEXAHEDRON_CORNERS = [(0, 1, 3, 4), (1, 2, 0, 5), (2, 3, 1, 6), (3, 0, 2, 7),
+                      (4, 7, 5, 0), (5, 4, 6, 1), (6, 5, 7, 2), (7, 6, 4, 3)]
+
+
+def _norm(vectors):
+    return np.linalg.norm(vectors, axis=-1)
+
+
+def _angles(u, v):
+    """Angles in degrees between two arrays of vectors (last axis)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.einsum('...i,...i', u, v) / (_norm(u) * _norm(v))
+    return np.degrees(np.arccos(np.clip(cos, -1., 1.)))
+
+
+def _polygons_corners(points):
+    """Corner vectors of the polygons of a (m, n, 3) array of points."""
+    return np.roll(points, -1, axis=1) - points, np.roll(points, 1, axis=1) - points
+
+
+def _skewness(angles, sides):
+    """Equiangular skewness from the corner angles of polygons with a given
+    number of sides."""
+    ideal = 180. * (sides - 2) / sides
+    return np.maximum((angles.max(axis=-1) - ideal) / (180. - ideal), (ideal - angles.min(axis=-1)) / ideal)
+
+
+def polygons_quality(xyz, connectivity):
+    """Quality metrics of a set of polygons (for example the shell elements).
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, k) array with the nodes of each polygon, padded with -1.
+
+    Returns
+    -------
+    dict
+        {'aspect_ratio': array, 'min_angle': array, 'jacobian': array, 'skewness': array}
+        with the ratio between the longest and the shortest edge, the minimum
+        corner angle (degrees), the minimum scaled jacobian (sine of the corner
+        angles, negative at reflex or flipped corners) and the equiangular
+        skewness of each polygon.
+    """
+    connectivity = np.asarray(connectivity)
+    quality = {name: np.full(len(connectivity), np.nan) for name in ('aspect_ratio', 'min_angle', 'jacobian', 'skewness')}
+    sides = (connectivity >= 0).sum(axis=1)
+    for n in np.unique(sides[sides >= 3]):
+        rows = np.flatnonzero(sides == n)
+        points = xyz[connectivity[rows, :n]]
+        after, before = _polygons_corners(points)
+        normals = np.cross(points, np.roll(points, -1, axis=1)).sum(axis=1)
+        normals /= _norm(normals)[:, None]
+        lengths = _norm(after)
+        angles = _angles(after, before)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            quality['aspect_ratio'][rows] = lengths.max(axis=1) / lengths.min(axis=1)
+            jacobians = np.einsum('ijk,ik->ij', np.cross(after, before), normals) / (lengths * _norm(before))
+        quality['min_angle'][rows] = angles.min(axis=1)
+        quality['jacobian'][rows] = jacobians.min(axis=1)
+        quality['skewness'][rows] = _skewness(angles, n)
+    return quality
+
+
+def solids_quality(xyz, connectivity, corners, faces=None):
+    """Quality metrics of a set of solid elements of the same type.
+
+    Parameters
+    ----------
+    xyz : numpy.ndarray
+        (n, 3) array with the coordinates of the nodes.
+    connectivity : numpy.ndarray
+        (m, k) array with the nodes of each element.
+    corners : list
+        The corners of the element type (see for example
+        :data:`HEXAHEDRON_CORNERS`), the edges are the segments between each
+        node and its neighbours.
+    faces : list, optional
+        The nodes of each face of the element type, in cyclic order. If not
+        provided, the minimum dihedral angle and the skewness are not
+        computed.
+
+    Returns
+    -------
+    dict
+        {'aspect_ratio': array, 'min_angle': array, 'jacobian': array, 'skewness': array}
+        with the ratio between the longest and the shortest edge, the minimum
+        dihedral angle (degrees), the minimum scaled jacobian at the corners
+        (negative for inverted elements) and the maximum equiangular skewness
+        of the faces of each element.
+    """
+    connectivity = np.asarray(connectivity)
+    points = xyz[connectivity]
+    corners = np.asarray(corners)
+    origins = points[:, corners[:, 0]]
+    e1, e2, e3 = (points[:, corners[:, i]] - origins for i in (1, 2, 3))
+    edges = np.unique(np.sort(np.stack([np.repeat(corners[:, 0], 3), corners[:, 1:].ravel()], axis=1), axis=1), axis=0)
+    lengths = _norm(points[:, edges[:, 1]] - points[:, edges[:, 0]])
+    quality = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quality['aspect_ratio'] = lengths.max(axis=1) / lengths.min(axis=1)
+        jacobians = np.einsum('ijk,ijk->ij', np.cross(e1, e2), e3) / (_norm(e1) * _norm(e2) * _norm(e3))
+    quality['jacobian'] = jacobians.min(axis=1)
+    quality['min_angle'] = np.full(len(connectivity), np.nan)
+    quality['skewness'] = np.full(len(connectivity), np.nan)
+    if not faces:
+        return quality
+
+    # skewness of the faces
+    skewness = []
+    for face in faces:
+        after, before = _polygons_corners(points[:, list(face)])
+        skewness.append(_skewness(_angles(after, before), len(face)))
+    quality['skewness'] = np.max(skewness, axis=0)
+
+    # dihedral angles at the edges shared by two faces, from the outward normals
+    centers = points.mean(axis=1)
+    normals = []
+    for face in faces:
+        face_points = points[:, list(face)]
+        normal = np.cross(face_points, np.roll(face_points, -1, axis=1)).sum(axis=1)
+        outward = np.einsum('ij,ij->i', normal, face_points.mean(axis=1) - centers) >= 0
+        normals.append(np.where(outward[:, None], normal, -normal))
+    shared = {}
+    for index, face in enumerate(faces):
+        for u, v in zip(face, face[1:] + face[:1]):
+            shared.setdefault(frozenset((u, v)), []).append(index)
+    dihedrals = [180. - _angles(normals[i], normals[j]) for i, j in (pair for pair in shared.values() if len(pair) == 2)]
+    quality['min_angle'] = np.min(dihedrals, axis=0)
+    return quality
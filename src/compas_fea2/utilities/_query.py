@@ -0,0 +1,162 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ast
+from functools import lru_cache
+from functools import reduce
+
+import numpy as np
+
+
+_COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+}
+
+_FUNCTIONS = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+}
+
+
+class Predicate(object):
+    """A condition compiled into a function of named arrays.
+
+    Conditions are written with the python syntax for comparisons (chained
+    comparisons are supported) and combined with ``&`` (or ``and``), ``|``
+    (or ``or``) and ``~`` (or ``not``). For example ``'x <= 3 & z > 1'``,
+    ``'0 <= x <= 3'`` or ``'abs(y - y0) < tol'``.
+
+    Parameters
+    ----------
+    condition : str
+        The condition.
+
+    Attributes
+    ----------
+    condition : str
+        The condition.
+    names : set
+        The names of the variables used by the condition.
+
+    Raises
+    ------
+    ValueError
+        If the condition is not a valid expression or uses unsupported
+        operations.
+    """
+
+    def __init__(self, condition):
+        self.condition = condition
+        self.names = set()
+        # NOTE `&` and `|` bind tighter than comparisons in python
+        source = condition.replace('&', ' and ').replace('|', ' or ').replace('~', ' not ')
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError:
+            raise ValueError('{!r} is not a valid condition.'.format(condition))
+        self._function = self._compile(tree.body)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.condition)
+
+    def __call__(self, data):
+        """Evaluate the condition.
+
+        Parameters
+        ----------
+        data : dict
+            {name: value} dictionary with the (array) value of each variable.
+
+        Returns
+        -------
+        numpy.ndarray
+            The boolean mask.
+        """
+        return np.asarray(self._function(data), dtype=bool)
+
+    def _compile(self, node):
+        if isinstance(node, ast.BoolOp):
+            operands = [self._compile(value) for value in node.values]
+            operator = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda data: reduce(operator, (operand(data) for operand in operands))
+
+        if isinstance(node, ast.Compare):
+            operands = [self._compile(node.left)] + [self._compile(c) for c in node.comparators]
+            comparisons = [self._get(_COMPARISONS, op) for op in node.ops]
+
+            def compare(data):
+                values = [operand(data) for operand in operands]
+                return reduce(np.logical_and, (comparison(a, b) for comparison, a, b in zip(comparisons, values, values[1:])))
+            return compare
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda data: np.logical_not(operand(data))
+            if isinstance(node.op, ast.USub):
+                return lambda data: np.negative(operand(data))
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+        if isinstance(node, ast.BinOp):
+            left, right = self._compile(node.left), self._compile(node.right)
+            operator = self._get(_OPERATORS, node.op)
+            return lambda data: operator(left(data), right(data))
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            function = self._get(_FUNCTIONS, node.func.id)
+            arguments = [self._compile(argument) for argument in node.args]
+            return lambda data: function(*(argument(data) for argument in arguments))
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            self.names.add(name)
+            return lambda data: data[name]
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = node.value
+            return lambda data: value
+
+        raise ValueError('Unsupported expression {!r} in {!r}.'.format(ast.dump(node), self.condition))
+
+    def _get(self, table, key):
+        if isinstance(key, str):
+            if key not in table:
+                raise ValueError('Unsupported function {!r} in {!r}.'.format(key, self.condition))
+            return table[key]
+        if type(key) not in table:
+            raise ValueError('Unsupported operator {} in {!r}.'.format(type(key).__name__, self.condition))
+        return table[type(key)]
+
+
+@lru_cache(maxsize=256)
+def compile_condition(condition):
+    """Compile a condition into a :class:`Predicate`. The compiled conditions
+    are cached, so the same condition is parsed only once.
+
+    Parameters
+    ----------
+    condition : str | :class:`Predicate`
+        The condition.
+
+    Returns
+    -------
+    :class:`Predicate`
+    """
+    if isinstance(condition, Predicate):
+        return condition
+    return Predicate(condition)
@@ -186,3 +186,16 @@ def problem_method(f):
                 vars[problem] = vars
         return vars
     return wrapper
+
+
+def record_change(f):
+    """Record a change of the object (see :attr:`compas_fea2.base.FEAData.version`)
+    after running the decorated method.
+    """
+
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        value = f(self, *args, **kwargs)
+        self._changed()
+        return value
+    return wrapper
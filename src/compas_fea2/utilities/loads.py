@@ -25,8 +25,8 @@ def mesh_points_pattern(model, mesh, t=0.05, side='top'):
         point = mesh.vertex_coordinates(vertex)
         tributary_area = mesh.vertex_area(vertex)
         for part in model.parts: #filter(lambda p: 'block' in p.name, model.parts):
-            nodes = part.find_nodes_where(
-                [f'{point[0]-t} <= x <= {point[0]+t}', f'{point[1]-t} <= y <= {point[1]+t}'])
+            # NOTE the condition is compiled only once, the vertex is a variable
+            nodes = part.find_nodes_where('x0 - t <= x <= x0 + t & y0 - t <= y <= y0 + t', x0=point[0], y0=point[1], t=t)
             if nodes:
                 if side == 'top':
                     pattern.setdefault(vertex, {})['area'] = tributary_area
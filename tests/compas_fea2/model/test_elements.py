@@ -0,0 +1,62 @@
+from compas_fea2.model import DeformablePart
+from compas_fea2.model import ElasticIsotropic
+from compas_fea2.model import HexahedronElement
+from compas_fea2.model import SolidSection
+from compas_fea2.model import TetrahedronElement
+
+
+# ==============================================================================
+# Tests - Faces
+# ==============================================================================
+
+def test_faces_are_lazy():
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3]], TetrahedronElement, section)
+    element = part.find_element_by_key(0)
+
+    assert element._faces is None
+    assert [face.tag for face in element.faces] == ['s1', 's2', 's3', 's4']
+    assert element.faces is element.faces
+    assert element.faces[0].plane.normal.z in (1.0, -1.0)
+
+
+def test_faces_connectivity():
+    faces = HexahedronElement.faces_connectivity([list(range(8)), list(range(8, 16))])
+
+    assert faces.shape == (2, 6, 4)
+    assert faces[1, 1].tolist() == [12, 15, 14, 13]
+
+
+# ==============================================================================
+# Tests - Geometry
+# ==============================================================================
+
+def test_volumes_and_centroids():
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [2, 0, 0], [2, 1, 0], [0, 1, 0], [0, 0, 3], [2, 0, 3], [2, 1, 3], [0, 1, 3]]
+    part = DeformablePart.from_arrays(coords, {HexahedronElement: [list(range(8))],
+                                               TetrahedronElement: [[0, 1, 3, 4]]}, section=section)
+    hexa, tetra = part.find_element_by_key(0), part.find_element_by_key(1)
+
+    assert part.elements_volumes.tolist() == [6.0, 1.0]
+    assert hexa.volume == 6.0 and tetra.volume == 1.0
+    assert part.volume == 7.0
+    assert hexa.centroid == [1.0, 0.5, 1.5]
+
+    # the cache follows the nodes
+    part.find_node_by_key(4).z = 6.0
+    assert tetra.volume == 2.0
+
+
+def test_areas_and_lengths():
+    from compas_fea2.model import BeamElement
+    from compas_fea2.model import Node
+    from compas_fea2.model import ShellElement
+
+    nodes = [Node(xyz) for xyz in [[0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0]]]
+    shell = ShellElement(nodes=nodes, section=None)
+    beam = BeamElement(nodes=nodes[:2], section=None)
+
+    assert shell.area == 4.0
+    assert beam.length == 2.0
@@ -0,0 +1,178 @@
+from compas.geometry import Plane
+from compas.geometry import Polygon
+
+from compas_fea2.model import DeformablePart
+from compas_fea2.model import Model
+from compas_fea2.model import Node
+
+
+# ==============================================================================
+# Tests - Global index
+# ==============================================================================
+
+def _model():
+    model = Model()
+    a, b = DeformablePart(name='a'), DeformablePart(name='b')
+    a.add_nodes([Node(xyz=[float(i), 0.0, 0.0]) for i in range(3)])
+    b.add_nodes([Node(xyz=[float(i), 1.0, 0.0]) for i in range(2)])
+    model.add_parts([a, b])
+    return model, a, b
+
+
+def test_global_ids():
+    model, a, b = _model()
+
+    assert model.nodes_offsets.tolist() == [0, 3, 5]
+    assert model.nodes_xyz.shape == (5, 3)
+    assert model.find_nodes_by_global_ids([1, 4]) == [(a, 1), (b, 1)]
+    assert model.get_global_ids([b.find_node_by_key(0), a.find_node_by_key(2)]).tolist() == [3, 2]
+
+    b.add_node(Node(xyz=[5.0, 5.0, 5.0]))
+    assert model.nodes_offsets.tolist() == [0, 3, 6]
+
+
+def test_model_wide_queries():
+    model, a, b = _model()
+
+    assert model.query_nodes_where('x >= 1').tolist() == [1, 2, 4]
+    assert model.find_nodes_where('x < 1 & y > 0.5', dict_format=True) == {b: [b.find_node_by_key(0)]}
+    assert model.find_nodes_on_plane(Plane([0, 1, 0], [0, 1, 0])) == [[b.find_node_by_key(0), b.find_node_by_key(1)]]
+    assert model.find_nodes_by_location([1.0, 0.5, 0.0], 0.6) == [[a.find_node_by_key(1)], [b.find_node_by_key(1)]]
+
+    # the closest nodes among all the parts
+    assert model.find_closest_nodes_to_point([1.9, 0.4, 0.0], 2, number_of_nodes=2) == [[a.find_node_by_key(2), a.find_node_by_key(1)]]
+    assert model.find_closest_nodes_to_node(a.find_node_by_key(2), 2, number_of_nodes=2, dict_format=True) == {
+        a: [a.find_node_by_key(1)], b: [b.find_node_by_key(1)]}
+    around = model.find_nodes_around_node(a.find_node_by_key(1), 1.1, dict_format=True)
+    assert {part: set(nodes) for part, nodes in around.items()} == {a: {a.find_node_by_key(0), a.find_node_by_key(2)}, b: {b.find_node_by_key(1)}}
+    square = Polygon([[0.5, -0.5, 0.0], [1.5, -0.5, 0.0], [1.5, 1.5, 0.0], [0.5, 1.5, 0.0]])
+    assert model.find_nodes_in_polygon(square) == [[a.find_node_by_key(1)], [b.find_node_by_key(1)]]
+
+    # key, name and attribute lookups
+    assert model.find_node_by_key(2) == [[a.find_node_by_key(2)]]
+    assert model.find_node_by_key(1, dict_format=True) == {a: [a.find_node_by_key(1)], b: [b.find_node_by_key(1)]}
+    named = model.add_part(DeformablePart(name='c')).add_node(Node(xyz=[5.0, 5.0, 5.0], name='n'))
+    assert model.find_nodes_by_name('n') == [[named]]
+    assert model.find_nodes_by_attribute('x', 1.0) == [[a.find_node_by_key(1)], [b.find_node_by_key(1)]]
+    assert model.contains_node(b.find_node_by_key(1))
+    assert not model.contains_node(Node(xyz=[0.0, 0.0, 0.0]))
+    assert model.find_element_by_key(0) == []
+
+
+# ==============================================================================
+# Tests - Boundary conditions
+# ==============================================================================
+
+def test_bcs_arrays():
+    from compas_fea2.model import FixedBC
+    from compas_fea2.model import RollerBCX
+
+    model, a, b = _model()
+    fixed = model.add_bcs(FixedBC(), [a.find_node_by_key(0), b.find_node_by_key(1)])
+    roller = model.add_bcs_by_keys(RollerBCX(), a, a.nodes_xyz[:, 0] > 0)
+
+    assert a.find_node_by_key(0).bc is fixed
+    assert not any(a.find_node_by_key(0).dof.values())
+    assert model.nodes_restraints.tolist() == [63, 6, 6, 0, 63]
+    assert model.nodes_dof.sum(axis=1).tolist() == [0, 4, 4, 6, 0]
+    assert {part: keys.tolist() for part, keys in model.bcs_keys[roller].items()} == {a: [1, 2]}
+
+    a.remove_node(a.find_node_by_key(1))
+    assert model.bcs[roller] == {a.find_node_by_key(1)}
+
+    model.remove_bcs_by_keys(b, [1])
+    assert model.nodes_restraints.tolist() == [63, 6, 0, 0]
+    assert list(model.bcs) == [fixed, roller]
+
+
+def test_bcs_merge_coincident_nodes():
+    import pytest
+    from compas_fea2.model import FixedBC
+    from compas_fea2.model import PinnedBC
+
+    model = Model()
+    part = model.add_part(DeformablePart())
+    part.add_nodes([Node(xyz=[0.0, 0.0, 0.0]), Node(xyz=[5.0, 0.0, 0.0])])
+    part._store_nodes([Node(xyz=[0.0, 0.0, 0.0])])
+    fixed = model.add_bcs_by_keys(FixedBC(), part, [2])
+    part.merge_coincident_nodes()
+    assert part.nodes_restraints.tolist() == [63, 0]
+    assert model.bcs == {fixed: {part.find_node_by_key(0)}}
+
+    part._store_nodes([Node(xyz=[5.0, 0.0, 0.0])])
+    model.add_bcs_by_keys(fixed, part, [1])
+    model.add_bcs_by_keys(PinnedBC(), part, [2])
+    with pytest.raises(ValueError):
+        part.merge_coincident_nodes()
+
+
+# ==============================================================================
+# Tests - Changes
+# ==============================================================================
+
+def test_changed_since():
+    from compas_fea2.base import snapshot
+    from compas_fea2.model import DeformablePart
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+
+    material = ElasticIsotropic(E=1, v=0.3, density=1)
+    section = SolidSection(material=material)
+    first = DeformablePart.from_arrays([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], [[0, 1, 2, 3]], 'TetrahedronElement', section)
+    second = DeformablePart.from_arrays([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], [[0, 1, 2, 3]], 'TetrahedronElement', section)
+    model = Model()
+    model.add_parts([first, second])
+
+    before = snapshot()
+    assert not any(model.changed_since(before).values())
+    assert model.version < before
+
+    second.find_node_by_key(3).z = 2.0
+    material.E = 2
+    changes = model.changed_since(before)
+    assert changes['parts'] == [second]
+    assert changes['materials'] == [material]
+    assert changes['sections'] == []
+    assert model.version > before
+
+
+# ==============================================================================
+# Tests - Check
+# ==============================================================================
+
+def test_check():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import FixedBC
+    from compas_fea2.model import SolidSection
+    from compas_fea2.problem import Problem
+    from compas_fea2.problem import StaticStep
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    xyz = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1], [5, 5, 5], [0, 0, 1e-12]]
+    tetrahedra = [[0, 1, 2, 3], [1, 2, 3, 4], [3, 2, 1, 0], [0, 1, 2, 6], [1, 3, 2, 4]]
+    part = DeformablePart.from_arrays(xyz, tetrahedra, 'TetrahedronElement', section, name='a')
+    free = DeformablePart.from_arrays(xyz[:4], tetrahedra[:1], 'TetrahedronElement', section, name='b')
+    model = Model()
+    model.add_parts([part, free])
+    model.add_bcs_by_keys(FixedBC(), part, [0])
+    step = model.add_problem(Problem()).add_step(StaticStep())
+    step.add_point_load(nodes=[part.find_node_by_key(5)], z=-1)
+    part.remove_node(part.find_node_by_key(5))
+
+    report = model.check(level='deep', processes=1)
+    issues = {issue: {p.name: keys.tolist() for p, keys in items.items()} for issue, items in report.items() if issue != 'invalid_patterns'}
+    assert issues == {'orphan_nodes': {}, 'unrestrained_nodes': {'b': [0, 1, 2, 3]}, 'duplicate_elements': {'a': [2, 4]},
+                      'degenerate_elements': {'a': [3]}, 'unregistered_sections': {}, 'unregistered_materials': {},
+                      'inverted_elements': {'a': [4]}, 'coincident_nodes': {'a': [5]}}
+    assert len(report['invalid_patterns']) == 1
+
+
+def test_check_without_elements():
+    part = DeformablePart()
+    part.add_nodes([Node(xyz=[0.0, 0.0, 0.0]), Node(xyz=[1.0, 0.0, 0.0])])
+    model = Model()
+    model.add_part(part)
+
+    report = model.check()
+    assert report['orphan_nodes'][part].tolist() == [0, 1]
+    assert part not in report['duplicate_elements']
@@ -0,0 +1,528 @@
+import numpy as np
+import pytest
+
+from compas_fea2.model import DeformablePart
+from compas_fea2.model import Node
+
+
+# ==============================================================================
+# Tests - Nodes storage
+# ==============================================================================
+
+def test_add_node_moves_data_in_part_arrays():
+    part = DeformablePart()
+    node = Node(xyz=[1.0, 2.0, 3.0], mass=2.0)
+    part.add_node(node)
+
+    assert node.key == 0
+    assert node.xyz == [1.0, 2.0, 3.0]
+    assert node.mass == (2.0, 2.0, 2.0)
+    assert node.temperature is None
+    assert part.nodes_xyz.tolist() == [[1.0, 2.0, 3.0]]
+
+
+def test_node_setters_write_in_part_arrays():
+    part = DeformablePart()
+    node = part.add_node(Node(xyz=[0.0, 0.0, 0.0]))
+    node.x = 5.0
+    node.xyz = [1.0, 1.0, node.z + 1]
+    node.temperature = 20.0
+
+    assert part.nodes_xyz[0].tolist() == [1.0, 1.0, 1.0]
+    assert part.nodes_temperature[0] == 20.0
+    with pytest.raises(ValueError):
+        part.nodes_xyz[0] = 0.0
+
+
+def test_remove_node_shifts_keys():
+    part = DeformablePart()
+    nodes = part.add_nodes([Node(xyz=[i, 0.0, 0.0]) for i in range(3)])
+    part.remove_node(nodes[0])
+
+    assert nodes[0].part is None
+    assert nodes[0].xyz == [0.0, 0.0, 0.0]
+    assert [node.key for node in nodes[1:]] == [0, 1]
+    assert part.nodes_xyz[:, 0].tolist() == [1.0, 2.0]
+
+
+# ==============================================================================
+# Tests - Indexes
+# ==============================================================================
+
+def test_find_by_key_and_name():
+    part = DeformablePart()
+    nodes = part.add_nodes([Node(xyz=[i, 0.0, 0.0], name='n{}'.format(i)) for i in range(3)])
+
+    assert part.find_node_by_key(2) is nodes[2]
+    assert part.find_node_by_key(3) is None
+    assert part.find_nodes_by_name('n1') == [nodes[1]]
+
+    part.remove_node(nodes[1])
+    assert part.find_node_by_key(1) is nodes[2]
+    assert part.find_nodes_by_name('n1') == []
+
+
+# ==============================================================================
+# Tests - Spatial index
+# ==============================================================================
+
+def test_spatial_queries():
+    part = DeformablePart()
+    nodes = part.add_nodes([Node(xyz=[float(i), 0.0, 0.0]) for i in range(10)])
+
+    assert part.find_nodes_by_location([2.1, 0.0, 0.0], 1.0) == [nodes[2], nodes[3]]
+    assert part.find_closest_nodes_to_point([7.2, 0.0, 0.0], 5.0, number_of_nodes=2) == [nodes[7], nodes[8]]
+    assert part.find_closest_nodes_to_node(nodes[0], 5.0) == [nodes[1]]
+
+    # the index follows the nodes
+    nodes[9].x = 2.2
+    _, keys = part.query_closest_nodes([[2.0, 0.0, 0.0], [20.0, 0.0, 0.0]], number_of_nodes=2, distance=1.0)
+    assert keys.tolist() == [[2, 9], [-1, -1]]
+
+
+# ==============================================================================
+# Tests - Coincident nodes
+# ==============================================================================
+
+def test_point_overlap_disabled(monkeypatch):
+    import compas_fea2
+    monkeypatch.setattr(compas_fea2, 'POINT_OVERLAP', False)
+    monkeypatch.setattr(compas_fea2, 'GLOBAL_TOLERANCE', 0.1)
+    part = DeformablePart()
+
+    assert part.add_node(Node(xyz=[0.0, 0.0, 0.0]))
+    assert part.add_node(Node(xyz=[0.05, 0.0, 0.0])) is None
+    assert part.add_node(Node(xyz=[0.15, 0.0, 0.0]))
+    assert len(part.nodes) == 2
+
+
+def test_merge_coincident_nodes():
+    part = DeformablePart()
+    nodes = part.add_nodes([Node(xyz=[0.0, 0.0, 0.0]), Node(xyz=[1.0, 0.0, 0.0]), Node(xyz=[0.0, 0.0, 0.001])])
+    merged = part.merge_coincident_nodes(tolerance=0.01)
+
+    assert merged == {nodes[2]: nodes[0]}
+    assert nodes[2].part is None
+    assert [node.key for node in nodes[:2]] == [0, 1]
+    assert len(part.nodes) == 2
+
+    # a duplicate with the same geometric key does not drop the kept node
+    duplicate = part.add_node(Node(xyz=[1e-6, 0.0, 0.0]))
+    part.merge_coincident_nodes(tolerance=0.01)
+    assert duplicate.part is None
+    assert part.gkey_node == {nodes[0].igkey: nodes[0], nodes[1].igkey: nodes[1]}
+
+
+# ==============================================================================
+# Tests - Bulk constructor
+# ==============================================================================
+
+def test_from_arrays():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+    from compas_fea2.model import TetrahedronElement
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3], [1, 2, 3, 4]], 'TetrahedronElement', section)
+
+    assert part.nodes_xyz.tolist() == coords
+    assert len(part.elements) == 2
+    assert all(isinstance(element, TetrahedronElement) for element in part.elements)
+    assert part.find_element_by_key(1).nodes == [part.find_node_by_key(key) for key in [1, 2, 3, 4]]
+    assert part.sections == {section}
+    assert part.materials == {section.material}
+
+    with pytest.raises(ValueError):
+        DeformablePart.from_arrays(coords, [[0, 1, 2, 5]], TetrahedronElement, section)
+    with pytest.raises(ValueError):
+        DeformablePart.from_arrays(coords, [[0, 1, 1, 2]], TetrahedronElement, section)
+
+    # the checks of the part apply to the whole block
+    from compas_fea2.model import RigidPart
+    with pytest.raises(TypeError):
+        RigidPart.from_arrays(coords, [[0, 1, 2, 3], [1, 2, 3, 4]], TetrahedronElement, section)
+
+
+def test_from_compas_mesh():
+    from compas.datastructures import Mesh
+    from compas_fea2.model import BeamElement
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import RectangularSection
+    from compas_fea2.model import ShellSection
+
+    material = ElasticIsotropic(E=1, v=0.3, density=1)
+    mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]], [[0, 1, 2, 3], [1, 4, 2]])
+    shell = DeformablePart.shell_from_compas_mesh(mesh, ShellSection(t=0.1, material=material))
+
+    assert [[node.key for node in element.nodes] for element in sorted(shell.elements, key=lambda e: e.key)] == [[0, 1, 2, 3], [1, 4, 2]]
+    assert shell.elements_areas.tolist() == [1.0, 0.5]
+
+    frame = DeformablePart.frame_from_compas_mesh(mesh, RectangularSection(w=1, h=1, material=material))
+    assert len(frame.elements) == mesh.number_of_edges()
+    assert all(isinstance(element, BeamElement) for element in frame.elements)
+    beam = frame.find_element_by_key(0)
+    direction = np.subtract(beam.nodes[1].xyz, beam.nodes[0].xyz)
+    assert np.allclose(beam.frame, np.roll(direction / np.linalg.norm(direction), -1))
+
+    # coincident vertices give zero-length edges, with or without merging
+    degenerate = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    with pytest.raises(ValueError):
+        DeformablePart.frame_from_compas_mesh(degenerate, RectangularSection(w=1, h=1, material=material))
+
+
+# ==============================================================================
+# Tests - gmsh import
+# ==============================================================================
+
+class _GmshMesh(object):
+    """Minimal stand-in for `gmsh.model.mesh`: two tetrahedra, their boundary
+    triangles and non-contiguous node tags."""
+
+    def get_nodes(self):
+        tags = np.array([10, 20, 30, 40, 50])
+        coords = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=float).ravel()
+        return tags, coords, np.array([])
+
+    def get_elements(self):
+        return ([2, 4],
+                [np.array([1, 2]), np.array([3, 4])],
+                [np.array([10, 20, 30, 20, 30, 50]), np.array([10, 20, 30, 40, 20, 30, 40, 50])])
+
+    def get_element_properties(self, element_type):
+        return {2: ('Triangle 3', 2, 1, 3, [], 3), 4: ('Tetrahedron 4', 3, 1, 4, [], 4)}[element_type]
+
+
+class _GmshModel(object):
+    mesh = _GmshMesh()
+
+
+def test_from_gmsh():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import ShellSection
+    from compas_fea2.model import SolidSection
+    from compas_fea2.model import ShellElement
+    from compas_fea2.model import TetrahedronElement
+
+    material = ElasticIsotropic(E=1, v=0.3, density=1)
+    solid = DeformablePart.from_gmsh(_GmshModel(), SolidSection(material=material))
+    shell = DeformablePart.from_gmsh(_GmshModel(), ShellSection(t=0.1, material=material))
+
+    assert len(solid.elements) == 2
+    assert all(isinstance(element, TetrahedronElement) for element in solid.elements)
+    assert [node.key for node in solid.find_element_by_key(1).nodes] == [1, 2, 3, 4]
+    assert len(shell.elements) == 2
+    assert all(isinstance(element, ShellElement) for element in shell.elements)
+
+
+def test_from_gmsh_split():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import ShellSection
+    from compas_fea2.model import SolidSection
+
+    material = ElasticIsotropic(E=1, v=0.3, density=1)
+    part = DeformablePart.from_gmsh(_GmshModel(), SolidSection(material=material), split=True)
+    first, second = part.find_element_by_key(0), part.find_element_by_key(1)
+
+    # the two tetrahedra share a face: 6 + 6 - 3 edges
+    assert len(part.nodes) == 5 + 9
+    assert len(first.nodes) == len(second.nodes) == 10
+    assert first.nodes[4].xyz == [0.5, 0.0, 0.0]
+    # the midside nodes of the shared edges (1, 2), (1, 3) and (2, 3) are the same
+    assert {first.nodes[i] for i in (5, 8, 9)} == {second.nodes[i] for i in (4, 5, 6)}
+    assert first.volume == 1 / 6
+    # all the nodes, midside ones included, are on the boundary faces
+    _, nodes_flags = part.compute_boundary()
+    assert nodes_flags.all()
+    with pytest.raises(NotImplementedError):
+        DeformablePart.from_gmsh(_GmshModel(), ShellSection(t=0.1, material=material), split=True)
+
+
+# ==============================================================================
+# Tests - Geometric keys
+# ==============================================================================
+
+def test_integer_geometric_keys():
+    import compas_fea2
+    part = DeformablePart()
+    node = part.add_node(Node(xyz=[1.0, 2.0, 3.0]))
+    scale = 10 ** int(compas_fea2.PRECISION[:-1])
+
+    assert node.igkey == (scale, 2 * scale, 3 * scale)
+    assert part.gkey_node[node.igkey] is node
+
+    node.x = 4.0
+    assert node.igkey == (4 * scale, 2 * scale, 3 * scale)
+    assert node.gkey == '4.{0},2.{0},3.{0}'.format('0' * int(compas_fea2.PRECISION[:-1]))
+    assert part.gkey_node == {node.igkey: node}
+
+
+# ==============================================================================
+# Tests - Queries
+# ==============================================================================
+
+def test_find_nodes_where():
+    part = DeformablePart()
+    nodes = part.add_nodes([Node(xyz=[float(i), 0.0, float(i % 3)]) for i in range(10)])
+
+    assert part.find_nodes_where(['x <= 3 & z > 1']) == [nodes[2]]
+    assert part.find_nodes_where(['2 <= x <= 6', 'z < 1']) == [nodes[3], nodes[6]]
+    assert part.query_nodes_where('abs(x - x0) < 1.5 | key == 9', x0=5).tolist() == [4, 5, 6, 9]
+    with pytest.raises(ValueError):
+        part.find_nodes_where('__import__("os")')
+
+
+def test_find_nodes_on_plane_and_in_polygon():
+    from compas.geometry import Plane
+    from compas.geometry import Polygon
+
+    part = DeformablePart()
+    part.add_nodes([Node(xyz=[float(i), float(j), float(k)]) for i in range(4) for j in range(4) for k in range(2)])
+
+    on_plane = part.find_nodes_on_plane(Plane([0, 0, 1], [0, 0, 1]))
+    assert len(on_plane) == 16 and all(node.z == 1.0 for node in on_plane)
+
+    polygon = Polygon([[0.5, 0.5, 1.0], [2.5, 0.5, 1.0], [2.5, 1.5, 1.0], [0.5, 1.5, 1.0]])
+    assert sorted(node.xyz for node in part.find_nodes_in_polygon(polygon)) == [[1.0, 1.0, 1.0], [2.0, 1.0, 1.0]]
+
+    # the first three points are aligned, the tolerance reaches the nodes below
+    polygon = Polygon([[0.5, 0.5, 0.9], [1.5, 0.5, 0.9], [2.5, 0.5, 0.9], [2.5, 1.5, 0.9], [0.5, 1.5, 0.9]])
+    assert part.query_nodes_in_polygon(polygon).tolist() == []
+    assert part.query_nodes_in_polygon(polygon, tolerance=0.15).tolist() == [11, 19]
+    with pytest.raises(ValueError):
+        part.query_nodes_in_polygon(Polygon([[0, 0, 0], [1, 0, 0], [2, 0, 0]]))
+
+
+# ==============================================================================
+# Tests - Boundary
+# ==============================================================================
+
+def test_compute_boundary():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    # a 2x1x1 grid of hexahedra, each one split in 6 tetrahedra around the main diagonal
+    coords = [[i, j, k] for k in range(2) for j in range(2) for i in range(3)]
+    tets = []
+    for i in range(2):
+        corners = [i, i + 1, i + 4, i + 3, i + 6, i + 7, i + 10, i + 9]
+        a, b, c, d, e, f, g, h = corners
+        tets += [[a, b, c, g], [a, c, d, g], [a, d, h, g], [a, h, e, g], [a, e, f, g], [a, f, b, g]]
+    part = DeformablePart.from_arrays(coords, tets, 'TetrahedronElement', section)
+    elements_flags, nodes_flags = part.compute_boundary()
+
+    assert nodes_flags.all()
+    assert elements_flags.all()
+    mesh = part.extract_boundary_mesh()
+    # 10 quads of the outer box, 2 triangles each
+    assert mesh.number_of_faces() == 20
+    assert mesh.number_of_vertices() == 12
+    assert part.is_node_on_boundary(part.find_node_by_key(0))
+
+
+def test_compute_boundary_interior():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    n = 4
+    coords = [[i, j, k] for k in range(n) for j in range(n) for i in range(n)]
+    hexas = []
+    for k in range(n - 1):
+        for j in range(n - 1):
+            for i in range(n - 1):
+                a = i + j * n + k * n * n
+                bottom = [a, a + 1, a + n + 1, a + n]
+                hexas.append(bottom + [key + n * n for key in bottom])
+    part = DeformablePart.from_arrays(coords, hexas, 'HexahedronElement', section)
+    elements_flags, nodes_flags = part.compute_boundary()
+
+    assert elements_flags.tolist() == [key != 13 for key in range(27)]
+    assert nodes_flags.sum() == n ** 3 - (n - 2) ** 3
+    assert not part.is_element_on_boundary(part.find_element_by_key(13))
+
+
+# ==============================================================================
+# Tests - Adjacency
+# ==============================================================================
+
+def test_adjacency():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3], [1, 2, 3, 4]], 'TetrahedronElement', section)
+
+    assert part.elements_nodes.shape == (2, 5)
+    assert part.nodes_elements.getnnz(axis=1).tolist() == [1, 2, 2, 2, 1]
+    assert (part.nodes_elements @ np.ones(2)).tolist() == [1, 2, 2, 2, 1]
+    assert part.find_elements_by_node(part.find_node_by_key(4)) == [part.find_element_by_key(1)]
+
+    part.remove_element(part.find_element_by_key(0))
+    assert part.nodes_elements.getnnz(axis=1).tolist() == [0, 1, 1, 1, 1]
+
+
+# ==============================================================================
+# Tests - Elements by type
+# ==============================================================================
+
+def test_elements_by_type():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import ShellElement
+    from compas_fea2.model import ShellSection
+    from compas_fea2.model.elements import _Element2D
+
+    section = ShellSection(t=0.1, material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3], [1, 4, 2, 3]], ShellElement, section)
+    part.add_element(ShellElement(nodes=[part.find_node_by_key(k) for k in [1, 4, 2]], section=section))
+
+    assert list(part.element_types) == [ShellElement]
+    assert len(part.find_elements_by_type(_Element2D)) == 3
+    keys, connectivity = part.get_elements_connectivity(ShellElement)
+    assert keys.tolist() == [0, 1, 2]
+    assert connectivity.tolist() == [[0, 1, 2, 3], [1, 4, 2, 3], [1, 4, 2, -1]]
+
+    part.remove_element(part.find_element_by_key(0))
+    keys, connectivity = part.get_elements_connectivity(ShellElement)
+    assert keys.tolist() == [0, 1]
+    assert connectivity.tolist() == [[1, 4, 2, 3], [1, 4, 2, -1]]
+
+    # the arrays follow the nodes when they are renumbered
+    part._reorder_nodes([4, 3, 2, 1, 0])
+    keys, connectivity = part.get_elements_connectivity(ShellElement)
+    assert connectivity.tolist() == [[3, 0, 2, 1], [3, 0, 2, -1]]
+    assert [[node.key for node in element.nodes] for element in part.element_types[ShellElement]] == [[3, 0, 2, 1], [3, 0, 2]]
+
+
+def test_remove_elements():
+    from compas_fea2.model import BeamElement
+    from compas_fea2.model import ElementsGroup
+
+    part = DeformablePart.from_arrays([[i, 0, 0] for i in range(6)], [[i, i + 1] for i in range(5)], 'BeamElement')
+    elements = [part.find_element_by_key(key) for key in range(5)]
+    group = ElementsGroup.from_keys(part, [1, 2, 4])
+
+    part.remove_elements([elements[1], elements[3], elements[3]])
+    assert [element.key for element in part.element_types[BeamElement]] == [0, 1, 2]
+    assert part.find_element_by_key(2) is elements[4]
+    assert elements[1].key is None and elements[1] not in part.elements
+    assert group.elements == {elements[2], elements[4]}
+
+
+# ==============================================================================
+# Tests - Mesh quality
+# ==============================================================================
+
+def test_mesh_quality():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import SolidSection
+
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[i, j, k] for k in range(2) for j in range(2) for i in range(3)]
+    hexas = [[0, 1, 4, 3, 6, 7, 10, 9], [7, 8, 11, 10, 1, 2, 5, 4]]  # the second one is inverted
+    part = DeformablePart.from_arrays(coords, hexas, 'HexahedronElement', section)
+    quality, summary = part.mesh_quality(bins=2)
+
+    assert quality['jacobian'].tolist() == [1.0, -1.0]
+    assert quality['aspect_ratio'].tolist() == [1.0, 1.0]
+    assert np.allclose(quality['min_angle'], 90.0)
+    assert np.allclose(quality['skewness'], 0.0)
+    assert summary['jacobian']['histogram'][0].tolist() == [1, 1]
+    # the faces of the boundary mesh are not twisted
+    assert part.extract_boundary_mesh().area() == 10.0
+
+
+# ==============================================================================
+# Tests - Renumbering
+# ==============================================================================
+
+def test_renumber():
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import NodesGroup
+    from compas_fea2.model import ShellSection
+
+    section = ShellSection(t=0.1, material=ElasticIsotropic(E=1, v=0.3, density=1))
+    # a strip of quads with the nodes numbered along the long side
+    n = 20
+    coords = [[i, j, 0] for j in range(2) for i in range(n + 1)]
+    quads = [[i, i + 1, i + n + 2, i + n + 1] for i in range(n)]
+    part = DeformablePart.from_arrays(coords, quads, 'ShellElement', section)
+    corner = part.find_node_by_key(n + 1)
+    group = NodesGroup(nodes=[corner])
+    area = part.elements_areas.sum()
+
+    assert part.bandwidth == n + 2
+    assert part.renumber() == 3
+    assert corner.key is not None and corner.xyz == [0.0, 1.0, 0.0]
+    assert part.find_node_by_key(corner.key) is corner and corner in group.nodes
+    assert part.elements_areas.sum() == area
+    keys = [element.key for element in sorted(part.elements, key=lambda element: min(node.key for node in element.nodes))]
+    assert keys == list(range(n))
+
+
+# ==============================================================================
+# Tests - Partitioning
+# ==============================================================================
+
+@pytest.mark.parametrize('method', ['coordinate', 'graph'])
+def test_partition(method):
+    from compas_fea2.model import ElasticIsotropic
+    from compas_fea2.model import ShellSection
+
+    section = ShellSection(t=0.1, material=ElasticIsotropic(E=1, v=0.3, density=1))
+    n = 9
+    coords = [[i, j, 0] for j in range(2) for i in range(n + 1)]
+    quads = [[i, i + 1, i + n + 2, i + n + 1] for i in range(n)]
+    part = DeformablePart.from_arrays(coords, quads, 'ShellElement', section)
+    partitions, interface = part.partition(3, method=method)
+
+    assert sorted(len(elements) for elements, _ in partitions) == [3, 3, 3]
+    assert sorted(np.concatenate([elements for elements, _ in partitions]).tolist()) == list(range(n))
+    # two cuts through the strip, two nodes each
+    assert len(interface) == 4
+    assert sum(len(nodes) for _, nodes in partitions) == 2 * (n + 1) + len(interface)
+    with pytest.raises(ValueError):
+        part.partition(0)
+
+
+# ==============================================================================
+# Tests - Groups
+# ==============================================================================
+
+def test_groups():
+    from compas_fea2.model import NodesGroup
+
+    part = DeformablePart.from_arrays([[i, 0, 0] for i in range(6)], np.empty((0, 2), dtype=int), 'BeamElement')
+    nodes = [part.find_node_by_key(key) for key in range(6)]
+    left = NodesGroup(nodes=nodes[:4])
+    right = NodesGroup.from_keys(part, np.arange(6) >= 2)
+
+    assert left.keys.tolist() == [0, 1, 2, 3]
+    assert (left & right).keys.tolist() == [2, 3]
+    assert (left | right).nodes == set(nodes)
+    assert (left - right).nodes == {nodes[0], nodes[1]}
+    assert nodes[3] in left and nodes[4] not in left
+
+    # the keys follow the nodes
+    part.remove_node(nodes[1])
+    assert left.nodes == {nodes[0], nodes[2], nodes[3]}
+    assert left.keys.tolist() == [0, 1, 2]
+
+    # members added to the part later
+    node = Node(xyz=[9, 0, 0])
+    pending = NodesGroup(nodes=[node])
+    part.add_group(pending)
+    assert pending.keys.tolist() == [node.key]
+    assert node in pending
+
+    # members registered one at a time are not lost
+    first, second = Node(xyz=[10, 0, 0]), Node(xyz=[11, 0, 0])
+    partial = NodesGroup(nodes=[first, second])
+    part.add_node(first)
+    assert partial.nodes == {first, second}
+    assert partial.keys.tolist() == [first.key]
+    part.add_node(second)
+    assert partial.keys.tolist() == [first.key, second.key]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from compas_fea2.model import DeformablePart
+from compas_fea2.model import ElasticIsotropic
+from compas_fea2.model import Model
+from compas_fea2.model import Node
+from compas_fea2.model import SolidSection
+from compas_fea2.problem import Problem
+from compas_fea2.problem import StaticStep
+from compas_fea2.results import DeformedView
+from compas_fea2.results import StepResults
+
+
+def test_deformed_view():
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3]], 'TetrahedronElement', section)
+    model = Model()
+    model.add_part(part)
+    top = part.find_node_by_key(3)
+
+    view = DeformedView.from_vectors(model, [{'part': part, 'node': top, 'vector': [0, 0, 1]}], scale=2)
+    half = view.scaled(0.5)
+
+    assert view.node_xyz(top) == [0.0, 0.0, 3.0]
+    assert half.node_xyz(top) == [0.0, 0.0, 1.5]
+    assert half.displacements[part] is view.displacements[part]
+    # the model is not modified
+    assert top.xyz == [0.0, 0.0, 1.0]
+    assert np.allclose(view.nodes_xyz(part)[:3], coords[:3])
+
+    mesh = view.to_mesh(part)
+    assert mesh.number_of_faces() == 4
+    assert max(mesh.vertex_coordinates(vertex)[2] for vertex in mesh.vertices()) == 3.0
+
+    # the view follows the undeformed geometry
+    top.x = 1.0
+    assert view.node_xyz(top) == [1.0, 0.0, 3.0]
+
+    # the displacements follow the nodes when they are renumbered
+    part._reorder_nodes([3, 2, 1, 0])
+    assert view.node_xyz(top) == [1.0, 0.0, 3.0]
+    assert view.nodes_xyz(part)[0].tolist() == [1.0, 0.0, 3.0]
+    part.add_node(Node(xyz=[5, 5, 5]))
+    with pytest.raises(ValueError):
+        view.nodes_xyz(part)
+
+
+def test_deformed_view_copies_displacements():
+    part = DeformablePart.from_arrays([[0, 0, 0], [1, 0, 0]], np.empty((0, 2), dtype=int), 'BeamElement')
+    model = Model()
+    model.add_part(part)
+    displacements = np.zeros((2, 3))
+
+    view = DeformedView(model, {part: displacements})
+    displacements[1] = 1.0
+    assert displacements.flags.writeable
+    assert view.nodes_xyz(part)[1].tolist() == [1.0, 0.0, 0.0]
+
+
+def test_step_results_deformed_model():
+    section = SolidSection(material=ElasticIsotropic(E=1, v=0.3, density=1))
+    coords = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    part = DeformablePart.from_arrays(coords, [[0, 1, 2, 3]], 'TetrahedronElement', section)
+    model = Model()
+    model.add_part(part)
+    problem = model.add_problem(Problem())
+    step = problem.add_step(StaticStep())
+    step_results = StepResults()
+    step_results._registration = step
+
+    top = part.find_node_by_key(3)
+    top._results.setdefault(problem, {})[step] = {'U': [0, 0, 1]}
+
+    view = step_results.get_deformed_model(scale=2)
+    assert view.node_xyz(top) == [0.0, 0.0, 3.0]
+    assert view.node_xyz(part.find_node_by_key(0)) == [0.0, 0.0, 0.0]
+    assert top.xyz == [0.0, 0.0, 1.0]